@@ -0,0 +1,351 @@
+"""Нагрузочные замеры загрузки, списка и удаления резюме.
+
+Запуск из корня репозитория при поднятых PostgreSQL и S3 из
+`docker-compose.yml` (или `moto_server`, указанном в `S3_ENDPOINT_URL`)::
+
+    PYTHONPATH=src python -m benchmarks run --truncate --output head.json
+    PYTHONPATH=src python -m benchmarks compare base.json head.json
+
+Перед каждым размером таблицы таблицы резюме и файлов очищаются и
+заполняются заново, поэтому запускать замеры следует на отдельной БД.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import Any
+
+import dotenv
+import httpx
+
+from .stats import BenchmarkResult
+
+SCENARIOS = ("list", "upload", "delete")
+
+_SIZE_UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "B": 1}
+_COUNT_UNITS = {"k": 1_000, "M": 1_000_000}
+
+
+def parse_size(value: str) -> int:
+    value = value.strip()
+    for unit, multiplier in _SIZE_UNITS.items():
+        if value.upper().endswith(unit):
+            return int(float(value[: -len(unit)]) * multiplier)
+    return int(value)
+
+
+def parse_count(value: str) -> int:
+    value = value.strip()
+    if value[-1:] in _COUNT_UNITS:
+        return int(float(value[:-1]) * _COUNT_UNITS[value[-1]])
+    return int(value)
+
+
+def _list_of(parse: Callable[[str], Any]) -> Callable[[str], list[Any]]:
+    return lambda value: [parse(item) for item in value.split(",") if item.strip()]
+
+
+def _git_revision() -> str | None:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    return None
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+@contextlib.asynccontextmanager
+async def _create_client(base_url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    if base_url is not None:
+        async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+            yield client
+        return
+
+    # Импорт после подгрузки переменных окружения: настройки читаются
+    # при импорте модулей приложения
+    from api.app import create_app
+
+    # Фоновые обработчики запускаются в lifespan, который ASGITransport
+    # не вызывает, поэтому в замер они не вмешиваются
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        timeout=None,
+    ) as client:
+        yield client
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    from db.engine import engine
+    from settings import RatingSettings, S3Settings, UploadSettings, get_settings
+
+    from .scenarios import (
+        collect_list_cursors,
+        delete_requests,
+        list_requests,
+        run_load,
+        upload_requests,
+    )
+    from .seed import count_resumes, reset_tables, sample_resume_ids, seed_resumes
+
+    upload_settings: UploadSettings = get_settings(UploadSettings)
+    s3_settings: S3Settings = get_settings(S3Settings)
+    rating_settings: RatingSettings = get_settings(RatingSettings)
+    measure_memory = args.base_url is None
+
+    if not args.truncate and await count_resumes(engine):
+        msg = "Resume table is not empty; pass --truncate to reset it before seeding"
+        raise SystemExit(msg)
+
+    results: list[BenchmarkResult] = []
+    async with _create_client(args.base_url) as client:
+        for table_size in args.table_sizes:
+            _log(f"Seeding {table_size} resumes")
+            await reset_tables(engine)
+            await seed_resumes(
+                engine,
+                count=table_size,
+                bucket=s3_settings.bucket,
+                path_prefix=f"{upload_settings.root_path}/benchmark",
+                rating_score=rating_settings.prior_mean,
+            )
+
+            for concurrency in args.concurrency:
+                if "list" in args.scenarios:
+                    cursors = await collect_list_cursors(
+                        client,
+                        size=args.list_page_size,
+                        max_depth=args.list_depth,
+                    )
+                    results.append(
+                        await run_load(
+                            "list",
+                            list_requests(
+                                client, size=args.list_page_size, cursors=cursors
+                            ),
+                            requests=args.requests,
+                            concurrency=concurrency,
+                            table_size=table_size,
+                            measure_memory=measure_memory,
+                        )
+                    )
+                    _log(_format_result(results[-1]))
+
+                if "upload" in args.scenarios:
+                    for file_size in args.file_sizes:
+                        # Число загрузок больших файлов ограничено объёмом,
+                        # но не меньше одной на поток
+                        requests = max(
+                            min(args.requests, args.upload_budget // file_size),
+                            concurrency,
+                        )
+                        results.append(
+                            await run_load(
+                                "upload",
+                                upload_requests(
+                                    client,
+                                    file_size=file_size,
+                                    content_type=args.content_type,
+                                ),
+                                requests=requests,
+                                concurrency=concurrency,
+                                table_size=table_size,
+                                file_size=file_size,
+                                measure_memory=measure_memory,
+                            )
+                        )
+                        _log(_format_result(results[-1]))
+
+                if "delete" in args.scenarios:
+                    resume_ids = await sample_resume_ids(engine, args.requests)
+                    results.append(
+                        await run_load(
+                            "delete",
+                            delete_requests(client, resume_ids),
+                            requests=len(resume_ids),
+                            concurrency=concurrency,
+                            table_size=table_size,
+                            measure_memory=measure_memory,
+                        )
+                    )
+                    _log(_format_result(results[-1]))
+
+    await engine.dispose()
+    return results
+
+
+def compare(
+    base: Sequence[dict[str, Any]],
+    head: Sequence[dict[str, Any]],
+    threshold: float,
+) -> bool:
+    """Вывод изменений задержек и пропускной способности между прогонами.
+
+    Returns:
+        bool: признак регрессии — рост p95 или падение пропускной способности
+        больше чем на `threshold` хотя бы в одном сценарии.
+    """
+
+    def key(result: dict[str, Any]) -> tuple[Any, ...]:
+        return (
+            result["scenario"],
+            result["table_size"],
+            result["file_size"],
+            result["concurrency"],
+        )
+
+    base_by_key = {key(result): result for result in base}
+    regressed = False
+    print(
+        f"{'scenario':<8} {'rows':>8} {'file':>10} {'conc':>5} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}"
+    )
+    for result in head:
+        previous = base_by_key.get(key(result))
+        if previous is None:
+            continue
+
+        def change(current: float, before: float) -> float:
+            return (current - before) / before if before else 0.0
+
+        latency = {
+            q: change(result["latency_ms"][q], previous["latency_ms"][q])
+            for q in ("p50", "p95", "p99")
+        }
+        throughput = change(result["throughput"], previous["throughput"])
+        regressed |= latency["p95"] > threshold or -throughput > threshold
+        print(
+            f"{result['scenario']:<8} {result['table_size']:>8} "
+            f"{result['file_size'] or '-':>10} {result['concurrency']:>5} "
+            f"{latency['p50']:>+8.1%} {latency['p95']:>+8.1%} "
+            f"{latency['p99']:>+8.1%} {throughput:>+8.1%}"
+        )
+    return regressed
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    latency = result.latency_ms
+    return (
+        f"{result.scenario} rows={result.table_size} file={result.file_size} "
+        f"concurrency={result.concurrency}: p50={latency.p50:.1f}ms "
+        f"p95={latency.p95:.1f}ms p99={latency.p99:.1f}ms "
+        f"rps={result.throughput:.1f} errors={result.errors}"
+    )
+
+
+def _parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and output JSON")
+    run_parser.add_argument("--scenarios", type=_list_of(str), default=list(SCENARIOS))
+    run_parser.add_argument(
+        "--table-sizes", type=_list_of(parse_count), default="1k,10k,100k,1M"
+    )
+    run_parser.add_argument(
+        "--file-sizes", type=_list_of(parse_size), default="10KB,1MB,10MB,100MB"
+    )
+    run_parser.add_argument("--concurrency", type=_list_of(int), default="10")
+    run_parser.add_argument("--requests", type=int, default=200)
+    run_parser.add_argument(
+        "--upload-budget",
+        type=parse_size,
+        default="1GB",
+        help="Upper bound of bytes uploaded per upload run",
+    )
+    run_parser.add_argument("--list-page-size", type=int, default=50)
+    run_parser.add_argument(
+        "--list-depth",
+        type=int,
+        default=20,
+        help="Number of list pages cycled through",
+    )
+    run_parser.add_argument("--content-type", default="application/pdf")
+    run_parser.add_argument(
+        "--base-url",
+        help="Benchmark a running server instead of the in-process app",
+    )
+    run_parser.add_argument(
+        "--disable-cache",
+        action="store_true",
+        help="Bypass the read-through cache of the in-process app",
+    )
+    run_parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Report peak Python allocations (slows requests down)",
+    )
+    run_parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Allow truncating the resume and file tables",
+    )
+    run_parser.add_argument("--output", help="JSON output path, stdout by default")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and (unknown := set(args.scenarios) - set(SCENARIOS)):
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as base, open(args.head) as head:
+            regressed = compare(
+                json.load(base)["results"],
+                json.load(head)["results"],
+                threshold=args.threshold,
+            )
+        return int(regressed)
+
+    dotenv.load_dotenv(".env")
+    if args.disable_cache:
+        os.environ["CACHE_TTL"] = "0"
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base_url": args.base_url,
+            "cache_disabled": args.disable_cache,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as file:
+            file.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import asyncio
+import itertools
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Sequence
+from uuid import UUID
+
+import httpx
+
+from .stats import BenchmarkResult, summarize
+
+RequestFactory = Callable[[int], Awaitable[httpx.Response]]
+
+_UNIQUE_PREFIX_SIZE = 16
+
+
+class UniquePayload:
+    """Содержимое загружаемого файла заданного размера.
+
+    Загрузки дедуплицируются по хэшу содержимого, поэтому первые байты
+    каждого экземпляра случайны, а остальное — общий буфер, который читается
+    по ссылке и не копируется на каждый запрос.
+    """
+
+    def __init__(self, shared: memoryview) -> None:
+        self._prefix = os.urandom(min(_UNIQUE_PREFIX_SIZE, len(shared)))
+        self._shared = shared
+        self._position = 0
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_END:
+            offset += len(self._shared)
+        elif whence == os.SEEK_CUR:
+            offset += self._position
+        self._position = offset
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._shared) if size < 0 else self._position + size
+        chunk = bytearray()
+        if self._position < len(self._prefix):
+            chunk += self._prefix[self._position : end]
+        chunk += self._shared[max(self._position, len(self._prefix)) : end]
+        self._position += len(chunk)
+        return bytes(chunk)
+
+
+async def run_load(
+    scenario: str,
+    send: RequestFactory,
+    *,
+    requests: int,
+    concurrency: int,
+    table_size: int,
+    file_size: int | None = None,
+    measure_memory: bool = True,
+) -> BenchmarkResult:
+    """Выполнение `requests` запросов не более чем в `concurrency` потоков.
+
+    Ошибкой считается исключение клиента или ответ с кодом 4xx/5xx; время
+    таких запросов тоже входит в перцентили.
+    """
+    counter = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(counter)) < requests:
+            started_at = time.perf_counter()
+            try:
+                response = await send(index)
+            except httpx.HTTPError:
+                failed = True
+            else:
+                failed = response.is_error
+            latencies.append(time.perf_counter() - started_at)
+            errors += failed
+
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    rss_before = _current_rss_bytes() if measure_memory else None
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started_at
+
+    rss_after = _current_rss_bytes() if measure_memory else None
+
+    return BenchmarkResult(
+        scenario=scenario,
+        table_size=table_size,
+        file_size=file_size,
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        duration=duration,
+        throughput=requests / duration,
+        latency_ms=summarize(latencies),
+        rss_delta_bytes=(
+            rss_after - rss_before
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+        process_max_rss_bytes=_max_rss_bytes() if measure_memory else None,
+        traced_peak_bytes=(
+            tracemalloc.get_traced_memory()[1]
+            if measure_memory and tracemalloc.is_tracing()
+            else None
+        ),
+    )
+
+
+def upload_requests(
+    client: httpx.AsyncClient,
+    *,
+    file_size: int,
+    content_type: str,
+) -> RequestFactory:
+    shared = memoryview(os.urandom(file_size))
+
+    async def send(index: int) -> httpx.Response:
+        return await client.post(
+            "/resume/upload",
+            data={"pretender_name": f"Кандидат {index}", "rating": "4.5"},
+            files={
+                "upload_file": (
+                    f"resume-{index}.pdf",
+                    UniquePayload(shared),
+                    content_type,
+                )
+            },
+        )
+
+    return send
+
+
+def list_requests(
+    client: httpx.AsyncClient,
+    *,
+    size: int,
+    cursors: Sequence[str | None],
+) -> RequestFactory:
+    async def send(index: int) -> httpx.Response:
+        cursor = cursors[index % len(cursors)]
+        params: dict[str, str | int] = {"size": size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await client.get("/resume/list", params=params)
+
+    return send
+
+
+async def collect_list_cursors(
+    client: httpx.AsyncClient,
+    *,
+    size: int,
+    max_depth: int,
+) -> list[str | None]:
+    """Курсоры первых `max_depth` страниц списка резюме.
+
+    Запросы сценария по кругу проходят эти страницы, чтобы нагрузка
+    включала не только первую страницу, но и глубокие.
+    """
+    cursors: list[str | None] = [None]
+    cursor: str | None = None
+    while len(cursors) < max_depth:
+        params: dict[str, str | int] = {"size": size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get("/resume/list", params=params)
+        response.raise_for_status()
+        cursor = response.json()["nextCursor"]
+        if cursor is None:
+            break
+        cursors.append(cursor)
+    return cursors
+
+
+def delete_requests(
+    client: httpx.AsyncClient,
+    resume_ids: Sequence[UUID],
+) -> RequestFactory:
+    async def send(index: int) -> httpx.Response:
+        return await client.delete(f"/resume/delete/{resume_ids[index]}")
+
+    return send
+
+
+def _current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except OSError:
+        # /proc есть только в Linux
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS — байты
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
@@ -0,0 +1,107 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from db.models import FileDeletionOutbox, Resume, ResumeRating, UploadedFile
+from db.models.file import ExtractionStatus
+
+SEED_FILE_SIZE = 10 * 1024
+
+_EXTRACTION_STATUS_TYPE = UploadedFile.__table__.c.extraction_status.type.name
+
+_SEED_QUERY = text(
+    f"""
+    WITH files AS (
+        INSERT INTO uploaded_file (
+            id, name, path, content_type, file_size, bucket, created_at,
+            extraction_status
+        )
+        SELECT
+            gen_random_uuid(),
+            'resume-' || n || '.pdf',
+            CAST(:path_prefix AS varchar) || n || '.pdf',
+            'application/pdf',
+            CAST(:file_size AS integer),
+            CAST(:bucket AS varchar),
+            now() - n * interval '1 second',
+            CAST('{ExtractionStatus.DONE.name}' AS {_EXTRACTION_STATUS_TYPE})
+        FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS n
+        RETURNING id, name, content_type, created_at
+    )
+    INSERT INTO resume (
+        id, pretender_name, rating, file_id, file_name, file_content_type,
+        rating_score, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'Кандидат ' || substr(md5(id::text), 1, 12),
+        round((random() * 5)::numeric, 1),
+        id,
+        name,
+        content_type,
+        CAST(:rating_score AS double precision),
+        created_at,
+        created_at
+    FROM files
+    """
+)
+
+
+async def count_resumes(engine: AsyncEngine) -> int:
+    async with engine.connect() as connection:
+        return await connection.scalar(select(func.count()).select_from(Resume))
+
+
+async def reset_tables(engine: AsyncEngine) -> None:
+    tables = ", ".join(
+        model.__tablename__
+        for model in (ResumeRating, Resume, FileDeletionOutbox, UploadedFile)
+    )
+    async with engine.begin() as connection:
+        await connection.execute(text(f"TRUNCATE {tables}"))
+
+
+async def seed_resumes(
+    engine: AsyncEngine,
+    *,
+    count: int,
+    bucket: str,
+    path_prefix: str,
+    rating_score: float,
+    batch_size: int = 100_000,
+) -> None:
+    """Заполнение таблиц резюме и файлов `count` строками на стороне БД.
+
+    Строки генерируются через `generate_series` пачками по `batch_size`,
+    чтобы не гонять данные через драйвер. Файлы помечаются как уже
+    обработанные, чтобы не попадать в очередь извлечения текста, и в S3 не
+    создаются: сценарии чтения и удаления к содержимому не обращаются.
+    После заполнения обновляется статистика планировщика.
+    """
+    for start in range(1, count + 1, batch_size):
+        async with engine.begin() as connection:
+            await connection.execute(
+                _SEED_QUERY,
+                {
+                    "start": start,
+                    "stop": min(start + batch_size - 1, count),
+                    "path_prefix": f"{path_prefix}/",
+                    "file_size": SEED_FILE_SIZE,
+                    "bucket": bucket,
+                    "rating_score": rating_score,
+                },
+            )
+
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(
+            text(f"ANALYZE {Resume.__tablename__}, {UploadedFile.__tablename__}")
+        )
+
+
+async def sample_resume_ids(engine: AsyncEngine, count: int) -> Sequence[UUID]:
+    async with engine.connect() as connection:
+        result = await connection.scalars(select(Resume.id).limit(count))
+        return result.all()
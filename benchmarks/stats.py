@@ -0,0 +1,72 @@
+import dataclasses
+import math
+from collections.abc import Sequence
+from typing import Any
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LatencySummary:
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+    max: float
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    """Результат прогона одного сценария.
+
+    Ключ сравнения прогонов между коммитами — `scenario`, `table_size`,
+    `file_size` и `concurrency`; время задержки указано в миллисекундах.
+
+    `rss_delta_bytes` — прирост резидентной памяти процесса за прогон
+    сценария (только в Linux), а `process_max_rss_bytes` — пик за всё время
+    жизни процесса, включая предыдущие сценарии и заполнение таблиц.
+    """
+
+    scenario: str
+    table_size: int
+    file_size: int | None
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    throughput: float
+    latency_ms: LatencySummary
+    rss_delta_bytes: int | None
+    process_max_rss_bytes: int | None
+    traced_peak_bytes: int | None
+
+    @property
+    def key(self) -> tuple[str, int, int | None, int]:
+        return self.scenario, self.table_size, self.file_size, self.concurrency
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией между соседними значениями."""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(latencies: Sequence[float]) -> LatencySummary:
+    """Сводка задержек, переданных в секундах, в миллисекундах."""
+    values = sorted(latency * 1000 for latency in latencies)
+    p50, p95, p99 = (percentile(values, q) for q in PERCENTILES)
+    return LatencySummary(
+        p50=p50,
+        p95=p95,
+        p99=p99,
+        mean=sum(values) / len(values) if values else math.nan,
+        max=values[-1] if values else math.nan,
+    )
@@ -1,30 +1,63 @@
+import asyncio
 import contextlib
 from typing import AsyncIterator
 
+import aioinject
 from aioinject.ext.fastapi import AioInjectMiddleware
 from fastapi import FastAPI
 from fastapi.encoders import jsonable_encoder
 from fastapi.requests import Request
 from fastapi.responses import JSONResponse
-from fastapi_pagination import add_pagination
-from fastapi_pagination.utils import disable_installed_extensions_check
 from starlette.middleware.cors import CORSMiddleware
 
 from api.exceptions import BaseHTTPError
+from api.internal import internal_router
+from api.metrics import metrics_router
 from api.resume import resume_router
+from api.tracing import TracingMiddleware
 from core.di import create_container
+from core.files.extraction import TextExtractionWorker
+from core.files.outbox import FileDeletionOutboxWorker
+from core.files.sweeper import MultipartUploadSweeper
 from settings import ApplicationSettings, get_settings
 
 routers = [
     resume_router,
+    internal_router,
+    metrics_router,
 ]
 
+background_workers = [
+    FileDeletionOutboxWorker,
+    TextExtractionWorker,
+    MultipartUploadSweeper,
+]
+
+
+@contextlib.asynccontextmanager
+async def _run_background_workers(
+    container: aioinject.Container,
+) -> AsyncIterator[None]:
+    async with container.context() as context:
+        workers = [await context.resolve(worker) for worker in background_workers]
+
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 
 @contextlib.asynccontextmanager
 async def _lifespan(
     app: FastAPI,  # noqa: ARG001 - required by lifespan protocol
 ) -> AsyncIterator[None]:
-    async with contextlib.aclosing(create_container()):
+    async with (
+        contextlib.aclosing(create_container()) as container,
+        _run_background_workers(container),
+    ):
         yield
 
 
@@ -35,12 +68,12 @@ async def http_exception_handler(
     return JSONResponse(
         content=jsonable_encoder(exc.error_schema.model_dump(by_alias=True)),
         status_code=exc.status_code,
+        headers=exc.headers,
     )
 
 
 def create_app() -> FastAPI:
     app = FastAPI(lifespan=_lifespan)
-    add_pagination(app)
 
     for router in routers:
         app.include_router(router)
@@ -57,6 +90,6 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(TracingMiddleware)
 
-    disable_installed_extensions_check()
     return app
@@ -0,0 +1,128 @@
+import datetime
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Final
+from urllib import parse
+
+_BYTE_RANGE_RE: Final = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class RangeNotSatisfiableError(Exception):
+    def __init__(self, size: int) -> None:
+        self.size = size
+
+
+@dataclass(frozen=True, slots=True)
+class ByteRange:
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+@dataclass(frozen=True, slots=True)
+class Validators:
+    """Валидаторы содержимого файла для условных запросов.
+
+    Файлы в хранилище не перезаписываются, поэтому идентификатор записи о
+    файле однозначно определяет содержимое и служит сильным ETag, а дата
+    создания записи — датой последнего изменения. Оба значения известны
+    из БД без обращения к S3.
+    """
+
+    etag: str
+    last_modified: datetime.datetime
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+    def is_not_modified(self, headers: Mapping[str, str]) -> bool:
+        """Проверка `If-None-Match`, а при его отсутствии `If-Modified-Since`."""
+        if (if_none_match := headers.get("if-none-match")) is not None:
+            tags = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = _parse_http_date(headers.get("if-modified-since"))
+        return if_modified_since is not None and self.last_modified <= if_modified_since
+
+    def is_range_applicable(self, headers: Mapping[str, str]) -> bool:
+        """Проверка `If-Range`: диапазон отдаётся, только если файл не изменился."""
+        if_range = headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith(('"', "W/")):
+            return if_range == self.etag
+        return self.last_modified == _parse_http_date(if_range)
+
+
+def create_validators(
+    identifier: str,
+    created_at: datetime.datetime,
+) -> Validators:
+    return Validators(
+        etag=f'"{identifier}"',
+        # Дата в HTTP передаётся с точностью до секунды
+        last_modified=created_at.astimezone(datetime.UTC).replace(microsecond=0),
+    )
+
+
+def parse_range(header: str | None, size: int) -> ByteRange | None:
+    """Разбор заголовка `Range`.
+
+    Поддерживается один диапазон; заголовок с несколькими диапазонами или
+    с ошибкой в синтаксисе игнорируется, и файл отдаётся целиком.
+
+    Raises:
+        RangeNotSatisfiableError: диапазон лежит за пределами файла.
+    """
+    if header is None or (match := _BYTE_RANGE_RE.fullmatch(header.strip())) is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Суффиксный диапазон: последние `last` байтов
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiableError(size)
+        return ByteRange(start=max(size - suffix, 0), end=size - 1)
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(size)
+    end = min(int(last), size - 1) if last else size - 1
+    return ByteRange(start=start, end=end)
+
+
+def content_disposition(filename: str) -> str:
+    return f"attachment; filename*=UTF-8''{parse.quote(filename)}"
+
+
+def _strip_weak(tag: str) -> str:
+    return tag.removeprefix("W/")
+
+
+def _parse_http_date(value: str | None) -> datetime.datetime | None:
+    if value is None:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=datetime.UTC)
+    return parsed
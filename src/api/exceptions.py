@@ -22,7 +22,7 @@ class BaseHTTPErrorProtocol(Protocol):
 
 
 class BaseHTTPError(BaseHTTPErrorProtocol, Exception):
-    pass
+    headers: dict[str, str] | None = None
 
 
 class FilenameIsNoneHTTPError(BaseHTTPError):
@@ -65,3 +65,128 @@ class ObjectNotFoundHTTPError(BaseHTTPError):
             identifier=identifier,
             entity_name=entity_name,
         )
+
+
+class InvalidCursorHTTPError(BaseHTTPError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    code = "invalid_cursor"
+    error_schema = APIErrorSchema(
+        code=code,
+        message="Pagination cursor is malformed or expired",
+    )
+
+
+class MalformedMultipartHTTPError(BaseHTTPError):
+    status_code = status.HTTP_400_BAD_REQUEST
+    code = "malformed_multipart"
+
+    def __init__(self, reason: str) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Malformed multipart/form-data body: {reason}",
+        )
+
+
+class InvalidRatingHTTPError(BaseHTTPError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    code = "invalid_rating"
+
+    def __init__(self, min_rating: float, max_rating: float) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Rating must be between {min_rating} and {max_rating}",
+        )
+
+
+class FileStorageHTTPError(BaseHTTPError):
+    status_code = status.HTTP_502_BAD_GATEWAY
+    code = "file_storage_error"
+    error_schema = APIErrorSchema(
+        code=code,
+        message="File storage is unavailable",
+    )
+
+
+class InvalidBatchHTTPError(BaseHTTPError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    code = "invalid_batch"
+
+    def __init__(self, message: str) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=message,
+        )
+
+
+class ContentTypeNotAllowedHTTPError(BaseHTTPError):
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    code = "content_type_not_allowed"
+
+    def __init__(self, allowed_content_types: list[str]) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"File content-type must be one of: {', '.join(allowed_content_types)}",
+        )
+
+
+class InvalidUploadKeyHTTPError(BaseHTTPError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    code = "invalid_upload_key"
+    error_schema = APIErrorSchema(
+        code=code,
+        message="Upload key was not issued by this service",
+    )
+
+
+class UploadCompletionHTTPError(BaseHTTPError):
+    status_code = status.HTTP_409_CONFLICT
+    code = "upload_completion_failed"
+
+    def __init__(self, reason: str) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Upload cannot be completed: {reason}",
+        )
+
+
+class UploadLockedHTTPError(BaseHTTPError):
+    status_code = status.HTTP_423_LOCKED
+    code = "upload_locked"
+    error_schema = APIErrorSchema(
+        code=code,
+        message="Upload is being modified by another request",
+    )
+
+
+class UploadOffsetMismatchHTTPError(BaseHTTPError):
+    status_code = status.HTTP_409_CONFLICT
+    code = "upload_offset_mismatch"
+
+    def __init__(self, expected_offset: int) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Upload-Offset must be equal to {expected_offset}",
+        )
+
+
+class UploadIncompleteHTTPError(BaseHTTPError):
+    status_code = status.HTTP_409_CONFLICT
+    code = "upload_incomplete"
+
+    def __init__(self, offset: int, file_size: int) -> None:
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Only {offset} of {file_size} bytes have been uploaded",
+        )
+
+
+class RangeNotSatisfiableHTTPError(BaseHTTPError):
+    status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    code = "range_not_satisfiable"
+
+    def __init__(self, size: int) -> None:
+        self.headers = {"Content-Range": f"bytes */{size}"}
+        self.error_schema = APIErrorSchema(
+            code=self.code,
+            message=f"Requested range is outside of the file of {size} bytes",
+        )
@@ -0,0 +1,3 @@
+from .endpoints import router as internal_router
+
+__all__ = ("internal_router",)
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+
+from api.tracing import TracedAPIRoute
+from db.engine import engine, read_engine
+from db.pool import get_pool_stats
+
+from .schemas import DatabasePoolStatsSchema
+
+router = APIRouter(
+    route_class=TracedAPIRoute,
+    prefix="/internal",
+    tags=["internal"],
+)
+
+
+@router.get("/db/pool")
+async def read_database_pool_stats() -> DatabasePoolStatsSchema:
+    return DatabasePoolStatsSchema.from_dto(get_pool_stats(engine.pool))
+
+
+@router.get(
+    "/db/pool/read",
+    description="Пул соединений для чтения; без реплики совпадает с основным.",
+)
+async def read_database_read_pool_stats() -> DatabasePoolStatsSchema:
+    return DatabasePoolStatsSchema.from_dto(get_pool_stats(read_engine.pool))
@@ -0,0 +1,41 @@
+from typing import Self
+
+from core.metrics import HistogramSnapshot
+from core.schema import BaseSchema
+from db.pool import PoolStatsDTO
+
+
+class HistogramSchema(BaseSchema):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+    @classmethod
+    def from_snapshot(cls, snapshot: HistogramSnapshot) -> Self:
+        return cls(
+            buckets={f"{bound:g}": count for bound, count in snapshot.buckets},
+            count=snapshot.count,
+            sum=snapshot.sum,
+        )
+
+
+class DatabasePoolStatsSchema(BaseSchema):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    wait_time: HistogramSchema | None
+
+    @classmethod
+    def from_dto(cls, dto: PoolStatsDTO) -> Self:
+        return cls(
+            size=dto.size,
+            checked_out=dto.checked_out,
+            idle=dto.idle,
+            overflow=dto.overflow,
+            wait_time=(
+                HistogramSchema.from_snapshot(dto.wait_time)
+                if dto.wait_time is not None
+                else None
+            ),
+        )
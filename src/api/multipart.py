@@ -0,0 +1,177 @@
+import enum
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi.requests import Request
+
+try:
+    import python_multipart as multipart
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart  # type: ignore[no-redef]
+    from multipart.exceptions import MultipartParseError  # type: ignore[no-redef]
+    from multipart.multipart import parse_options_header  # type: ignore[no-redef]
+
+
+class MultipartStreamError(Exception):
+    pass
+
+
+class _Event(enum.Enum):
+    PART_BEGIN = enum.auto()
+    HEADER_FIELD = enum.auto()
+    HEADER_VALUE = enum.auto()
+    HEADER_END = enum.auto()
+    HEADERS_FINISHED = enum.auto()
+    PART_DATA = enum.auto()
+    PART_END = enum.auto()
+
+
+@dataclass(slots=True)
+class StreamingUploadFile:
+    filename: str | None
+    content_type: str | None
+    chunks: AsyncIterator[bytes]
+
+
+@dataclass(slots=True)
+class StreamingForm:
+    fields: dict[str, str] = field(default_factory=dict)
+    file: StreamingUploadFile | None = None
+
+
+class StreamingMultipartReader:
+    """Инкрементальный разбор тела `multipart/form-data` без буферизации файла.
+
+    В отличие от `Request.form()`, который складывает файл целиком во временный
+    `SpooledTemporaryFile`, читатель отдаёт содержимое файловой части по мере
+    поступления байтов из `request.stream()`. Обычные поля формы должны
+    предшествовать файлу: всё, что передано после него, не читается.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterable[bytes],
+        boundary: bytes,
+        max_field_size: int = 1024 * 64,
+    ) -> None:
+        self._stream = stream
+        self._max_field_size = max_field_size
+        self._pending: list[tuple[_Event, bytes]] = []
+        self._parser = multipart.MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self._on_event(_Event.PART_BEGIN),
+                "on_header_field": self._on_data(_Event.HEADER_FIELD),
+                "on_header_value": self._on_data(_Event.HEADER_VALUE),
+                "on_header_end": self._on_event(_Event.HEADER_END),
+                "on_headers_finished": self._on_event(_Event.HEADERS_FINISHED),
+                "on_part_data": self._on_data(_Event.PART_DATA),
+                "on_part_end": self._on_event(_Event.PART_END),
+            },
+        )
+
+    @classmethod
+    def from_request(cls, request: Request) -> "StreamingMultipartReader":
+        content_type, options = parse_options_header(
+            request.headers.get("content-type", "")
+        )
+        boundary = options.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise MultipartStreamError("Expected multipart/form-data with boundary")
+        return cls(stream=request.stream(), boundary=boundary)
+
+    def _on_event(self, event: _Event):  # noqa: ANN202
+        def callback() -> None:
+            self._pending.append((event, b""))
+
+        return callback
+
+    def _on_data(self, event: _Event):  # noqa: ANN202
+        def callback(data: bytes, start: int, end: int) -> None:
+            self._pending.append((event, bytes(data[start:end])))
+
+        return callback
+
+    async def _events(self) -> AsyncIterator[tuple[_Event, bytes]]:
+        try:
+            async for chunk in self._stream:
+                self._parser.write(chunk)
+                events, self._pending = self._pending, []
+                for event in events:
+                    yield event
+            self._parser.finalize()
+        except MultipartParseError as e:
+            raise MultipartStreamError(str(e)) from e
+
+        events, self._pending = self._pending, []
+        for event in events:
+            yield event
+
+    async def read_until_file(self) -> StreamingForm:
+        """Чтение полей формы вплоть до первой файловой части.
+
+        Raises:
+            MultipartStreamError: тело запроса не является корректной формой.
+
+        Returns:
+            StreamingForm: прочитанные поля и файловая часть, содержимое
+                которой ещё не прочитано из сокета.
+        """
+        form = StreamingForm()
+        events = self._events()
+        headers: dict[bytes, bytes] = {}
+        header_field = header_value = b""
+        name = ""
+        value = bytearray()
+
+        async for event, data in events:
+            match event:
+                case _Event.PART_BEGIN:
+                    headers.clear()
+                    value.clear()
+                case _Event.HEADER_FIELD:
+                    header_field += data
+                case _Event.HEADER_VALUE:
+                    header_value += data
+                case _Event.HEADER_END:
+                    headers[header_field.lower()] = header_value
+                    header_field = header_value = b""
+                case _Event.HEADERS_FINISHED:
+                    _, options = parse_options_header(
+                        headers.get(b"content-disposition", b"")
+                    )
+                    if b"name" not in options:
+                        raise MultipartStreamError("Form part without a name")
+                    name = options[b"name"].decode()
+                    if b"filename" in options:
+                        content_type = headers.get(b"content-type")
+                        form.file = StreamingUploadFile(
+                            filename=options[b"filename"].decode() or None,
+                            content_type=content_type.decode()
+                            if content_type
+                            else None,
+                            chunks=_iter_part_data(events),
+                        )
+                        return form
+                case _Event.PART_DATA:
+                    value += data
+                    if len(value) > self._max_field_size:
+                        raise MultipartStreamError(f"Form field {name!r} is too large")
+                case _Event.PART_END:
+                    form.fields[name] = value.decode(errors="replace")
+
+        return form
+
+
+async def _iter_part_data(
+    events: AsyncIterator[tuple[_Event, bytes]],
+) -> AsyncIterator[bytes]:
+    async for event, data in events:
+        if event is _Event.PART_DATA:
+            yield data
+        elif event is _Event.PART_END:
+            return
+    # Тело оборвалось до разделителя: файл мог прийти не полностью
+    raise MultipartStreamError("File part is not terminated by a boundary")
@@ -1,31 +1,100 @@
-from typing import Annotated, assert_never
+from collections.abc import AsyncIterator
+from typing import Annotated, NoReturn, assert_never
 from uuid import UUID
 
 from aioinject import Inject
 from aioinject.ext.fastapi import inject
-from fastapi import APIRouter, Form, Path, UploadFile
-from fastapi_pagination import Page, paginate
-from result import Err
+from fastapi import (
+    APIRouter,
+    File,
+    Form,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import ValidationError
+from result import Err, Ok
 from starlette import status
+from starlette.requests import ClientDisconnect
 
+from api.downloads import (
+    RangeNotSatisfiableError,
+    content_disposition,
+    create_validators,
+    parse_range,
+)
 from api.exceptions import (
+    BaseHTTPError,
+    ContentTypeNotAllowedHTTPError,
     FileContentTypeIsNoneHTTPError,
     FilenameIsNoneHTTPError,
+    FileStorageHTTPError,
+    InvalidBatchHTTPError,
+    InvalidCursorHTTPError,
     InvalidFileSizeHTTPError,
+    InvalidRatingHTTPError,
+    InvalidUploadKeyHTTPError,
+    MalformedMultipartHTTPError,
     ObjectNotFoundHTTPError,
+    RangeNotSatisfiableHTTPError,
+    UploadCompletionHTTPError,
+    UploadIncompleteHTTPError,
+    UploadLockedHTTPError,
+    UploadOffsetMismatchHTTPError,
 )
-from core.exceptions import ObjectNotFoundError
+from api.multipart import MultipartStreamError, StreamingMultipartReader
+from api.tracing import TracedAPIRoute
+from core.exceptions import InvalidCursorError, ObjectNotFoundError
+from core.files.dto import CompletedPartDTO, ResumableUploadDTO
 from core.files.exceptions import (
     ContentTypeIsNoneError,
+    ContentTypeNotAllowedError,
     FilenameIsNoneError,
+    FileStorageError,
     InvalidFileSizeError,
+    InvalidUploadKeyError,
+    UploadCompletionError,
+    UploadIncompleteError,
+    UploadLockedError,
+    UploadOffsetMismatchError,
 )
-from core.resume.dto import ResumeCreateDTO
+from core.files.resumable import ResumableUploadService
+from core.pagination import KeysetPage
+from core.resume.dto import ResumeCreateDTO, ResumeDTO
+from core.resume.exceptions import InvalidRatingError
 from core.resume.services import ResumeService
+from core.utils import utc_now
+from settings import DownloadSettings, UploadSettings
 
-from .schemas import ResumeSchema
+from .export import EXPORT_MEDIA_TYPES, encode_export
+from .schemas import (
+    DirectUploadCompleteSchema,
+    DirectUploadSchema,
+    FileUploadInitiateSchema,
+    ResumableUploadSchema,
+    ResumeArchiveSchema,
+    ResumeBatchDeleteResultSchema,
+    ResumeBatchDeleteSchema,
+    ResumeBatchItemResultSchema,
+    ResumeBatchResultSchema,
+    ResumeDeletionResultSchema,
+    ResumeExportFormat,
+    ResumeListItemSchema,
+    ResumePageSchema,
+    ResumeRateSchema,
+    ResumeRatingSummarySchema,
+    ResumeSearchItemSchema,
+    ResumeSearchPageSchema,
+    ResumeUploadFormSchema,
+)
 
 router = APIRouter(
+    route_class=TracedAPIRoute,
     prefix="/resume",
     tags=["resume"],
 )
@@ -34,15 +103,293 @@ router = APIRouter(
 @router.get(
     "/list",
     responses={
-        status.HTTP_200_OK: {"model": Page[ResumeSchema]},
+        status.HTTP_200_OK: {"model": ResumePageSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid cursor"},
     },
 )
 @inject
 async def read_resume_list(
     service: Annotated[ResumeService, Inject],
-) -> Page[ResumeSchema]:
-    result = await service.read_resume_list()
-    return paginate(ResumeSchema.model_validate_list(result))
+    size: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: Annotated[str | None, Query()] = None,
+    include_total: Annotated[bool, Query()] = False,
+) -> ResumePageSchema:
+    result = await service.read_resume_page(
+        size=size,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    if isinstance(result, Err):
+        match result.err_value:
+            case InvalidCursorError():
+                raise InvalidCursorHTTPError
+            case _ as never:
+                assert_never(never)
+
+    return await _build_resume_page(service, result.ok_value)
+
+
+@router.get(
+    "/top",
+    responses={
+        status.HTTP_200_OK: {"model": ResumePageSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid cursor"},
+    },
+    description=(
+        "Резюме в порядке убывания байесовской средней оценки `ratingScore`, "
+        "учитывающей число выставленных оценок."
+    ),
+)
+@inject
+async def read_top_resumes(
+    service: Annotated[ResumeService, Inject],
+    size: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Annotated[str | None, Query()] = None,
+) -> ResumePageSchema:
+    result = await service.read_top_page(size=size, cursor=cursor)
+    if isinstance(result, Err):
+        match result.err_value:
+            case InvalidCursorError():
+                raise InvalidCursorHTTPError
+            case _ as never:
+                assert_never(never)
+
+    return await _build_resume_page(service, result.ok_value)
+
+
+@router.get(
+    "/search",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeSearchPageSchema},
+    },
+    description=(
+        "Нечёткий поиск по имени кандидата и полнотекстовый поиск по тексту "
+        "файла резюме. Результаты упорядочены по убыванию релевантности `score`."
+    ),
+)
+@inject
+async def search_resumes(
+    service: Annotated[ResumeService, Inject],
+    query: Annotated[str, Query(min_length=1, max_length=200)],
+    size: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=10_000)] = 0,
+) -> ResumeSearchPageSchema:
+    page = await service.search_resumes(query, size=size, offset=offset)
+    download_urls = await service.read_download_urls([hit.resume for hit in page.items])
+    return ResumeSearchPageSchema(
+        items=[
+            ResumeSearchItemSchema.from_hit(
+                hit,
+                download_url=download_urls[hit.resume.id],
+            )
+            for hit in page.items
+        ],
+        next_offset=page.next_offset,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        },
+    },
+    description=(
+        "Выгрузка всех резюме со сведениями о файлах в формате NDJSON или CSV. "
+        "Строки читаются серверным курсором и отдаются по мере чтения."
+    ),
+)
+@inject
+async def export_resumes(
+    service: Annotated[ResumeService, Inject],
+    export_format: Annotated[ResumeExportFormat, Query(alias="format")] = (
+        ResumeExportFormat.NDJSON
+    ),
+) -> StreamingResponse:
+    filename = f"resumes-{utc_now():%Y%m%d-%H%M%S}.{export_format}"
+    return StreamingResponse(
+        encode_export(service.export_resumes(), export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
+
+
+@router.post(
+    "/archive",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/zip": {}}},
+        status.HTTP_404_NOT_FOUND: {"description": "No resumes matched"},
+    },
+    description=(
+        "Потоковая выдача ZIP-архива с файлами резюме, выбранных по "
+        "идентификаторам или по минимальному `rating_score`. Файлы, которые "
+        "не удалось прочитать из S3, перечисляются в `missing-files.txt`."
+    ),
+)
+@inject
+async def download_resume_archive(
+    body: ResumeArchiveSchema,
+    service: Annotated[ResumeService, Inject],
+    settings: Annotated[DownloadSettings, Inject],
+) -> StreamingResponse:
+    if body.ids is not None and len(body.ids) > settings.archive_max_files:
+        raise InvalidBatchHTTPError(
+            message=f"Archive must not contain more than {settings.archive_max_files} items",
+        )
+
+    result = await service.read_archive_files(
+        ids=body.ids,
+        min_rating_score=body.min_rating_score,
+        limit=settings.archive_max_files,
+    )
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case _ as never:
+                assert_never(never)
+
+    filename = f"resumes-{utc_now():%Y%m%d-%H%M%S}.zip"
+    return StreamingResponse(
+        service.stream_archive(
+            result.ok_value,
+            chunk_size=settings.chunk_size,
+            prefetch_files=settings.archive_prefetch_files,
+            prefetch_chunks=settings.archive_prefetch_chunks,
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
+
+
+@router.get(
+    "/{resume_id}",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeListItemSchema},
+        status.HTTP_404_NOT_FOUND: {"description": "Resume not found"},
+    },
+)
+@inject
+async def read_resume(
+    service: Annotated[ResumeService, Inject],
+    resume_id: Annotated[UUID, Path()],
+) -> ResumeListItemSchema:
+    result = await service.read_resume(resume_id)
+    if isinstance(result, Err):
+        match result.err_value:
+            case ObjectNotFoundError() as err:
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case _ as never:
+                assert_never(never)
+
+    resume = result.ok_value
+    download_urls = await service.read_download_urls([resume])
+    return ResumeListItemSchema.from_resume(
+        resume,
+        download_url=download_urls[resume.id],
+    )
+
+
+@router.get(
+    "/{resume_id}/file",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_206_PARTIAL_CONTENT: {"description": "Requested byte range"},
+        status.HTTP_304_NOT_MODIFIED: {"description": "File has not changed"},
+        status.HTTP_307_TEMPORARY_REDIRECT: {
+            "description": "Presigned file URL in redirect mode"
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Resume not found"},
+        status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: {
+            "description": "Range is outside of the file"
+        },
+        status.HTTP_502_BAD_GATEWAY: {"description": "File storage is unavailable"},
+    },
+    description=(
+        "Потоковая выдача файла резюме. Поддерживаются запрос одного диапазона "
+        "байтов `Range` и условные запросы `If-None-Match`, `If-Modified-Since` "
+        "и `If-Range`. В режиме перенаправления возвращается ссылка на файл в S3."
+    ),
+)
+@inject
+async def download_resume_file(
+    request: Request,
+    resume_id: Annotated[UUID, Path()],
+    service: Annotated[ResumeService, Inject],
+    settings: Annotated[DownloadSettings, Inject],
+) -> Response:
+    result = await service.read_resume(resume_id)
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case _ as never:
+                assert_never(never)
+
+    resume = result.ok_value
+    validators = create_validators(resume.file.id.hex, resume.file.created_at)
+    if validators.is_not_modified(request.headers):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=validators.headers(),
+        )
+
+    if settings.redirect_to_presigned_url:
+        download_urls = await service.read_download_urls([resume])
+        return RedirectResponse(
+            download_urls[resume.id],
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        )
+
+    byte_range = None
+    if validators.is_range_applicable(request.headers):
+        try:
+            byte_range = parse_range(
+                request.headers.get("range"), size=resume.file.file_size
+            )
+        except RangeNotSatisfiableError as e:
+            raise RangeNotSatisfiableHTTPError(size=e.size) from None
+
+    chunks = await service.open_resume_file(
+        resume,
+        byte_range=(byte_range.start, byte_range.end) if byte_range else None,
+        chunk_size=settings.chunk_size,
+    )
+    if isinstance(chunks, Err):
+        match chunks.err_value:
+            case FileStorageError():
+                raise FileStorageHTTPError
+            case _ as never:
+                assert_never(never)
+
+    headers = {
+        **validators.headers(),
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition(resume.file.name),
+        "Content-Length": str(resume.file.file_size),
+    }
+    if byte_range is not None:
+        headers["Content-Length"] = str(byte_range.length)
+        headers["Content-Range"] = byte_range.content_range(resume.file.file_size)
+    return StreamingResponse(
+        chunks.ok_value,
+        status_code=(
+            status.HTTP_206_PARTIAL_CONTENT
+            if byte_range is not None
+            else status.HTTP_200_OK
+        ),
+        media_type=resume.file.content_type,
+        headers=headers,
+    )
 
 
 @router.post(
@@ -61,18 +408,503 @@ async def upload_resume(
         rating=rating,
     )
     result = await service.upload_pretender_resume(file=upload_file, dto=dto)
+    if isinstance(result, Err):
+        _raise_upload_error(result.err_value)
+
+
+@router.post(
+    "/upload/stream",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description=(
+        "Принимает ту же форму, что и `/upload`, но передаёт файл в S3 по мере "
+        "чтения тела запроса. Поля `pretender_name` и `rating` должны "
+        "предшествовать файловой части `upload_file`."
+    ),
+)
+@inject
+async def upload_resume_stream(
+    request: Request,
+    service: Annotated[ResumeService, Inject],
+) -> None:
+    try:
+        form = await StreamingMultipartReader.from_request(request).read_until_file()
+    except MultipartStreamError as e:
+        raise MalformedMultipartHTTPError(reason=str(e)) from e
+    if form.file is None:
+        raise MalformedMultipartHTTPError(reason="file part is missing")
+
+    try:
+        fields = ResumeUploadFormSchema.model_validate(form.fields)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from e
+
+    dto = ResumeCreateDTO(
+        pretender_name=fields.pretender_name,
+        rating=fields.rating,
+    )
+    try:
+        result = await service.upload_pretender_resume_stream(
+            filename=form.file.filename,
+            content_type=form.file.content_type,
+            chunks=form.file.chunks,
+            dto=dto,
+        )
+    except MultipartStreamError as e:
+        raise MalformedMultipartHTTPError(reason=str(e)) from e
+    if isinstance(result, Err):
+        _raise_upload_error(result.err_value)
+
+
+@router.post(
+    "/upload/direct",
+    responses={
+        status.HTTP_200_OK: {"model": DirectUploadSchema},
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {"description": "File is too large"},
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Content-type not allowed"
+        },
+    },
+    description=(
+        "Начинает загрузку файла резюме напрямую в S3. Клиент отправляет i-ю часть "
+        "файла размером `partSize` байт (последняя может быть меньше) запросом PUT "
+        "по ссылке `parts[i].url`, запоминает заголовок `ETag` ответа и передаёт "
+        "ключ, идентификатор загрузки и ETag-и частей в `/upload/direct/complete`."
+    ),
+)
+@inject
+async def initiate_direct_resume_upload(
+    body: FileUploadInitiateSchema,
+    service: Annotated[ResumeService, Inject],
+) -> DirectUploadSchema:
+    result = await service.initiate_direct_upload(
+        filename=body.filename,
+        content_type=body.content_type,
+        size=body.size,
+    )
     if isinstance(result, Err):
         match err := result.err_value:
-            case FilenameIsNoneError():
-                raise FilenameIsNoneHTTPError
-            case ContentTypeIsNoneError():
-                raise FileContentTypeIsNoneHTTPError
             case InvalidFileSizeError():
-                raise InvalidFileSizeHTTPError(
-                    max_file_size=err.max_file_size,
+                raise InvalidFileSizeHTTPError(max_file_size=err.max_file_size)
+            case ContentTypeNotAllowedError():
+                raise ContentTypeNotAllowedHTTPError(
+                    allowed_content_types=err.allowed_content_types,
                 )
             case _ as never:
                 assert_never(never)
+    return DirectUploadSchema.from_dto(result.ok_value)
+
+
+@router.post(
+    "/upload/direct/complete",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_409_CONFLICT: {"description": "Upload cannot be completed"},
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {"description": "File is too large"},
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Content-type not allowed"
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid key or rating"},
+        status.HTTP_502_BAD_GATEWAY: {"description": "File storage is unavailable"},
+    },
+)
+@inject
+async def complete_direct_resume_upload(
+    body: DirectUploadCompleteSchema,
+    service: Annotated[ResumeService, Inject],
+) -> None:
+    dto = ResumeCreateDTO(
+        pretender_name=body.pretender_name,
+        rating=body.rating,
+    )
+    result = await service.complete_direct_upload(
+        path=body.key,
+        upload_id=body.upload_id,
+        parts=[
+            CompletedPartDTO(part_number=part.part_number, e_tag=part.e_tag)
+            for part in body.parts
+        ],
+        dto=dto,
+    )
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case InvalidUploadKeyError():
+                raise InvalidUploadKeyHTTPError
+            case UploadCompletionError():
+                raise UploadCompletionHTTPError(reason=err.reason)
+            case InvalidFileSizeError():
+                raise InvalidFileSizeHTTPError(max_file_size=err.max_file_size)
+            case ContentTypeNotAllowedError():
+                raise ContentTypeNotAllowedHTTPError(
+                    allowed_content_types=err.allowed_content_types,
+                )
+            case InvalidRatingError():
+                raise InvalidRatingHTTPError(
+                    min_rating=err.min_rating,
+                    max_rating=err.max_rating,
+                )
+            case FileStorageError():
+                raise FileStorageHTTPError
+            case _ as never:
+                assert_never(never)
+
+
+@router.post(
+    "/upload/resumable",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {"model": ResumableUploadSchema},
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {"description": "File is too large"},
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Content-type not allowed"
+        },
+    },
+    description=(
+        "Начинает возобновляемую загрузку файла резюме. Содержимое файла "
+        "отправляется запросами PATCH на `/upload/resumable/{uploadId}` "
+        "с заголовком `Upload-Offset`; после загрузки всего файла резюме "
+        "сохраняется запросом на `/upload/resumable/{uploadId}/complete`."
+    ),
+)
+@inject
+async def create_resumable_resume_upload(
+    body: FileUploadInitiateSchema,
+    response: Response,
+    service: Annotated[ResumeService, Inject],
+) -> ResumableUploadSchema:
+    result = await service.create_resumable_upload(
+        filename=body.filename,
+        content_type=body.content_type,
+        size=body.size,
+    )
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case InvalidFileSizeError():
+                raise InvalidFileSizeHTTPError(max_file_size=err.max_file_size)
+            case ContentTypeNotAllowedError():
+                raise ContentTypeNotAllowedHTTPError(
+                    allowed_content_types=err.allowed_content_types,
+                )
+            case _ as never:
+                assert_never(never)
+    return _resumable_upload_response(result.ok_value, response)
+
+
+@router.get(
+    "/upload/resumable/{upload_id}",
+    responses={
+        status.HTTP_200_OK: {"model": ResumableUploadSchema},
+        status.HTTP_404_NOT_FOUND: {"description": "Upload not found or expired"},
+    },
+)
+@inject
+async def read_resumable_resume_upload(
+    upload_id: Annotated[UUID, Path()],
+    response: Response,
+    service: Annotated[ResumableUploadService, Inject],
+) -> ResumableUploadSchema:
+    result = await service.get(upload_id)
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case _ as never:
+                assert_never(never)
+    return _resumable_upload_response(result.ok_value, response)
+
+
+@router.patch(
+    "/upload/resumable/{upload_id}",
+    responses={
+        status.HTTP_200_OK: {"model": ResumableUploadSchema},
+        status.HTTP_404_NOT_FOUND: {"description": "Upload not found or expired"},
+        status.HTTP_409_CONFLICT: {"description": "Upload-Offset mismatch"},
+        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: {
+            "description": "Body exceeds file size"
+        },
+        status.HTTP_423_LOCKED: {"description": "Upload is being modified"},
+    },
+    description=(
+        "Дозагрузка файла: тело запроса — содержимое файла начиная со смещения "
+        "`Upload-Offset`. Сохраняются только целые части размером `partSize` "
+        "байт и последняя часть файла, поэтому после обрыва соединения загрузку "
+        "следует продолжать со смещения, возвращённого этим или GET-запросом."
+    ),
+)
+@inject
+async def append_resumable_resume_upload(
+    upload_id: Annotated[UUID, Path()],
+    upload_offset: Annotated[int, Header(alias="Upload-Offset", ge=0)],
+    request: Request,
+    response: Response,
+    service: Annotated[ResumableUploadService, Inject],
+) -> ResumableUploadSchema:
+    result = await service.append(
+        upload_id,
+        offset=upload_offset,
+        chunks=_read_until_disconnect(request),
+    )
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case UploadLockedError():
+                raise UploadLockedHTTPError
+            case UploadOffsetMismatchError():
+                raise UploadOffsetMismatchHTTPError(expected_offset=err.expected_offset)
+            case InvalidFileSizeError():
+                raise InvalidFileSizeHTTPError(max_file_size=err.max_file_size)
+            case _ as never:
+                assert_never(never)
+    return _resumable_upload_response(result.ok_value, response)
+
+
+@router.post(
+    "/upload/resumable/{upload_id}/complete",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Upload not found or expired"},
+        status.HTTP_409_CONFLICT: {"description": "Upload is incomplete"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid rating"},
+        status.HTTP_423_LOCKED: {"description": "Upload is being modified"},
+    },
+)
+@inject
+async def complete_resumable_resume_upload(
+    upload_id: Annotated[UUID, Path()],
+    body: ResumeUploadFormSchema,
+    service: Annotated[ResumeService, Inject],
+) -> None:
+    dto = ResumeCreateDTO(
+        pretender_name=body.pretender_name,
+        rating=body.rating,
+    )
+    result = await service.complete_resumable_upload(upload_id, dto=dto)
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case UploadLockedError():
+                raise UploadLockedHTTPError
+            case UploadIncompleteError():
+                raise UploadIncompleteHTTPError(
+                    offset=err.offset,
+                    file_size=err.file_size,
+                )
+            case UploadCompletionError():
+                raise UploadCompletionHTTPError(reason=err.reason)
+            case InvalidRatingError():
+                raise InvalidRatingHTTPError(
+                    min_rating=err.min_rating,
+                    max_rating=err.max_rating,
+                )
+            case _ as never:
+                assert_never(never)
+
+
+@router.post(
+    "/upload/batch",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeBatchResultSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid batch"},
+    },
+    description=(
+        "Принимает повторяющиеся поля `pretender_name`, `rating` и `upload_file`; "
+        "i-е значения полей образуют i-й элемент пакета."
+    ),
+)
+@inject
+async def upload_resume_batch(
+    pretender_names: Annotated[list[str], Form(alias="pretender_name")],
+    ratings: Annotated[list[float], Form(alias="rating")],
+    upload_files: Annotated[list[UploadFile], File(alias="upload_file")],
+    service: Annotated[ResumeService, Inject],
+    settings: Annotated[UploadSettings, Inject],
+) -> ResumeBatchResultSchema:
+    if not len(pretender_names) == len(ratings) == len(upload_files):
+        raise InvalidBatchHTTPError(
+            message="pretender_name, rating and upload_file must have the same length",
+        )
+    if len(upload_files) > settings.max_batch_size:
+        raise InvalidBatchHTTPError(
+            message=f"Batch must not contain more than {settings.max_batch_size} items",
+        )
+
+    results = await service.upload_pretender_resumes(
+        [
+            (file, ResumeCreateDTO(pretender_name=name, rating=rating))
+            for name, rating, file in zip(
+                pretender_names, ratings, upload_files, strict=True
+            )
+        ]
+    )
+    return ResumeBatchResultSchema(
+        items=[
+            ResumeBatchItemResultSchema(index=index, resume_id=result.ok_value)
+            if isinstance(result, Ok)
+            else ResumeBatchItemResultSchema(
+                index=index,
+                error=_upload_http_error(result.err_value).error_schema,
+            )
+            for index, result in enumerate(results)
+        ]
+    )
+
+
+@router.post(
+    "/delete/batch",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeBatchDeleteResultSchema},
+    },
+)
+@inject
+async def delete_resume_batch(
+    body: ResumeBatchDeleteSchema,
+    service: Annotated[ResumeService, Inject],
+) -> ResumeBatchDeleteResultSchema:
+    results = await service.delete_resumes(body.ids)
+    return ResumeBatchDeleteResultSchema(
+        items=ResumeDeletionResultSchema.model_validate_list(results),
+    )
+
+
+@router.put(
+    "/rating/{resume_id}",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeRatingSummarySchema},
+        status.HTTP_404_NOT_FOUND: {"description": "Resume not found"},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid rating"},
+    },
+)
+@inject
+async def rate_resume(
+    resume_id: Annotated[UUID, Path()],
+    body: ResumeRateSchema,
+    service: Annotated[ResumeService, Inject],
+) -> ResumeRatingSummarySchema:
+    result = await service.rate_resume(
+        resume_id=resume_id,
+        user_id=body.user_id,
+        value=body.value,
+    )
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case InvalidRatingError():
+                raise InvalidRatingHTTPError(
+                    min_rating=err.min_rating,
+                    max_rating=err.max_rating,
+                )
+            case _ as never:
+                assert_never(never)
+    return ResumeRatingSummarySchema.model_validate(result.ok_value)
+
+
+@router.delete(
+    "/rating/{resume_id}/{user_id}",
+    responses={
+        status.HTTP_200_OK: {"model": ResumeRatingSummarySchema},
+        status.HTTP_404_NOT_FOUND: {"description": "Resume or rating not found"},
+    },
+)
+@inject
+async def unrate_resume(
+    resume_id: Annotated[UUID, Path()],
+    user_id: Annotated[UUID, Path()],
+    service: Annotated[ResumeService, Inject],
+) -> ResumeRatingSummarySchema:
+    result = await service.unrate_resume(resume_id=resume_id, user_id=user_id)
+    if isinstance(result, Err):
+        match err := result.err_value:
+            case ObjectNotFoundError():
+                raise ObjectNotFoundHTTPError(
+                    identifier=str(err.id), entity_name=err.entity_name
+                )
+            case _ as never:
+                assert_never(never)
+    return ResumeRatingSummarySchema.model_validate(result.ok_value)
+
+
+async def _build_resume_page(
+    service: ResumeService,
+    page: KeysetPage[ResumeDTO],
+) -> ResumePageSchema:
+    download_urls = await service.read_download_urls(page.items)
+    return ResumePageSchema(
+        items=[
+            ResumeListItemSchema.from_resume(
+                resume,
+                download_url=download_urls[resume.id],
+            )
+            for resume in page.items
+        ],
+        next_cursor=page.next_cursor,
+        previous_cursor=page.previous_cursor,
+        total=page.total,
+    )
+
+
+def _resumable_upload_response(
+    upload: ResumableUploadDTO,
+    response: Response,
+) -> ResumableUploadSchema:
+    response.headers["Upload-Offset"] = str(upload.offset)
+    response.headers["Upload-Length"] = str(upload.file_size)
+    return ResumableUploadSchema.model_validate(upload)
+
+
+async def _read_until_disconnect(request: Request) -> AsyncIterator[bytes]:
+    # Обрыв соединения завершает тело запроса: всё, что успело дойти
+    # целыми частями, остаётся сохранённым
+    try:
+        async for chunk in request.stream():
+            yield chunk
+    except ClientDisconnect:
+        return
+
+
+def _raise_upload_error(
+    err: FilenameIsNoneError
+    | ContentTypeIsNoneError
+    | InvalidFileSizeError
+    | InvalidRatingError,
+) -> NoReturn:
+    raise _upload_http_error(err)
+
+
+def _upload_http_error(
+    err: FilenameIsNoneError
+    | ContentTypeIsNoneError
+    | InvalidFileSizeError
+    | InvalidRatingError
+    | FileStorageError,
+) -> BaseHTTPError:
+    match err:
+        case FilenameIsNoneError():
+            return FilenameIsNoneHTTPError()
+        case ContentTypeIsNoneError():
+            return FileContentTypeIsNoneHTTPError()
+        case InvalidFileSizeError():
+            return InvalidFileSizeHTTPError(
+                max_file_size=err.max_file_size,
+            )
+        case InvalidRatingError():
+            return InvalidRatingHTTPError(
+                min_rating=err.min_rating,
+                max_rating=err.max_rating,
+            )
+        case FileStorageError():
+            return FileStorageHTTPError()
+        case _ as never:
+            assert_never(never)
 
 
 @router.delete(
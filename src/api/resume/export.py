@@ -0,0 +1,62 @@
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Any
+
+from core.resume.dto import ResumeExportRowDTO
+
+from .schemas import ResumeExportFormat, ResumeExportSchema
+
+EXPORT_MEDIA_TYPES = {
+    ResumeExportFormat.NDJSON: "application/x-ndjson",
+    ResumeExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def encode_export(
+    batches: AsyncIterable[Sequence[ResumeExportRowDTO]],
+    export_format: ResumeExportFormat,
+) -> AsyncIterator[bytes]:
+    """Кодирование выгрузки резюме: каждая пачка строк — один фрагмент ответа."""
+    match export_format:
+        case ResumeExportFormat.NDJSON:
+            return _encode_ndjson(batches)
+        case ResumeExportFormat.CSV:
+            return _encode_csv(batches)
+
+
+async def _encode_ndjson(
+    batches: AsyncIterable[Sequence[ResumeExportRowDTO]],
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(
+            ResumeExportSchema.model_validate(row)
+            .model_dump_json(by_alias=True)
+            .encode()
+            + b"\n"
+            for row in batch
+        )
+
+
+async def _encode_csv(
+    batches: AsyncIterable[Sequence[ResumeExportRowDTO]],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        field.alias or name for name, field in ResumeExportSchema.model_fields.items()
+    )
+    async for batch in batches:
+        writer.writerows(_csv_row(row) for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Заголовок отдаётся и при пустой выгрузке
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _csv_row(row: ResumeExportRowDTO) -> list[Any]:
+    values = ResumeExportSchema.model_validate(row).model_dump(mode="json")
+    return ["" if value is None else value for value in values.values()]
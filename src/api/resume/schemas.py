@@ -1,8 +1,25 @@
+import enum
 from datetime import datetime
 from typing import Any, Iterable, Self
 from uuid import UUID
 
+from pydantic import Field, model_validator
+
+from api.exceptions import APIErrorSchema
+from core.files.dto import DirectUploadDTO
+from core.files.storage import MAX_PARTS_COUNT
+from core.resume.dto import ResumeDeletionStatus, ResumeSearchHitDTO
 from core.schema import BaseSchema
+from db.models.file import ExtractionStatus
+
+
+class UploadedFileSummarySchema(BaseSchema):
+    id: UUID
+    name: str
+    content_type: str
+    file_size: int
+    created_at: datetime
+    extraction_status: ExtractionStatus
 
 
 class ResumeSchema(BaseSchema):
@@ -11,8 +28,174 @@ class ResumeSchema(BaseSchema):
     updated_at: datetime
     pretender_name: str
     rating: float
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
     file_id: UUID
+    file: UploadedFileSummarySchema
 
     @classmethod
     def model_validate_list(cls, models: Iterable[Any]) -> list[Self]:
         return [cls.model_validate(model) for model in models]
+
+
+class ResumeListItemSchema(ResumeSchema):
+    download_url: str
+
+    @classmethod
+    def from_resume(cls, resume: Any, download_url: str) -> Self:
+        return cls(
+            **ResumeSchema.model_validate(resume).model_dump(),
+            download_url=download_url,
+        )
+
+
+class ResumeSearchItemSchema(ResumeListItemSchema):
+    score: float
+
+    @classmethod
+    def from_hit(cls, hit: ResumeSearchHitDTO, download_url: str) -> Self:
+        return cls(
+            **ResumeSchema.model_validate(hit.resume).model_dump(),
+            download_url=download_url,
+            score=hit.score,
+        )
+
+
+class ResumeSearchPageSchema(BaseSchema):
+    items: list[ResumeSearchItemSchema]
+    next_offset: int | None
+
+
+class ResumePageSchema(BaseSchema):
+    items: list[ResumeListItemSchema]
+    next_cursor: str | None
+    previous_cursor: str | None
+    total: int | None = None
+
+
+class ResumeUploadFormSchema(BaseSchema):
+    pretender_name: str
+    rating: float
+
+
+class FileUploadInitiateSchema(BaseSchema):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(min_length=1, max_length=64)
+    size: int = Field(gt=0)
+
+
+class DirectUploadPartSchema(BaseSchema):
+    part_number: int
+    url: str
+
+
+class DirectUploadSchema(BaseSchema):
+    key: str
+    upload_id: str
+    part_size: int
+    parts: list[DirectUploadPartSchema]
+    expires_in: int
+
+    @classmethod
+    def from_dto(cls, dto: DirectUploadDTO) -> Self:
+        return cls(
+            key=dto.path,
+            upload_id=dto.upload_id,
+            part_size=dto.part_size,
+            parts=[
+                DirectUploadPartSchema(part_number=part_number, url=url)
+                for part_number, url in enumerate(dto.part_urls, start=1)
+            ],
+            expires_in=dto.expires_in,
+        )
+
+
+class DirectUploadCompletedPartSchema(BaseSchema):
+    part_number: int = Field(ge=1, le=MAX_PARTS_COUNT)
+    e_tag: str = Field(min_length=1)
+
+
+class DirectUploadCompleteSchema(BaseSchema):
+    key: str = Field(min_length=1, max_length=1024)
+    upload_id: str = Field(min_length=1)
+    parts: list[DirectUploadCompletedPartSchema] = Field(
+        min_length=1, max_length=MAX_PARTS_COUNT
+    )
+    pretender_name: str
+    rating: float
+
+
+class ResumableUploadSchema(BaseSchema):
+    id: UUID
+    file_size: int
+    offset: int
+    part_size: int
+    expires_at: datetime
+
+
+class ResumeBatchItemResultSchema(BaseSchema):
+    index: int
+    resume_id: UUID | None = None
+    error: APIErrorSchema | None = None
+
+
+class ResumeBatchResultSchema(BaseSchema):
+    items: list[ResumeBatchItemResultSchema]
+
+
+class ResumeBatchDeleteSchema(BaseSchema):
+    ids: list[UUID] = Field(min_length=1, max_length=10_000)
+
+
+class ResumeDeletionResultSchema(BaseSchema):
+    resume_id: UUID
+    status: ResumeDeletionStatus
+
+
+class ResumeBatchDeleteResultSchema(BaseSchema):
+    items: list[ResumeDeletionResultSchema]
+
+
+class ResumeRateSchema(BaseSchema):
+    user_id: UUID
+    value: float
+
+
+class ResumeRatingSummarySchema(BaseSchema):
+    resume_id: UUID
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
+
+
+class ResumeExportFormat(enum.StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ResumeExportSchema(BaseSchema):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    pretender_name: str
+    rating: float
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
+    file_id: UUID
+    file_name: str
+    file_content_type: str
+    file_size: int
+    file_extraction_status: ExtractionStatus
+
+
+class ResumeArchiveSchema(BaseSchema):
+    ids: list[UUID] | None = Field(default=None, min_length=1)
+    min_rating_score: float | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> Self:
+        if (self.ids is None) == (self.min_rating_score is None):
+            raise ValueError("Exactly one of ids and min_rating_score must be set")
+        return self
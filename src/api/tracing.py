@@ -0,0 +1,115 @@
+import functools
+import inspect
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, Final
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import registry
+from core.tracing import Span
+
+UNMATCHED_ROUTE: Final = "<unmatched>"
+
+request_duration = registry.histogram(
+    "http_server_request_duration_seconds",
+    "Duration of HTTP requests from receipt until the application returns",
+    label_names=("method", "route", "status"),
+)
+handler_duration = registry.histogram(
+    "http_server_handler_duration_seconds",
+    "Duration of endpoint functions, excluding request parsing and response "
+    "serialization",
+    label_names=("method", "route"),
+)
+
+
+class TracingMiddleware:
+    """Спан и замер длительности каждого HTTP-запроса.
+
+    Запрос завершается, когда приложение возвращает управление, то есть уже
+    после фиксации транзакции сессии, которая происходит после отправки ответа.
+    Метка маршрута — шаблон пути, а не сам путь, чтобы число гистограмм
+    не зависело от идентификаторов в URL.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = UNMATCHED_ROUTE
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        span = Span(
+            method,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        try:
+            with span:
+                try:
+                    await self.app(scope, receive, send_with_status)
+                finally:
+                    route = _route_template(scope)
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+                    span.set_attribute("http.response.status_code", status_code)
+                    if status_code >= 500:
+                        span.mark_failed(f"HTTP {status_code}")
+        finally:
+            request_duration.labels(method, route, str(status_code)).observe(
+                span.duration
+            )
+
+
+class TracedAPIRoute(APIRoute):
+    """Маршрут, замеряющий время выполнения функции-обработчика.
+
+    Разница с длительностью запроса приходится на разбор параметров и тела
+    запроса, в том числе multipart, и на сериализацию ответа.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if inspect.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = _trace_endpoint(
+                self.dependant.call,
+                method=",".join(sorted(self.methods)),
+                route=self.path_format,
+            )
+        return super().get_route_handler()
+
+
+def _trace_endpoint(
+    call: Callable[..., Awaitable[Any]],
+    *,
+    method: str,
+    route: str,
+) -> Callable[..., Awaitable[Any]]:
+    histogram = handler_duration.labels(method, route)
+
+    @functools.wraps(call)
+    async def endpoint(*args: Any, **kwargs: Any) -> Any:
+        span = Span(f"{method} {route} handler")
+        try:
+            with span:
+                return await call(*args, **kwargs)
+        finally:
+            histogram.observe(span.duration)
+
+    return endpoint
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", UNMATCHED_ROUTE)
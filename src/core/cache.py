@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, Protocol, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Внутрипроцессный LRU-кэш с ограниченным временем жизни записей.
+
+    Устаревшие записи удаляются лениво при обращении, а при переполнении
+    вытесняются наименее востребованные.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheBackend(Protocol):
+    """Хранилище кэша.
+
+    Кроме значений с ограниченным временем жизни хранит счётчики версий
+    пространств имён. Счётчики не должны вытесняться и истекать: сброс
+    счётчика вернул бы в оборот записи, сохранённые под старыми версиями.
+    """
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    async def get_version(self, namespace: str) -> int: ...
+
+    async def bump_version(self, namespace: str) -> int: ...
+
+
+class InMemoryCacheBackend:
+    """Хранилище кэша в памяти процесса.
+
+    Значения возвращаются по ссылке, без копирования, поэтому в кэш следует
+    помещать только неизменяемые объекты. Версии общие лишь для одного
+    процесса: при нескольких процессах устаревание данных в остальных
+    ограничено временем жизни записей.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._entries: TTLCache[str, Any] = TTLCache(max_size=max_size)
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> Any | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    async def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump_version(self, namespace: str) -> int:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        return self._versions[namespace]
+
+
+class VersionedCache:
+    """Read-through кэш пространства имён с версионными ключами.
+
+    Ключ записи включает текущую версию пространства имён, поэтому
+    `invalidate` за O(1) делает недоступными все ранее сохранённые записи,
+    а они сами вытесняются из хранилища по LRU или истечении `ttl`.
+    Версия читается до загрузки данных: если запись изменили во время
+    загрузки, результат сохранится под уже неактуальной версией.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float) -> None:
+        self._backend = backend
+        self._namespace = namespace
+        self._ttl = ttl
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[V]]) -> V:
+        version = await self._backend.get_version(self._namespace)
+        versioned_key = f"{self._namespace}:{version}:{key}"
+        value = await self._backend.get(versioned_key)
+        if value is not None:
+            return value
+
+        value = await loader()
+        if value is not None:
+            await self._backend.set(versioned_key, value, ttl=self._ttl)
+        return value
+
+    async def invalidate(self) -> None:
+        await self._backend.bump_version(self._namespace)
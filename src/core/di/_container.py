@@ -6,18 +6,25 @@ import aioinject
 from pydantic_settings import BaseSettings
 
 from core.di._types import Providers
-from db.dependencies import create_session
+from db.dependencies import create_read_session, create_session
 from settings import (
     ApplicationSettings,
+    CacheSettings,
     DatabaseSettings,
+    DownloadSettings,
+    ExtractionSettings,
+    OutboxSettings,
+    RatingSettings,
+    ResumableUploadSettings,
     S3Settings,
     UploadSettings,
     get_settings,
 )
 
-from .modules import files, resume
+from .modules import cache, files, resume
 
 MODULES: Iterable[Providers] = [
+    cache.PROVIDERS,
     resume.PROVIDERS,
     files.PROVIDERS,
 ]
@@ -25,7 +32,13 @@ MODULES: Iterable[Providers] = [
 
 SETTINGS = (
     ApplicationSettings,
+    CacheSettings,
     DatabaseSettings,
+    DownloadSettings,
+    ExtractionSettings,
+    OutboxSettings,
+    RatingSettings,
+    ResumableUploadSettings,
     S3Settings,
     UploadSettings,
 )
@@ -45,6 +58,7 @@ def _register_settings(
 def create_container() -> aioinject.Container:
     container = aioinject.Container()
     container.register(aioinject.Scoped(create_session))
+    container.register(aioinject.Scoped(create_read_session))
 
     for provider in itertools.chain.from_iterable(MODULES):
         container.register(provider)
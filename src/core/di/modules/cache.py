@@ -0,0 +1,14 @@
+import aioinject
+
+from core.cache import CacheBackend, InMemoryCacheBackend
+from core.di._types import Providers
+from settings import CacheSettings
+
+
+def create_cache_backend(settings: CacheSettings) -> CacheBackend:
+    return InMemoryCacheBackend(max_size=settings.max_size)
+
+
+PROVIDERS: Providers = [
+    aioinject.Singleton(create_cache_backend),
+]
@@ -3,14 +3,47 @@ from collections.abc import AsyncIterator
 
 import aioboto3
 import aioinject
+from aiobotocore.config import AioConfig
 
+from core.cache import TTLCache
 from core.di._types import Providers
-from core.files.repository import UploadedFileRepository
+from core.files.extraction import TextExtractionWorker
+from core.files.outbox import FileDeletionOutboxWorker, FileDeletionScheduler
+from core.files.repository import ResumableUploadRepository, UploadedFileRepository
+from core.files.resumable import ResumableUploadService
 from core.files.service import FileService
 from core.files.storage import S3Storage
+from core.files.sweeper import MultipartUploadSweeper
+from core.files.tracing import instrument_s3_client
 from settings import S3Settings
 
 
+def create_s3_config(settings: S3Settings) -> AioConfig:
+    """Настройки пула соединений, таймаутов и повторов клиента S3.
+
+    Пул должен вмещать все одновременные загрузки частей, иначе запросы
+    ожидают освобождения соединения. Режим повторов `adaptive` помимо
+    повторов с экспоненциальной задержкой ограничивает частоту запросов
+    клиента при ответах о перегрузке. Таймаут чтения ограничивает ожидание
+    каждого чтения из сокета, поэтому зависший узел хранилища приводит
+    к повтору запроса, а не к бесконечному ожиданию.
+    """
+    return AioConfig(
+        max_pool_connections=settings.max_pool_connections,
+        retries={
+            "mode": settings.retry_mode,
+            # В отличие от `max_attempts` учитывает и первую попытку
+            "total_max_attempts": settings.max_attempts,
+        },
+        connect_timeout=settings.connect_timeout,
+        read_timeout=settings.read_timeout,
+        s3={"addressing_style": settings.addressing_style},
+        # Время жизни простаивающих соединений пула; проверка живости самих
+        # TCP-соединений (SO_KEEPALIVE) включена в aiohttp по умолчанию
+        connector_args={"keepalive_timeout": settings.keepalive_timeout},
+    )
+
+
 @contextlib.asynccontextmanager
 async def create_s3_storage(settings: S3Settings) -> AsyncIterator[S3Storage]:
     session = aioboto3.Session(
@@ -20,12 +53,26 @@ async def create_s3_storage(settings: S3Settings) -> AsyncIterator[S3Storage]:
     async with session.client(
         "s3",
         endpoint_url=settings.endpoint_url,
+        config=create_s3_config(settings),
     ) as client:
-        yield S3Storage(client=client, bucket=settings.bucket)
+        instrument_s3_client(client)
+        yield S3Storage(
+            client=client,
+            bucket=settings.bucket,
+            presigned_url_expires_in=settings.presigned_url_expires_in,
+            presigned_url_cache=TTLCache(max_size=settings.presigned_url_cache_size),
+            presigned_url_cache_margin=settings.presigned_url_cache_margin,
+        )
 
 
 PROVIDERS: Providers = [
     aioinject.Singleton(create_s3_storage),
+    aioinject.Singleton(FileDeletionOutboxWorker),
+    aioinject.Singleton(FileDeletionScheduler),
+    aioinject.Singleton(TextExtractionWorker),
+    aioinject.Singleton(MultipartUploadSweeper),
     aioinject.Scoped(UploadedFileRepository),
+    aioinject.Scoped(ResumableUploadRepository),
     aioinject.Scoped(FileService),
+    aioinject.Scoped(ResumableUploadService),
 ]
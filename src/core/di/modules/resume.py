@@ -1,10 +1,18 @@
 import aioinject
 
 from core.di._types import Providers
-from core.resume.repositories import ResumeRepository
+from core.resume.cache import ResumeCache
+from core.resume.repositories import (
+    ResumeRatingRepository,
+    ResumeReadRepository,
+    ResumeRepository,
+)
 from core.resume.services import ResumeService
 
 PROVIDERS: Providers = [
+    aioinject.Singleton(ResumeCache),
     aioinject.Scoped(ResumeRepository),
+    aioinject.Scoped(ResumeReadRepository),
+    aioinject.Scoped(ResumeRatingRepository),
     aioinject.Scoped(ResumeService),
 ]
@@ -19,3 +19,12 @@ class ObjectNotFoundError(Exception):
         self.id = id_
         self.entity_name = entity_name
         self.trace_id = trace_id
+
+
+class InvalidCursorError(Exception):
+    """
+    Исключение для случаев, когда передан повреждённый или чужой курсор пагинации.
+    """
+
+    def __init__(self, cursor: str) -> None:
+        self.cursor = cursor
@@ -0,0 +1,171 @@
+import asyncio
+import collections
+import datetime
+import io
+import logging
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Final
+
+from .dto import UploadedFileSummaryDTO
+
+logger = logging.getLogger(__name__)
+
+MISSING_FILES_ENTRY_NAME: Final = "missing-files.txt"
+
+_END: Final = object()
+
+
+@dataclass(frozen=True, slots=True)
+class _Failure:
+    error: Exception
+
+
+class _ZipSink(io.RawIOBase):
+    """Несмещаемый приёмник, в который `zipfile` пишет архив.
+
+    Записанные байты копятся до вызова `drain`, после чего отдаются в ответ,
+    поэтому в памяти находится только последний записанный фрагмент.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    files: Sequence[UploadedFileSummaryDTO],
+    open_file: Callable[[UploadedFileSummaryDTO], Awaitable[AsyncIterator[bytes]]],
+    *,
+    prefetch_files: int,
+    prefetch_chunks: int,
+) -> AsyncIterator[bytes]:
+    """Потоковая сборка ZIP-архива без сжатия.
+
+    Содержимое следующих `prefetch_files` файлов читается заранее и
+    параллельно, но каждый файл удерживает в очереди не больше
+    `prefetch_chunks` фрагментов, поэтому расход памяти не зависит от размера
+    архива. Файлы записываются без сжатия (`ZIP_STORED`): резюме в PDF и DOCX
+    уже сжаты, а размеры и CRC дописываются после содержимого, так что архив
+    не требует ни диска, ни перемотки потока.
+
+    Файлы, которые не удалось открыть, пропускаются и перечисляются в
+    `MISSING_FILES_ENTRY_NAME`; ошибка посреди чтения файла прерывает поток.
+    """
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    names = unique_entry_names(file.name for file in files)
+    remaining = iter(zip(files, names, strict=True))
+    pending: collections.deque[
+        tuple[UploadedFileSummaryDTO, str, asyncio.Queue[object], asyncio.Task[None]]
+    ] = collections.deque()
+    missing: list[str] = []
+
+    def schedule() -> None:
+        while len(pending) <= max(prefetch_files, 0):
+            if (item := next(remaining, None)) is None:
+                return
+            entry, name = item
+            queue: asyncio.Queue[object] = asyncio.Queue(
+                maxsize=max(prefetch_chunks, 1)
+            )
+            task = asyncio.create_task(_prefetch(open_file, entry, queue))
+            pending.append((entry, name, queue, task))
+
+    try:
+        schedule()
+        while pending:
+            entry, name, queue, _ = pending[0]
+
+            item = await queue.get()
+            if isinstance(item, _Failure):
+                logger.warning("Skipping %s in archive: %s", entry.path, item.error)
+                missing.append(name)
+                pending.popleft()
+                schedule()
+                continue
+
+            info = zipfile.ZipInfo(name, date_time=_zip_date_time(entry.created_at))
+            info.file_size = entry.file_size
+            with archive.open(info, mode="w") as destination:
+                while item is not _END:
+                    if isinstance(item, _Failure):
+                        raise item.error
+                    assert isinstance(item, bytes)
+                    destination.write(item)
+                    yield sink.drain()
+                    item = await queue.get()
+            yield sink.drain()
+            pending.popleft()
+            schedule()
+
+        if missing:
+            archive.writestr(MISSING_FILES_ENTRY_NAME, "\n".join(missing) + "\n")
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Закрытие после ошибки только дописывает оглавление в `sink`
+        archive.close()
+        for *_, task in pending:
+            task.cancel()
+        await asyncio.gather(*(task for *_, task in pending), return_exceptions=True)
+
+
+def unique_entry_names(names: Iterable[str]) -> list[str]:
+    """Имена записей архива без каталогов и повторов.
+
+    Повторяющиеся имена дополняются номером: `resume.pdf`, `resume (2).pdf`.
+    """
+    used: set[str] = set()
+    result = []
+    for name in names:
+        basename = PurePath(name.replace("\\", "/")).name
+        path = PurePath("file" if basename in {"", ".", ".."} else basename)
+        candidate, number = path.name, 1
+        while candidate.casefold() in used:
+            number += 1
+            candidate = f"{path.stem} ({number}){path.suffix}"
+        used.add(candidate.casefold())
+        result.append(candidate)
+    return result
+
+
+async def _prefetch(
+    open_file: Callable[[UploadedFileSummaryDTO], Awaitable[AsyncIterator[bytes]]],
+    file: UploadedFileSummaryDTO,
+    queue: asyncio.Queue[object],
+) -> None:
+    try:
+        async for chunk in await open_file(file):
+            await queue.put(chunk)
+    except Exception as e:  # noqa: BLE001
+        await queue.put(_Failure(e))
+        return
+    await queue.put(_END)
+
+
+def _zip_date_time(value: datetime.datetime) -> tuple[int, int, int, int, int, int]:
+    # Формат ZIP не хранит часовой пояс и не поддерживает даты до 1980 года
+    value = max(
+        value.astimezone(datetime.UTC),
+        datetime.datetime(1980, 1, 1, tzinfo=datetime.UTC),
+    )
+    return value.year, value.month, value.day, value.hour, value.minute, value.second
@@ -1,5 +1,11 @@
+import datetime
 from dataclasses import dataclass
 from pathlib import PurePath
+from typing import Self
+from uuid import UUID
+
+from db.models import UploadedFile
+from db.models.file import ExtractionStatus
 
 
 @dataclass(frozen=True, slots=True)
@@ -9,6 +15,45 @@ class UploadedFileDTO:
     filename: str
     full_path: str
     content_type: str
+    content_hash: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class FileReferenceDTO:
+    """Сохранённый файл с названием и content-type конкретной загрузки.
+
+    При дедупликации запись `uploaded_file` общая для всех загрузок с тем же
+    содержимым и хранит название первой из них.
+    """
+
+    id: UUID
+    name: str
+    content_type: str
+
+
+@dataclass(frozen=True, slots=True)
+class UploadedFileSummaryDTO:
+    id: UUID
+    name: str
+    bucket: str
+    path: str
+    content_type: str
+    file_size: int
+    created_at: datetime.datetime
+    extraction_status: ExtractionStatus
+
+    @classmethod
+    def from_model(cls, model: UploadedFile) -> Self:
+        return cls(
+            id=model.id,
+            name=model.name,
+            bucket=model.bucket,
+            path=model.path,
+            content_type=model.content_type,
+            file_size=model.file_size,
+            created_at=model.created_at,
+            extraction_status=model.extraction_status,
+        )
 
 
 @dataclass(frozen=True, slots=True)
@@ -17,3 +62,67 @@ class FilePartDTO:
     part_number: int
     filename: PurePath
     file_path: PurePath
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObjectDTO:
+    bucket: str
+    path: str
+    filename: str
+
+
+@dataclass(frozen=True, slots=True)
+class FileExtractionTaskDTO:
+    file_id: UUID
+    bucket: str
+    path: str
+    filename: str
+    content_type: str
+    file_size: int
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class FileDeletionTaskDTO:
+    id: int
+    bucket: str
+    path: str
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObjectInfoDTO:
+    size: int
+    content_type: str
+    filename: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class CompletedPartDTO:
+    part_number: int
+    e_tag: str
+
+
+@dataclass(frozen=True, slots=True)
+class DirectUploadDTO:
+    path: str
+    upload_id: str
+    part_size: int
+    part_urls: list[str]
+    expires_in: int
+
+
+@dataclass(frozen=True, slots=True)
+class MultipartUploadDTO:
+    path: str
+    upload_id: str
+    initiated_at: datetime.datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ResumableUploadDTO:
+    id: UUID
+    file_size: int
+    offset: int
+    part_size: int
+    expires_at: datetime.datetime
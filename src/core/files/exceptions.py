@@ -18,3 +18,44 @@ class InvalidFileSizeError(FileUploadValidationError):
     ) -> None:
         self.file_size = file_size
         self.max_file_size = max_file_size
+
+
+class FileStorageError(Exception):
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+
+class ContentTypeNotAllowedError(FileUploadValidationError):
+    def __init__(
+        self,
+        content_type: str,
+        allowed_content_types: list[str],
+    ) -> None:
+        self.content_type = content_type
+        self.allowed_content_types = allowed_content_types
+
+
+class InvalidUploadKeyError(Exception):
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+
+class UploadCompletionError(Exception):
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+
+
+class UploadLockedError(Exception):
+    pass
+
+
+class UploadOffsetMismatchError(Exception):
+    def __init__(self, offset: int, expected_offset: int) -> None:
+        self.offset = offset
+        self.expected_offset = expected_offset
+
+
+class UploadIncompleteError(Exception):
+    def __init__(self, offset: int, file_size: int) -> None:
+        self.offset = offset
+        self.file_size = file_size
@@ -0,0 +1,276 @@
+import asyncio
+import contextlib
+import datetime
+import logging
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy import func, or_, select, update
+
+from core.utils import utc_now
+from db.engine import async_session_factory, engine
+from db.models import UploadedFile
+from db.models.file import EXTRACTION_CHANNEL, ExtractionStatus
+from settings import ExtractionSettings
+
+from .dto import FileExtractionTaskDTO
+from .extractors import ExtractionError, UnsupportedFormatError, extract_text
+from .storage import S3Storage, is_transient_error
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class _ExtractionOutcome:
+    status: ExtractionStatus
+    text: str | None = None
+    error: str | None = None
+    # Попытка не состоялась из-за временной недоступности хранилища
+    # и не учитывается в `max_attempts`
+    postponed: bool = False
+
+
+class TextExtractionWorker:
+    """Фоновое извлечение текста из загруженных файлов.
+
+    Новые записи `uploaded_file` попадают в очередь со статусом `PENDING`;
+    триггер на вставку отправляет уведомление в канал `EXTRACTION_CHANNEL`,
+    которое будит обработчик сразу после фиксации транзакции загрузки.
+    Если подписаться на канал не удалось, очередь опрашивается раз
+    в `poll_interval` секунд.
+
+    Файлы захватываются пачками через `FOR UPDATE SKIP LOCKED` с арендой
+    на `lease_timeout` секунд, скачиваются из S3 параллельно, а разбор
+    выполняется в пуле процессов, чтобы не блокировать цикл событий.
+    Файл, который не удалось скачать из S3, возвращается в очередь
+    не раньше чем через `storage_retry_delay` секунд. Попытка не учитывается
+    в `max_attempts`, только если ошибка временная (см. `is_transient_error`):
+    недоступность хранилища не должна переводить файлы в `FAILED`,
+    а отсутствующий объект или запрет доступа — должны.
+    """
+
+    def __init__(
+        self,
+        s3_storage: S3Storage,
+        settings: ExtractionSettings,
+    ) -> None:
+        self._s3_storage = s3_storage
+        self._settings = settings
+        self._session_factory = async_session_factory
+        self._max_workers = settings.max_workers or os.cpu_count() or 1
+        self._batch_size = settings.batch_size or self._max_workers * 2
+        self._wakeup = asyncio.Event()
+
+    async def run(self) -> None:
+        executor = self._create_executor()
+        try:
+            async with self._listen():
+                while True:
+                    try:
+                        processed = await self.process_batch(executor)
+                    except BrokenProcessPool:
+                        logger.exception("Text extraction process pool is broken")
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = self._create_executor()
+                        processed = 0
+                    except Exception:
+                        logger.exception("Failed to process text extraction queue")
+                        processed = 0
+                    if processed < self._batch_size:
+                        await self._wait_for_files()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def process_batch(self, executor: ProcessPoolExecutor) -> int:
+        """Извлечение текста из одной пачки файлов.
+
+        Raises:
+            BrokenProcessPool: дочерний процесс пула аварийно завершился;
+                файлы пачки будут повторно захвачены по истечении аренды.
+
+        Returns:
+            int: число захваченных файлов.
+        """
+        tasks = await self._claim()
+        if not tasks:
+            return 0
+
+        outcomes = await asyncio.gather(
+            *(self._extract(executor, task) for task in tasks),
+            return_exceptions=True,
+        )
+        finished = [
+            (task, outcome)
+            for task, outcome in zip(tasks, outcomes, strict=True)
+            if isinstance(outcome, _ExtractionOutcome)
+        ]
+        await self._save(finished)
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return len(tasks)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    @contextlib.asynccontextmanager
+    async def _listen(self) -> AsyncIterator[None]:
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                connection = await stack.enter_async_context(engine.connect())
+                stack.push_async_callback(connection.invalidate)
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.add_listener(
+                    EXTRACTION_CHANNEL, self._on_notification
+                )
+            except Exception:
+                logger.exception(
+                    "Failed to listen to %s, falling back to polling",
+                    EXTRACTION_CHANNEL,
+                )
+            yield
+
+    def _on_notification(self, *args: Any) -> None:  # noqa: ARG002
+        self._wakeup.set()
+
+    async def _wait_for_files(self) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), self._settings.poll_interval)
+        self._wakeup.clear()
+
+    async def _claim(self) -> list[FileExtractionTaskDTO]:
+        lease_expired_at = func.now() - datetime.timedelta(
+            seconds=self._settings.lease_timeout
+        )
+        claimable = (
+            select(UploadedFile.id)
+            .where(
+                or_(
+                    (UploadedFile.extraction_status == ExtractionStatus.PENDING)
+                    & or_(
+                        UploadedFile.extraction_next_attempt_at.is_(None),
+                        UploadedFile.extraction_next_attempt_at <= func.now(),
+                    ),
+                    (UploadedFile.extraction_status == ExtractionStatus.PROCESSING)
+                    & (UploadedFile.extraction_started_at < lease_expired_at),
+                )
+            )
+            .order_by(UploadedFile.created_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("claimable")
+        )
+        query = (
+            update(UploadedFile)
+            .where(UploadedFile.id == claimable.c.id)
+            .values(
+                extraction_status=ExtractionStatus.PROCESSING,
+                extraction_started_at=func.now(),
+                extraction_attempts=UploadedFile.extraction_attempts + 1,
+            )
+            .returning(
+                UploadedFile.id,
+                UploadedFile.bucket,
+                UploadedFile.path,
+                UploadedFile.name,
+                UploadedFile.content_type,
+                UploadedFile.file_size,
+                UploadedFile.extraction_attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_factory.begin() as session:
+            rows = await session.execute(query)
+            return [FileExtractionTaskDTO(*row) for row in rows]
+
+    async def _extract(
+        self,
+        executor: ProcessPoolExecutor,
+        task: FileExtractionTaskDTO,
+    ) -> _ExtractionOutcome:
+        if task.attempts > self._settings.max_attempts:
+            return _ExtractionOutcome(
+                status=ExtractionStatus.FAILED,
+                error="Maximum number of extraction attempts exceeded",
+            )
+        if task.file_size > self._settings.max_file_size:
+            return _ExtractionOutcome(
+                status=ExtractionStatus.UNSUPPORTED,
+                error=f"File is larger than {self._settings.max_file_size} bytes",
+            )
+
+        try:
+            content = bytearray()
+            async for chunk in self._s3_storage.iter_object(
+                task.path, bucket=task.bucket
+            ):
+                content += chunk
+        except (BotoCoreError, ClientError) as e:
+            return _ExtractionOutcome(
+                status=ExtractionStatus.PENDING,
+                error=str(e),
+                postponed=is_transient_error(e),
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(
+                executor,
+                extract_text,
+                content,
+                task.filename,
+                task.content_type,
+                self._settings.max_text_length,
+            )
+        except UnsupportedFormatError as e:
+            return _ExtractionOutcome(status=ExtractionStatus.UNSUPPORTED, error=str(e))
+        except ExtractionError as e:
+            return _ExtractionOutcome(status=ExtractionStatus.FAILED, error=str(e))
+        except BrokenProcessPool:
+            raise
+        except Exception as e:  # noqa: BLE001 - ошибки сторонних парсеров
+            return _ExtractionOutcome(status=ExtractionStatus.FAILED, error=repr(e))
+        return _ExtractionOutcome(status=ExtractionStatus.DONE, text=text)
+
+    async def _save(
+        self,
+        results: Sequence[tuple[FileExtractionTaskDTO, _ExtractionOutcome]],
+    ) -> None:
+        if not results:
+            return
+
+        next_attempt_at = utc_now() + datetime.timedelta(
+            seconds=self._settings.storage_retry_delay
+        )
+        async with self._session_factory.begin() as session:
+            await session.execute(
+                update(UploadedFile),
+                [
+                    {
+                        "id": task.file_id,
+                        "extraction_status": outcome.status,
+                        "extraction_attempts": (
+                            task.attempts - 1 if outcome.postponed else task.attempts
+                        ),
+                        "extraction_started_at": None,
+                        "extraction_next_attempt_at": (
+                            next_attempt_at
+                            if outcome.status is ExtractionStatus.PENDING
+                            else None
+                        ),
+                        "extraction_error": outcome.error,
+                        "text_content": outcome.text,
+                    }
+                    for task, outcome in results
+                ],
+            )
@@ -0,0 +1,117 @@
+"""Извлечение текста из файлов резюме.
+
+Функции модуля выполняются в дочерних процессах `ProcessPoolExecutor`,
+поэтому модуль не импортирует ничего, кроме стандартной библиотеки:
+тяжёлые зависимости подгружаются лениво внутри конкретных извлекателей.
+"""
+
+import io
+import zipfile
+from collections.abc import Callable
+from pathlib import PurePath
+from typing import Final
+from xml.etree import ElementTree
+
+_WORD_NAMESPACE: Final = (
+    "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+)
+_DOCX_DOCUMENT: Final = "word/document.xml"
+_MAX_DOCX_DOCUMENT_SIZE: Final = 1024 * 1024 * 64  # 64 Mb
+
+
+class UnsupportedFormatError(Exception):
+    pass
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def _extract_txt(content: bytes) -> str:
+    try:
+        return content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return content.decode("cp1251", errors="replace")
+
+
+def _extract_docx(content: bytes) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            if archive.getinfo(_DOCX_DOCUMENT).file_size > _MAX_DOCX_DOCUMENT_SIZE:
+                raise ExtractionError("DOCX document part is too large")
+            root = ElementTree.fromstring(archive.read(_DOCX_DOCUMENT))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError(f"Malformed DOCX file: {e}") from e
+
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NAMESPACE}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD_NAMESPACE}t":
+                parts.append(node.text or "")
+            elif node.tag == f"{_WORD_NAMESPACE}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_WORD_NAMESPACE}br", f"{_WORD_NAMESPACE}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def _extract_pdf(content: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+    except ModuleNotFoundError as e:
+        raise UnsupportedFormatError("pypdf is not installed") from e
+
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except PyPdfError as e:
+        raise ExtractionError(f"Malformed PDF file: {e}") from e
+
+
+_EXTRACTORS_BY_CONTENT_TYPE: Final[dict[str, Callable[[bytes], str]]] = {
+    "text/plain": _extract_txt,
+    "application/pdf": _extract_pdf,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": _extract_docx,
+}
+_EXTRACTORS_BY_SUFFIX: Final[dict[str, Callable[[bytes], str]]] = {
+    ".txt": _extract_txt,
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+}
+
+
+def extract_text(
+    content: bytes,
+    filename: str,
+    content_type: str,
+    max_length: int,
+) -> str:
+    """Извлечение простого текста из содержимого файла.
+
+    Формат определяется по content-type, а если он не распознан — по расширению
+    имени файла.
+
+    Args:
+        content (bytes): содержимое файла.
+        filename (str): исходное имя файла.
+        content_type (str): content-type файла.
+        max_length (int): максимальная длина возвращаемого текста в символах.
+
+    Raises:
+        UnsupportedFormatError: формат файла не поддерживается.
+        ExtractionError: файл повреждён.
+
+    Returns:
+        str: текст файла, пригодный для сохранения в PostgreSQL.
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    extractor = _EXTRACTORS_BY_CONTENT_TYPE.get(
+        media_type
+    ) or _EXTRACTORS_BY_SUFFIX.get(PurePath(filename).suffix.lower())
+    if extractor is None:
+        raise UnsupportedFormatError(f"Unsupported file format: {content_type}")
+
+    return extractor(content).replace("\x00", "")[:max_length]
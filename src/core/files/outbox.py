@@ -0,0 +1,200 @@
+import asyncio
+import datetime
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy import delete, func, insert, select, update
+
+from core.utils import utc_now
+from db.engine import async_session_factory
+from db.models import FileDeletionOutbox
+from settings import OutboxSettings
+
+from .dto import FileDeletionTaskDTO, UploadedFileDTO
+from .storage import S3Storage
+
+logger = logging.getLogger(__name__)
+
+
+class FileDeletionScheduler:
+    """Отложенное удаление объектов, загруженных до сохранения записей о них.
+
+    Объекты ставятся в очередь удаления в отдельной, сразу фиксируемой
+    транзакции, по умолчанию с отсрочкой `orphan_grace_period`, поэтому
+    удаление не зависит от исхода транзакции запроса. Запись очереди удаляется
+    в той же транзакции, что сохраняет файл (см.
+    `UploadedFileRepository.create_many`), поэтому при откате этой транзакции
+    или падении процесса объект будет удалён обработчиком очереди, а не
+    останется в бакете без ссылок.
+    """
+
+    def __init__(self, settings: OutboxSettings) -> None:
+        self._settings = settings
+        self._session_factory = async_session_factory
+
+    async def schedule(
+        self,
+        files: Sequence[UploadedFileDTO],
+        *,
+        delay: float | None = None,
+    ) -> None:
+        if not files:
+            return
+        next_attempt_at = utc_now() + datetime.timedelta(
+            seconds=self._settings.orphan_grace_period if delay is None else delay
+        )
+        async with self._session_factory.begin() as session:
+            await session.execute(
+                insert(FileDeletionOutbox),
+                [
+                    {
+                        "bucket": file.bucket,
+                        "path": file.full_path,
+                        "next_attempt_at": next_attempt_at,
+                    }
+                    for file in files
+                ],
+            )
+
+
+class FileDeletionOutboxWorker:
+    """Фоновый обработчик очереди удаления файлов из S3.
+
+    Записи `file_deletion_outbox` захватываются в короткой транзакции через
+    `FOR UPDATE SKIP LOCKED`: срок следующей попытки сдвигается на
+    `lease_timeout` секунд, поэтому несколько экземпляров приложения
+    разбирают очередь параллельно, а записи упавшего обработчика будут
+    повторно захвачены по истечении аренды. Удаление из S3 выполняется вне
+    транзакции. Неудачные попытки повторяются с экспоненциально растущей
+    задержкой; после `max_attempts` попыток запись помечается `failed_at`
+    и больше не обрабатывается.
+    """
+
+    def __init__(
+        self,
+        s3_storage: S3Storage,
+        settings: OutboxSettings,
+    ) -> None:
+        self._s3_storage = s3_storage
+        self._settings = settings
+        self._session_factory = async_session_factory
+
+    async def run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception("Failed to process file deletion outbox")
+                processed = 0
+            if processed < self._settings.batch_size:
+                await asyncio.sleep(self._settings.poll_interval)
+
+    async def process_batch(self) -> int:
+        """Обработка одной пачки записей, готовых к удалению.
+
+        Returns:
+            int: число обработанных записей.
+        """
+        tasks = await self._claim()
+        if not tasks:
+            return 0
+
+        errors = await self._delete_objects(tasks)
+        await self._save(tasks, errors)
+        return len(tasks)
+
+    async def _claim(self) -> list[FileDeletionTaskDTO]:
+        claimable = (
+            select(FileDeletionOutbox.id)
+            .where(
+                FileDeletionOutbox.failed_at.is_(None),
+                FileDeletionOutbox.next_attempt_at <= func.now(),
+            )
+            .order_by(FileDeletionOutbox.next_attempt_at)
+            .limit(self._settings.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("claimable")
+        )
+        query = (
+            update(FileDeletionOutbox)
+            .where(FileDeletionOutbox.id == claimable.c.id)
+            .values(
+                next_attempt_at=func.now()
+                + datetime.timedelta(seconds=self._settings.lease_timeout)
+            )
+            .returning(
+                FileDeletionOutbox.id,
+                FileDeletionOutbox.bucket,
+                FileDeletionOutbox.path,
+                FileDeletionOutbox.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_factory.begin() as session:
+            rows = await session.execute(query)
+            return [FileDeletionTaskDTO(*row) for row in rows]
+
+    async def _delete_objects(
+        self,
+        tasks: Sequence[FileDeletionTaskDTO],
+    ) -> dict[tuple[str, str], str]:
+        paths_by_bucket: defaultdict[str, list[str]] = defaultdict(list)
+        for task in tasks:
+            paths_by_bucket[task.bucket].append(task.path)
+
+        errors: dict[tuple[str, str], str] = {}
+        for bucket, paths in paths_by_bucket.items():
+            try:
+                failed = await self._s3_storage.delete_objects(paths, bucket=bucket)
+            except (BotoCoreError, ClientError) as e:
+                failed = dict.fromkeys(paths, str(e))
+            errors.update(((bucket, path), error) for path, error in failed.items())
+        return errors
+
+    async def _save(
+        self,
+        tasks: Sequence[FileDeletionTaskDTO],
+        errors: dict[tuple[str, str], str],
+    ) -> None:
+        now = utc_now()
+        completed, failed = [], []
+        for task in tasks:
+            error = errors.get((task.bucket, task.path))
+            if error is None:
+                completed.append(task.id)
+                continue
+            attempts = task.attempts + 1
+            exhausted = attempts >= self._settings.max_attempts
+            if exhausted:
+                logger.error(
+                    "Giving up deleting %s/%s after %d attempts: %s",
+                    task.bucket,
+                    task.path,
+                    attempts,
+                    error,
+                )
+            failed.append(
+                {
+                    "id": task.id,
+                    "attempts": attempts,
+                    "last_error": error,
+                    "next_attempt_at": now + self._retry_delay(attempts),
+                    "failed_at": now if exhausted else None,
+                }
+            )
+
+        async with self._session_factory.begin() as session:
+            if completed:
+                await session.execute(
+                    delete(FileDeletionOutbox)
+                    .where(FileDeletionOutbox.id.in_(completed))
+                    .execution_options(synchronize_session=False)
+                )
+            if failed:
+                await session.execute(update(FileDeletionOutbox), failed)
+
+    def _retry_delay(self, attempts: int) -> datetime.timedelta:
+        delay = self._settings.retry_base_delay * 2 ** (attempts - 1)
+        return datetime.timedelta(seconds=min(delay, self._settings.retry_max_delay))
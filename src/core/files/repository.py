@@ -1,30 +1,285 @@
+import datetime
+import uuid
+from collections.abc import Sequence
 from uuid import UUID
 
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.files.dto import UploadedFileDTO
-from db.models import UploadedFile
+from core.files.dto import CompletedPartDTO, MultipartUploadDTO, UploadedFileDTO
+from core.utils import utc_now
+from db.models import (
+    FileDeletionOutbox,
+    ResumableUpload,
+    ResumableUploadPart,
+    UploadedFile,
+)
 
 
 class UploadedFileRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    async def acquire(self, content_hash: str) -> UploadedFile | None:
+        """Получение ссылки на уже сохранённый файл с тем же содержимым.
+
+        Счётчик ссылок увеличивается атомарно, а строка остаётся заблокированной
+        до конца транзакции, поэтому конкурентное удаление последнего
+        ссылающегося резюме не удалит файл.
+
+        Returns:
+            UploadedFile | None: найденный файл или None.
+        """
+        query = (
+            update(UploadedFile)
+            .where(UploadedFile.content_hash == content_hash)
+            .values(reference_count=UploadedFile.reference_count + 1)
+            .returning(UploadedFile)
+        )
+        return await self._session.scalar(query)
+
     async def create(self, dto: UploadedFileDTO) -> UploadedFile:
-        model = UploadedFile(
+        """Сохранение записи о загруженном файле.
+
+        Если файл с тем же хешем успел сохранить конкурентный запрос,
+        возвращается существующая запись с увеличенным счётчиком ссылок,
+        а загруженный объект ставится в очередь на удаление.
+        """
+        query = pg_insert(UploadedFile).values(
             bucket=dto.bucket,
             name=dto.filename,
             path=dto.full_path,
             file_size=dto.size,
             content_type=dto.content_type,
+            content_hash=dto.content_hash,
         )
-        self._session.add(model)
-        await self._session.flush()
+        query = query.on_conflict_do_update(
+            index_elements=[UploadedFile.content_hash],
+            set_={"reference_count": UploadedFile.reference_count + 1},
+        ).returning(UploadedFile)
+        model = await self._session.scalar(
+            query, execution_options={"populate_existing": True}
+        )
+        if model.path != dto.full_path:
+            await self._enqueue_deletion([dto])
         return model
 
+    async def create_many(self, dtos: Sequence[UploadedFileDTO]) -> list[UUID]:
+        """Сохранение записей о нескольких загруженных файлах одним запросом.
+
+        Файлы с одинаковым содержимым сводятся к одной записи, счётчик ссылок
+        которой увеличивается на число таких файлов; объекты, оказавшиеся
+        дубликатами, ставятся в очередь на удаление. Отложенное удаление
+        сохранённых объектов, запланированное `FileDeletionScheduler`,
+        отменяется в той же транзакции.
+
+        Returns:
+            list[UUID]: идентификаторы записей в порядке `dtos`.
+        """
+        if not dtos:
+            return []
+
+        unique: dict[str, tuple[UploadedFileDTO, int]] = {}
+        for dto in dtos:
+            key = dto.content_hash or dto.full_path
+            first, count = unique.get(key, (dto, 0))
+            unique[key] = (first, count + 1)
+
+        created_at = utc_now()
+        query = pg_insert(UploadedFile).values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "bucket": dto.bucket,
+                    "name": dto.filename,
+                    "path": dto.full_path,
+                    "file_size": dto.size,
+                    "content_type": dto.content_type,
+                    "content_hash": dto.content_hash,
+                    "reference_count": count,
+                    "created_at": created_at,
+                }
+                for dto, count in unique.values()
+            ]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[UploadedFile.content_hash],
+            set_={
+                "reference_count": UploadedFile.reference_count
+                + query.excluded.reference_count
+            },
+        ).returning(UploadedFile.id, UploadedFile.content_hash, UploadedFile.path)
+
+        stored: dict[str, tuple[UUID, str]] = {}
+        for id_, content_hash, path in await self._session.execute(query):
+            stored[content_hash or path] = (id_, path)
+
+        ids, duplicates = [], []
+        for dto in dtos:
+            id_, path = stored[dto.content_hash or dto.full_path]
+            ids.append(id_)
+            if path != dto.full_path:
+                duplicates.append(dto)
+        await self._session.execute(
+            delete(FileDeletionOutbox)
+            .where(FileDeletionOutbox.path.in_([dto.full_path for dto in dtos]))
+            .execution_options(synchronize_session=False)
+        )
+        await self._enqueue_deletion(duplicates)
+        return ids
+
+    async def _enqueue_deletion(self, dtos: Sequence[UploadedFileDTO]) -> None:
+        if not dtos:
+            return
+        await self._session.execute(
+            insert(FileDeletionOutbox),
+            [{"bucket": dto.bucket, "path": dto.full_path} for dto in dtos],
+        )
+
+    async def create_if_absent(self, dto: UploadedFileDTO) -> UploadedFile | None:
+        """Сохранение записи о файле, если объект с тем же путём ещё не сохранён.
+
+        Уникальный индекс по бакету и пути не даёт конкурентным запросам
+        сохранить один объект дважды.
+
+        Returns:
+            UploadedFile | None: созданная запись или None, если запись уже есть.
+        """
+        query = (
+            pg_insert(UploadedFile)
+            .values(
+                bucket=dto.bucket,
+                name=dto.filename,
+                path=dto.full_path,
+                file_size=dto.size,
+                content_type=dto.content_type,
+                content_hash=dto.content_hash,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[UploadedFile.bucket, UploadedFile.path]
+            )
+            .returning(UploadedFile)
+        )
+        return await self._session.scalar(query)
+
     async def get(self, id_: UUID) -> UploadedFile | None:
         return await self._session.get(UploadedFile, id_)
 
     async def delete(self, model: UploadedFile) -> None:
         await self._session.delete(model)
         await self._session.flush()
+
+
+class ResumableUploadRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create(self, model: ResumableUpload) -> ResumableUpload:
+        self._session.add(model)
+        await self._session.flush()
+        return model
+
+    async def get(self, id_: UUID) -> ResumableUpload | None:
+        query = select(ResumableUpload).where(
+            ResumableUpload.id == id_,
+            ResumableUpload.expires_at > func.now(),
+        )
+        return await self._session.scalar(query)
+
+    async def lock(self, id_: UUID) -> ResumableUpload | None:
+        query = (
+            select(ResumableUpload)
+            .where(
+                ResumableUpload.id == id_,
+                ResumableUpload.expires_at > func.now(),
+            )
+            .with_for_update()
+        )
+        return await self._session.scalar(query)
+
+    async def commit_part(
+        self,
+        id_: UUID,
+        *,
+        part_number: int,
+        e_tag: str,
+        size: int,
+        offset: int,
+        lease: datetime.datetime,
+        next_lease: datetime.datetime,
+    ) -> bool:
+        """Запись загруженной в S3 части и продление аренды загрузки.
+
+        Часть записывается, только если загрузка всё ещё арендована текущим
+        запросом (`lease`) и сохранённое смещение равно `offset`.
+
+        Returns:
+            bool: была ли записана часть.
+        """
+        query = (
+            update(ResumableUpload)
+            .where(
+                ResumableUpload.id == id_,
+                ResumableUpload.offset == offset,
+                ResumableUpload.locked_until == lease,
+            )
+            .values(offset=offset + size, locked_until=next_lease)
+            .returning(ResumableUpload.id)
+        )
+        if await self._session.scalar(query) is None:
+            return False
+
+        part = pg_insert(ResumableUploadPart).values(
+            upload_id=id_,
+            part_number=part_number,
+            e_tag=e_tag,
+            size=size,
+        )
+        await self._session.execute(
+            part.on_conflict_do_update(
+                index_elements=[
+                    ResumableUploadPart.upload_id,
+                    ResumableUploadPart.part_number,
+                ],
+                set_={"e_tag": part.excluded.e_tag, "size": part.excluded.size},
+            )
+        )
+        return True
+
+    async def release(self, id_: UUID, lease: datetime.datetime) -> None:
+        await self._session.execute(
+            update(ResumableUpload)
+            .where(ResumableUpload.id == id_, ResumableUpload.locked_until == lease)
+            .values(locked_until=None)
+        )
+
+    async def get_parts(self, id_: UUID) -> list[CompletedPartDTO]:
+        query = (
+            select(ResumableUploadPart.part_number, ResumableUploadPart.e_tag)
+            .where(ResumableUploadPart.upload_id == id_)
+            .order_by(ResumableUploadPart.part_number)
+        )
+        return [CompletedPartDTO(*row) for row in await self._session.execute(query)]
+
+    async def delete(self, model: ResumableUpload) -> None:
+        await self._session.delete(model)
+        await self._session.flush()
+
+    async def delete_expired(self) -> list[MultipartUploadDTO]:
+        query = (
+            delete(ResumableUpload)
+            .where(ResumableUpload.expires_at <= func.now())
+            .returning(
+                ResumableUpload.path,
+                ResumableUpload.s3_upload_id,
+                ResumableUpload.created_at,
+            )
+        )
+        return [MultipartUploadDTO(*row) for row in await self._session.execute(query)]
+
+    async def get_active_upload_ids(self, s3_upload_ids: Sequence[str]) -> set[str]:
+        query = select(ResumableUpload.s3_upload_id).where(
+            ResumableUpload.s3_upload_id.in_(s3_upload_ids)
+        )
+        return set(await self._session.scalars(query))
@@ -0,0 +1,240 @@
+import datetime
+from collections.abc import AsyncIterable
+from pathlib import PurePath
+from uuid import UUID
+
+from botocore.exceptions import ClientError
+from result import Err, Ok, Result
+
+from core.exceptions import ObjectNotFoundError
+from core.utils import utc_now
+from db.engine import async_session_factory
+from db.models import ResumableUpload
+from settings import ResumableUploadSettings, UploadSettings
+
+from .dto import FileReferenceDTO, ResumableUploadDTO, UploadedFileDTO
+from .exceptions import (
+    ContentTypeNotAllowedError,
+    InvalidFileSizeError,
+    UploadCompletionError,
+    UploadIncompleteError,
+    UploadLockedError,
+    UploadOffsetMismatchError,
+)
+from .repository import ResumableUploadRepository, UploadedFileRepository
+from .service import FileService
+from .storage import S3Storage, build_random_filename, calculate_part_size
+from .streams import iter_blocks, limit_size
+
+
+class ResumableUploadService:
+    """Возобновляемая загрузка файлов по смещению.
+
+    Клиент создаёт загрузку, после чего отправляет содержимое файла запросами
+    на дозагрузку с текущим смещением. Каждая часть сразу передаётся в S3,
+    а её ETag фиксируется в БД отдельной короткой транзакцией, поэтому
+    при обрыве соединения или падении процесса сохраняется всё, что было
+    загружено целыми частями, и клиент продолжает с сохранённого смещения.
+
+    Запрос на дозагрузку арендует загрузку на `lease_timeout` секунд,
+    продлевая аренду после каждой части, чтобы две дозагрузки одного файла
+    не выполнялись одновременно.
+    """
+
+    def __init__(
+        self,
+        s3_storage: S3Storage,
+        file_service: FileService,
+        file_repository: UploadedFileRepository,
+        repository: ResumableUploadRepository,
+        settings: ResumableUploadSettings,
+        upload_settings: UploadSettings,
+    ) -> None:
+        self._s3_storage = s3_storage
+        self._file_service = file_service
+        self._file_repository = file_repository
+        self._repository = repository
+        self._settings = settings
+        self._upload_settings = upload_settings
+        self._session_factory = async_session_factory
+
+    async def create(
+        self,
+        *,
+        directory: PurePath,
+        filename: str,
+        content_type: str,
+        size: int,
+    ) -> Result[ResumableUploadDTO, InvalidFileSizeError | ContentTypeNotAllowedError]:
+        check = self._file_service.check_declared_file(
+            content_type=content_type,
+            size=size,
+        )
+        if isinstance(check, Err):
+            return check
+
+        path, s3_upload_id = await self._s3_storage.create_multipart_upload(
+            filename=build_random_filename(PurePath(filename).name or "file"),
+            file_path=directory,
+            content_type=content_type,
+            original_filename=filename,
+        )
+        upload = await self._repository.create(
+            ResumableUpload(
+                bucket=self._s3_storage.bucket,
+                path=path,
+                s3_upload_id=s3_upload_id,
+                name=filename,
+                content_type=content_type,
+                file_size=size,
+                part_size=calculate_part_size(
+                    size, min_part_size=self._upload_settings.read_chunk_size
+                ),
+                offset=0,
+                expires_at=utc_now()
+                + datetime.timedelta(seconds=self._settings.expires_in),
+            )
+        )
+        return Ok(self._to_dto(upload))
+
+    async def get(self, id_: UUID) -> Result[ResumableUploadDTO, ObjectNotFoundError]:
+        upload = await self._repository.get(id_)
+        if upload is None:
+            return Err(ObjectNotFoundError(id_=str(id_), entity_name="ResumableUpload"))
+        return Ok(self._to_dto(upload))
+
+    async def append(
+        self,
+        id_: UUID,
+        *,
+        offset: int,
+        chunks: AsyncIterable[bytes],
+    ) -> Result[
+        ResumableUploadDTO,
+        ObjectNotFoundError
+        | UploadLockedError
+        | UploadOffsetMismatchError
+        | InvalidFileSizeError,
+    ]:
+        """Дозагрузка файла начиная со смещения `offset`.
+
+        Содержимое передаётся в S3 частями по `part_size` байт. Хвост тела
+        запроса короче части, если он не завершает файл, не сохраняется:
+        клиент узнаёт сохранённое смещение из ответа и продолжает с него.
+        """
+        lease = utc_now() + datetime.timedelta(seconds=self._settings.lease_timeout)
+        async with self._session_factory.begin() as session:
+            upload = await ResumableUploadRepository(session).lock(id_)
+            if upload is None:
+                return Err(
+                    ObjectNotFoundError(id_=str(id_), entity_name="ResumableUpload")
+                )
+            if upload.locked_until is not None and upload.locked_until > utc_now():
+                return Err(UploadLockedError())
+            if upload.offset != offset:
+                return Err(
+                    UploadOffsetMismatchError(
+                        offset=offset, expected_offset=upload.offset
+                    )
+                )
+            upload.locked_until = lease
+            await session.flush()
+            session.expunge(upload)
+
+        blocks = iter_blocks(
+            limit_size(chunks, max_size=upload.file_size - offset),
+            block_size=upload.part_size,
+        )
+        try:
+            async for block in blocks:
+                is_last = offset + len(block) == upload.file_size
+                if len(block) < upload.part_size and not is_last:
+                    break
+                part_number = offset // upload.part_size + 1
+                e_tag = await self._s3_storage.upload_part(
+                    path=upload.path,
+                    upload_id=upload.s3_upload_id,
+                    part_number=part_number,
+                    body=block,
+                )
+                next_lease = utc_now() + datetime.timedelta(
+                    seconds=self._settings.lease_timeout
+                )
+                async with self._session_factory.begin() as session:
+                    committed = await ResumableUploadRepository(session).commit_part(
+                        id_,
+                        part_number=part_number,
+                        e_tag=e_tag,
+                        size=len(block),
+                        offset=offset,
+                        lease=lease,
+                        next_lease=next_lease,
+                    )
+                if not committed:
+                    return Err(UploadLockedError())
+                offset += len(block)
+                lease = next_lease
+        except InvalidFileSizeError as e:
+            return Err(e)
+        finally:
+            async with self._session_factory.begin() as session:
+                await ResumableUploadRepository(session).release(id_, lease=lease)
+
+        upload.offset = offset
+        return Ok(self._to_dto(upload))
+
+    async def complete(
+        self,
+        id_: UUID,
+    ) -> Result[
+        FileReferenceDTO,
+        ObjectNotFoundError
+        | UploadLockedError
+        | UploadIncompleteError
+        | UploadCompletionError,
+    ]:
+        """Сборка загруженного целиком файла в S3 и сохранение записи о нём."""
+        upload = await self._repository.lock(id_)
+        if upload is None:
+            return Err(ObjectNotFoundError(id_=str(id_), entity_name="ResumableUpload"))
+        if upload.locked_until is not None and upload.locked_until > utc_now():
+            return Err(UploadLockedError())
+        if upload.offset < upload.file_size:
+            return Err(
+                UploadIncompleteError(offset=upload.offset, file_size=upload.file_size)
+            )
+
+        try:
+            await self._s3_storage.complete_multipart_upload(
+                path=upload.path,
+                upload_id=upload.s3_upload_id,
+                parts=await self._repository.get_parts(id_),
+            )
+        except ClientError as e:
+            return Err(UploadCompletionError(reason=e.response["Error"]["Code"]))
+
+        model = await self._file_repository.create(
+            dto=UploadedFileDTO(
+                bucket=upload.bucket,
+                full_path=upload.path,
+                size=upload.file_size,
+                filename=upload.name,
+                content_type=upload.content_type,
+            )
+        )
+        await self._repository.delete(upload)
+        return Ok(
+            FileReferenceDTO(
+                id=model.id, name=upload.name, content_type=upload.content_type
+            )
+        )
+
+    @staticmethod
+    def _to_dto(upload: ResumableUpload) -> ResumableUploadDTO:
+        return ResumableUploadDTO(
+            id=upload.id,
+            file_size=upload.file_size,
+            offset=upload.offset,
+            part_size=upload.part_size,
+            expires_at=upload.expires_at,
+        )
@@ -1,20 +1,48 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from dataclasses import dataclass
 from pathlib import PurePath
+from typing import TypeAlias
 
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import UploadFile
 from result import Err, Ok, Result
 
 from db.models.file import UploadedFile
 from settings import UploadSettings
 
-from .dto import UploadedFileDTO
+from .archive import stream_zip
+from .dto import (
+    CompletedPartDTO,
+    DirectUploadDTO,
+    FileReferenceDTO,
+    StoredObjectDTO,
+    UploadedFileDTO,
+    UploadedFileSummaryDTO,
+)
 from .exceptions import (
     ContentTypeIsNoneError,
+    ContentTypeNotAllowedError,
     FilenameIsNoneError,
+    FileStorageError,
     InvalidFileSizeError,
+    InvalidUploadKeyError,
+    UploadCompletionError,
 )
+from .outbox import FileDeletionScheduler
 from .repository import UploadedFileRepository
-from .storage import S3Storage, build_random_filename
+from .storage import (
+    S3Storage,
+    build_random_filename,
+    calculate_part_count,
+    calculate_part_size,
+)
+from .streams import iter_blocks, iter_file, limit_size, prepend
+
+StoredFile: TypeAlias = UploadedFileDTO | FileReferenceDTO
+"""Загруженный в S3 новый объект либо ссылка на уже сохранённый файл с тем же
+содержимым."""
 
 
 @dataclass
@@ -29,11 +57,14 @@ class FileService:
         self,
         s3_storage: S3Storage,
         repository: UploadedFileRepository,
+        deletion_scheduler: FileDeletionScheduler,
         settings: UploadSettings,
     ) -> None:
         self._s3_storage = s3_storage
         self._settings = settings
         self._repository = repository
+        self._deletion_scheduler = deletion_scheduler
+        self._repository_lock = asyncio.Lock()
 
     @staticmethod
     def validate_file(
@@ -68,9 +99,15 @@ class FileService:
         directory: PurePath,
         file: UploadFile,
     ) -> Result[
-        UploadedFileDTO,
+        StoredFile,
         FilenameIsNoneError | ContentTypeIsNoneError | InvalidFileSizeError,
     ]:
+        """Загрузка файла в S3 с дедупликацией по SHA-256 содержимого.
+
+        Если файл с тем же содержимым уже сохранён, объект в S3 не создаётся
+        (а начатая multipart-загрузка прерывается) и возвращается ссылка
+        на существующую запись, счётчик ссылок которой уже увеличен.
+        """
         validated_params_result = self.validate_file(
             file,
             max_file_size=self._settings.allowed_uploaded_file_size,
@@ -82,24 +119,210 @@ class FileService:
 
         filename = build_random_filename(params.filename)
 
+        if params.size < self._settings.single_put_threshold:
+            return Ok(
+                await self._put_object(
+                    filename=filename,
+                    directory=directory,
+                    body=await file.read(),
+                    original_filename=params.filename,
+                    content_type=params.content_type,
+                )
+            )
+
+        return Ok(
+            await self._upload_multipart(
+                filename=filename,
+                directory=directory,
+                chunks=iter_file(file, chunk_size=self._settings.read_chunk_size),
+                original_filename=params.filename,
+                content_type=params.content_type,
+            )
+        )
+
+    async def _put_object(
+        self,
+        *,
+        filename: PurePath,
+        directory: PurePath,
+        body: bytes,
+        original_filename: str,
+        content_type: str,
+    ) -> StoredFile:
+        content_hash = hashlib.sha256(body).hexdigest()
+        existing = await self._acquire_existing(content_hash)
+        if existing is not None:
+            return FileReferenceDTO(
+                id=existing.id, name=original_filename, content_type=content_type
+            )
+
+        full_path = await self._s3_storage.put_object(
+            filename=filename,
+            file_path=directory,
+            body=body,
+            content_type=content_type,
+        )
+        return UploadedFileDTO(
+            bucket=self._s3_storage.bucket,
+            full_path=full_path,
+            size=len(body),
+            filename=original_filename,
+            content_type=content_type,
+            content_hash=content_hash,
+        )
+
+    async def _upload_multipart(
+        self,
+        *,
+        filename: PurePath,
+        directory: PurePath,
+        chunks: AsyncIterable[bytes],
+        original_filename: str,
+        content_type: str,
+    ) -> StoredFile:
+        existing = None
         async with self._s3_storage.multipart_upload(
             filename=filename,
             file_path=directory,
+            max_concurrency=self._settings.max_concurrent_parts,
+            max_buffered_bytes=self._settings.max_buffered_bytes,
         ) as upload:
-            while chunk := await file.read(
-                self._settings.read_chunk_size,
-            ):
+            async for chunk in chunks:
                 await upload.upload_part(chunk)
 
+            existing = await self._acquire_existing(upload.content_hash)
+            if existing is not None:
+                upload.discard()
+
+        if existing is not None:
+            return FileReferenceDTO(
+                id=existing.id, name=original_filename, content_type=content_type
+            )
+        return UploadedFileDTO(
+            bucket=self._s3_storage.bucket,
+            full_path=upload.full_path,
+            size=upload.file_size,
+            filename=original_filename,
+            content_type=content_type,
+            content_hash=upload.content_hash,
+        )
+
+    async def _acquire_existing(self, content_hash: str) -> UploadedFile | None:
+        # Сессия общая для параллельных загрузок пакета и не допускает
+        # одновременных запросов
+        async with self._repository_lock:
+            return await self._repository.acquire(content_hash)
+
+    async def upload_files(
+        self,
+        *,
+        directories: Sequence[PurePath],
+        files: Sequence[UploadFile],
+    ) -> list[
+        Result[
+            StoredFile,
+            FilenameIsNoneError
+            | ContentTypeIsNoneError
+            | InvalidFileSizeError
+            | FileStorageError,
+        ]
+    ]:
+        """Параллельная загрузка нескольких файлов в S3.
+
+        Число одновременных загрузок ограничено `batch_upload_concurrency`,
+        а ошибка S3 при загрузке одного файла не прерывает загрузку остальных.
+        Новые объекты заранее ставятся в очередь на удаление (см.
+        `FileDeletionScheduler`), и записи о них должны сохраняться через
+        `UploadedFileRepository.create_many`.
+        """
+        semaphore = asyncio.Semaphore(self._settings.batch_upload_concurrency)
+
+        async def upload(
+            directory: PurePath,
+            file: UploadFile,
+        ) -> Result[
+            StoredFile,
+            FilenameIsNoneError
+            | ContentTypeIsNoneError
+            | InvalidFileSizeError
+            | FileStorageError,
+        ]:
+            async with semaphore:
+                try:
+                    return await self.upload_file(directory=directory, file=file)
+                except (BotoCoreError, ClientError) as e:
+                    return Err(FileStorageError(reason=str(e)))
+
+        results = await asyncio.gather(
+            *(
+                upload(directory, file)
+                for directory, file in zip(directories, files, strict=True)
+            )
+        )
+        await self._deletion_scheduler.schedule(
+            [
+                result.ok_value
+                for result in results
+                if isinstance(result, Ok)
+                and isinstance(result.ok_value, UploadedFileDTO)
+            ]
+        )
+        return results
+
+    async def upload_stream(
+        self,
+        *,
+        directory: PurePath,
+        filename: str | None,
+        content_type: str | None,
+        chunks: AsyncIterable[bytes],
+    ) -> Result[
+        StoredFile,
+        FilenameIsNoneError | ContentTypeIsNoneError | InvalidFileSizeError,
+    ]:
+        """Загрузка файла в S3 непосредственно из потока тела запроса.
+
+        Размер файла заранее неизвестен, поэтому ограничение
+        `allowed_uploaded_file_size` проверяется по мере чтения потока,
+        а выбор между одиночным PutObject и multipart-загрузкой делается
+        по первым прочитанным блокам.
+        """
+        if filename is None:
+            return Err(FilenameIsNoneError())
+
+        if content_type is None:
+            return Err(ContentTypeIsNoneError())
+
+        s3_filename = build_random_filename(filename)
+        blocks = iter_blocks(
+            limit_size(chunks, max_size=self._settings.allowed_uploaded_file_size),
+            block_size=self._settings.read_chunk_size,
+        )
+
+        try:
+            first = await anext(blocks, b"")
+            second = await anext(blocks, None)
+            if second is None and len(first) < self._settings.single_put_threshold:
+                return Ok(
+                    await self._put_object(
+                        filename=s3_filename,
+                        directory=directory,
+                        body=first,
+                        original_filename=filename,
+                        content_type=content_type,
+                    )
+                )
             return Ok(
-                UploadedFileDTO(
-                    bucket=self._s3_storage.bucket,
-                    full_path=upload.full_path,
-                    size=params.size,
-                    filename=params.filename,
-                    content_type=params.content_type,
-                ),
+                await self._upload_multipart(
+                    filename=s3_filename,
+                    directory=directory,
+                    chunks=prepend(first, second, blocks),
+                    original_filename=filename,
+                    content_type=content_type,
+                )
             )
+        except InvalidFileSizeError as e:
+            return Err(e)
 
     async def upload_and_save(
         self,
@@ -107,13 +330,224 @@ class FileService:
         directory: PurePath,
         file: UploadFile,
     ) -> Result[
-        UploadedFile,
+        FileReferenceDTO,
         FilenameIsNoneError | ContentTypeIsNoneError | InvalidFileSizeError,
     ]:
         result = await self.upload_file(directory=directory, file=file)
         if isinstance(result, Err):
             return result
-        return Ok(await self._repository.create(dto=result.ok_value))
+        return Ok(await self._save(result.ok_value))
 
-    async def delete_file(self, path: str) -> None:
-        await self._s3_storage.delete_object(path)
+    async def upload_stream_and_save(
+        self,
+        *,
+        directory: PurePath,
+        filename: str | None,
+        content_type: str | None,
+        chunks: AsyncIterable[bytes],
+    ) -> Result[
+        FileReferenceDTO,
+        FilenameIsNoneError | ContentTypeIsNoneError | InvalidFileSizeError,
+    ]:
+        result = await self.upload_stream(
+            directory=directory,
+            filename=filename,
+            content_type=content_type,
+            chunks=chunks,
+        )
+        if isinstance(result, Err):
+            return result
+        return Ok(await self._save(result.ok_value))
+
+    async def initiate_direct_upload(
+        self,
+        *,
+        directory: PurePath,
+        filename: str,
+        content_type: str,
+        size: int,
+    ) -> Result[DirectUploadDTO, InvalidFileSizeError | ContentTypeNotAllowedError]:
+        """Начало загрузки файла клиентом напрямую в S3.
+
+        Создаёт multipart-загрузку и возвращает ссылки на загрузку каждой
+        из частей размером `part_size` байт; содержимое файла минует сервер.
+        """
+        check = self.check_declared_file(content_type=content_type, size=size)
+        if isinstance(check, Err):
+            return check
+
+        part_size = calculate_part_size(
+            size, min_part_size=self._settings.read_chunk_size
+        )
+        path, upload_id = await self._s3_storage.create_multipart_upload(
+            filename=build_random_filename(PurePath(filename).name or "file"),
+            file_path=directory,
+            content_type=content_type,
+            original_filename=filename,
+        )
+        part_urls = await self._s3_storage.generate_presigned_part_urls(
+            path=path,
+            upload_id=upload_id,
+            part_count=calculate_part_count(size, part_size),
+        )
+        return Ok(
+            DirectUploadDTO(
+                path=path,
+                upload_id=upload_id,
+                part_size=part_size,
+                part_urls=part_urls,
+                expires_in=self._s3_storage.presigned_url_expires_in,
+            )
+        )
+
+    async def complete_direct_upload(
+        self,
+        *,
+        root_directory: PurePath,
+        path: str,
+        upload_id: str,
+        parts: Sequence[CompletedPartDTO],
+    ) -> Result[
+        FileReferenceDTO,
+        InvalidUploadKeyError
+        | UploadCompletionError
+        | InvalidFileSizeError
+        | ContentTypeNotAllowedError
+        | FileStorageError,
+    ]:
+        """Завершение загрузки файла клиентом напрямую в S3.
+
+        Завершить можно только загрузку, начатую `initiate_direct_upload`
+        в каталоге `root_directory`. Размер и content-type собранного объекта
+        проверяются запросом HEAD; не прошедший проверку объект ставится
+        в очередь на удаление.
+        """
+        key = PurePath(path)
+        if key.parent.parent != root_directory or ".." in key.parts:
+            return Err(InvalidUploadKeyError(key=path))
+
+        try:
+            await self._s3_storage.complete_multipart_upload(
+                path=path,
+                upload_id=upload_id,
+                parts=parts,
+            )
+        except ClientError as e:
+            return Err(UploadCompletionError(reason=e.response["Error"]["Code"]))
+
+        try:
+            info = await self._s3_storage.head_object(path)
+        except (BotoCoreError, ClientError) as e:
+            return Err(FileStorageError(reason=str(e)))
+
+        dto = UploadedFileDTO(
+            bucket=self._s3_storage.bucket,
+            full_path=path,
+            size=info.size,
+            filename=info.filename or key.name,
+            content_type=info.content_type,
+        )
+        check = self.check_declared_file(content_type=info.content_type, size=info.size)
+        if isinstance(check, Err):
+            # Ответ с ошибкой откатывает транзакцию запроса, поэтому объект
+            # ставится в очередь отдельной транзакцией
+            await self._deletion_scheduler.schedule([dto], delay=0)
+            return check
+
+        model = await self._repository.create_if_absent(dto)
+        # S3 может повторно подтвердить уже завершённую загрузку
+        if model is None:
+            return Err(UploadCompletionError(reason="Upload is already completed"))
+        return Ok(
+            FileReferenceDTO(
+                id=model.id, name=dto.filename, content_type=dto.content_type
+            )
+        )
+
+    def check_declared_file(
+        self,
+        *,
+        content_type: str,
+        size: int,
+    ) -> Result[None, InvalidFileSizeError | ContentTypeNotAllowedError]:
+        """Проверка заявленных клиентом размера и content-type файла."""
+        max_file_size = self._settings.allowed_uploaded_file_size
+        if size > max_file_size:
+            return Err(
+                InvalidFileSizeError(file_size=size, max_file_size=max_file_size)
+            )
+        if not self._is_content_type_allowed(content_type):
+            return Err(
+                ContentTypeNotAllowedError(
+                    content_type=content_type,
+                    allowed_content_types=self._settings.allowed_content_types,
+                )
+            )
+        return Ok(None)
+
+    def _is_content_type_allowed(self, content_type: str) -> bool:
+        allowed = self._settings.allowed_content_types
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return not allowed or media_type in allowed
+
+    async def _save(self, stored: StoredFile) -> FileReferenceDTO:
+        if isinstance(stored, FileReferenceDTO):
+            return stored
+        model = await self._repository.create(dto=stored)
+        return FileReferenceDTO(
+            id=model.id, name=stored.filename, content_type=stored.content_type
+        )
+
+    async def open_file(
+        self,
+        file: UploadedFile | UploadedFileSummaryDTO,
+        byte_range: tuple[int, int] | None = None,
+        chunk_size: int = 1024 * 64,
+    ) -> Result[AsyncIterator[bytes], FileStorageError]:
+        """Потоковое чтение файла или диапазона его байтов из S3."""
+        try:
+            chunks = await self._s3_storage.open_object(
+                path=file.path,
+                bucket=file.bucket,
+                byte_range=byte_range,
+                chunk_size=chunk_size,
+            )
+        except (BotoCoreError, ClientError) as e:
+            return Err(FileStorageError(reason=str(e)))
+        return Ok(chunks)
+
+    def stream_archive(
+        self,
+        files: Sequence[UploadedFileSummaryDTO],
+        *,
+        chunk_size: int,
+        prefetch_files: int,
+        prefetch_chunks: int,
+    ) -> AsyncIterator[bytes]:
+        """Потоковая сборка ZIP-архива из файлов в S3, см. `stream_zip`."""
+
+        async def open_object(file: UploadedFileSummaryDTO) -> AsyncIterator[bytes]:
+            return await self._s3_storage.open_object(
+                path=file.path,
+                bucket=file.bucket,
+                chunk_size=chunk_size,
+            )
+
+        return stream_zip(
+            files,
+            open_object,
+            prefetch_files=prefetch_files,
+            prefetch_chunks=prefetch_chunks,
+        )
+
+    async def get_download_urls(
+        self,
+        files: Sequence[UploadedFile | UploadedFileSummaryDTO],
+    ) -> list[str]:
+        """Ссылки на скачивание файлов в порядке `files`."""
+        return await self._s3_storage.generate_presigned_urls(
+            [
+                StoredObjectDTO(bucket=file.bucket, path=file.path, filename=file.name)
+                for file in files
+            ]
+        )
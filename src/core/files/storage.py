@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import math
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from functools import cached_property
 from os import PathLike
 from pathlib import PurePath
@@ -8,20 +14,267 @@ from types import TracebackType
 from typing import TYPE_CHECKING, Final, Self
 from urllib import parse
 
-from .dto import FilePartDTO
+from botocore.exceptions import BotoCoreError, ClientError
+from botocore.exceptions import ConnectionError as S3ConnectionError
+from botocore.exceptions import HTTPClientError, IncompleteReadError
+
+from core.cache import TTLCache
+
+from .dto import (
+    CompletedPartDTO,
+    FilePartDTO,
+    MultipartUploadDTO,
+    StoredObjectDTO,
+    StoredObjectInfoDTO,
+)
 
 if TYPE_CHECKING:
+    from aiobotocore.response import StreamingBody
     from types_aiobotocore_s3 import S3Client
 
 
+DELETE_OBJECTS_BATCH_SIZE: Final = 1_000
+MAX_PARTS_COUNT: Final = 10_000
+ORIGINAL_FILENAME_METADATA_KEY: Final = "original-filename"
+TRANSIENT_ERROR_CODES: Final = frozenset(
+    {
+        "RequestTimeout",
+        "RequestTimeoutException",
+        "PriorRequestNotComplete",
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "RequestThrottled",
+    }
+)
+
+
 class S3Storage:
-    def __init__(self, client: S3Client, bucket: str) -> None:
+    def __init__(
+        self,
+        client: S3Client,
+        bucket: str,
+        presigned_url_expires_in: int = 3_600,
+        presigned_url_cache: TTLCache[tuple[str, str, str], str] | None = None,
+        presigned_url_cache_margin: int = 300,
+    ) -> None:
         self._s3_client: Final = client
         self.bucket: Final = bucket
+        self._presigned_url_expires_in = presigned_url_expires_in
+        self._presigned_url_cache = presigned_url_cache
+        self._presigned_url_cache_margin = presigned_url_cache_margin
+
+    async def put_object(
+        self,
+        filename: PurePath,
+        file_path: PurePath,
+        body: bytes,
+        content_type: str,
+    ) -> str:
+        full_path = PurePath(file_path, filename).as_posix()
+        await self._s3_client.put_object(
+            Bucket=self.bucket,
+            Key=full_path,
+            Body=body,
+            ContentType=content_type,
+        )
+        return full_path
+
+    @property
+    def presigned_url_expires_in(self) -> int:
+        return self._presigned_url_expires_in
+
+    async def create_multipart_upload(
+        self,
+        filename: PurePath,
+        file_path: PurePath,
+        content_type: str,
+        original_filename: str,
+    ) -> tuple[str, str]:
+        """Начало multipart-загрузки, части которой загружает сам клиент.
+
+        Исходное имя файла сохраняется в метаданных объекта.
+
+        Returns:
+            tuple[str, str]: путь объекта и идентификатор загрузки.
+        """
+        full_path = PurePath(file_path, filename).as_posix()
+        response = await self._s3_client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=full_path,
+            ContentType=content_type,
+            Metadata={ORIGINAL_FILENAME_METADATA_KEY: parse.quote(original_filename)},
+        )
+        return full_path, response["UploadId"]
+
+    async def generate_presigned_part_urls(
+        self,
+        path: str,
+        upload_id: str,
+        part_count: int,
+    ) -> list[str]:
+        return list(
+            await asyncio.gather(
+                *(
+                    self._s3_client.generate_presigned_url(
+                        "upload_part",
+                        Params={
+                            "Bucket": self.bucket,
+                            "Key": path,
+                            "UploadId": upload_id,
+                            "PartNumber": part_number,
+                        },
+                        ExpiresIn=self._presigned_url_expires_in,
+                    )
+                    for part_number in range(1, part_count + 1)
+                )
+            )
+        )
+
+    async def complete_multipart_upload(
+        self,
+        path: str,
+        upload_id: str,
+        parts: Sequence[CompletedPartDTO],
+    ) -> None:
+        await self._s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=path,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part.part_number, "ETag": part.e_tag}
+                    for part in sorted(parts, key=lambda part: part.part_number)
+                ],
+            },
+        )
+
+    async def upload_part(
+        self,
+        path: str,
+        upload_id: str,
+        part_number: int,
+        body: bytes,
+    ) -> str:
+        response = await self._s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=path,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return response["ETag"].replace('"', "")
+
+    async def abort_multipart_upload(
+        self,
+        path: str,
+        upload_id: str,
+        bucket: str | None = None,
+    ) -> None:
+        await self._s3_client.abort_multipart_upload(
+            Bucket=bucket or self.bucket,
+            Key=path,
+            UploadId=upload_id,
+        )
+
+    async def iter_multipart_uploads(
+        self,
+        prefix: str,
+    ) -> AsyncIterator[list[MultipartUploadDTO]]:
+        """Постраничный обход незавершённых multipart-загрузок с префиксом `prefix`."""
+        paginator = self._s3_client.get_paginator("list_multipart_uploads")
+        async for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            yield [
+                MultipartUploadDTO(
+                    path=upload["Key"],
+                    upload_id=upload["UploadId"],
+                    initiated_at=upload["Initiated"],
+                )
+                for upload in page.get("Uploads", [])
+            ]
+
+    async def head_object(self, path: str) -> StoredObjectInfoDTO:
+        response = await self._s3_client.head_object(Bucket=self.bucket, Key=path)
+        filename = response.get("Metadata", {}).get(ORIGINAL_FILENAME_METADATA_KEY)
+        return StoredObjectInfoDTO(
+            size=response["ContentLength"],
+            content_type=response.get("ContentType", "application/octet-stream"),
+            filename=parse.unquote(filename) if filename is not None else None,
+        )
+
+    async def iter_object(
+        self,
+        path: str,
+        bucket: str | None = None,
+        chunk_size: int = 1024 * 1024,
+    ) -> AsyncIterator[bytes]:
+        """Потоковое чтение объекта из S3 частями по `chunk_size` байт."""
+        response = await self._s3_client.get_object(
+            Bucket=bucket or self.bucket, Key=path
+        )
+        async for chunk in _iter_body(response["Body"], chunk_size):
+            yield chunk
+
+    async def open_object(
+        self,
+        path: str,
+        bucket: str | None = None,
+        byte_range: tuple[int, int] | None = None,
+        chunk_size: int = 1024 * 1024,
+    ) -> AsyncIterator[bytes]:
+        """Запрос объекта из S3 с последующим потоковым чтением.
+
+        В отличие от `iter_object` запрос выполняется сразу, поэтому ошибки
+        S3 возникают до того, как вызывающая сторона начнёт отдавать ответ.
+
+        Args:
+            byte_range (tuple[int, int] | None): первый и последний байты
+                запрашиваемого диапазона включительно.
+        """
+        bucket = bucket or self.bucket
+        if byte_range is None:
+            response = await self._s3_client.get_object(Bucket=bucket, Key=path)
+        else:
+            response = await self._s3_client.get_object(
+                Bucket=bucket,
+                Key=path,
+                Range=f"bytes={byte_range[0]}-{byte_range[1]}",
+            )
+        return _iter_body(response["Body"], chunk_size)
 
     async def delete_object(self, path: str) -> None:
         await self._s3_client.delete_object(Bucket=self.bucket, Key=path)
 
+    async def delete_objects(
+        self,
+        paths: Sequence[str],
+        bucket: str | None = None,
+    ) -> dict[str, str]:
+        """Удаление объектов пакетами по `DELETE_OBJECTS_BATCH_SIZE` ключей.
+
+        Returns:
+            dict[str, str]: пути объектов, которые S3 не удалось удалить,
+                и сообщения об ошибках.
+        """
+        bucket = bucket or self.bucket
+        responses = await asyncio.gather(
+            *(
+                self._s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={
+                        "Objects": [{"Key": path} for path in batch],
+                        "Quiet": True,
+                    },
+                )
+                for batch in itertools.batched(paths, DELETE_OBJECTS_BATCH_SIZE)
+            )
+        )
+        return {
+            error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+            for response in responses
+            for error in response.get("Errors", [])
+        }
+
     async def generate_presigned_url(
         self,
         key: str,
@@ -41,26 +294,90 @@ class S3Storage:
             ExpiresIn=expires_in,
         )
 
+    async def generate_presigned_urls(
+        self,
+        objects: Sequence[StoredObjectDTO],
+    ) -> list[str]:
+        """Пакетное получение ссылок на скачивание объектов.
+
+        Ссылки кэшируются по бакету, пути и названию файла, которое попадает
+        в заголовок Content-Disposition ответа, и вытесняются из кэша
+        за `presigned_url_cache_margin` секунд до истечения их срока действия,
+        поэтому клиент никогда не получает просроченную ссылку.
+        """
+        urls: list[str | None] = [
+            self._presigned_url_cache.get((obj.bucket, obj.path, obj.filename))
+            if self._presigned_url_cache is not None
+            else None
+            for obj in objects
+        ]
+        missing = [index for index, url in enumerate(urls) if url is None]
+        generated = await asyncio.gather(
+            *(
+                self.generate_presigned_url(
+                    key=objects[index].path,
+                    bucket=objects[index].bucket,
+                    filename=objects[index].filename,
+                    expires_in=self._presigned_url_expires_in,
+                )
+                for index in missing
+            )
+        )
+
+        ttl = self._presigned_url_expires_in - self._presigned_url_cache_margin
+        for index, url in zip(missing, generated, strict=True):
+            urls[index] = url
+            if self._presigned_url_cache is not None:
+                obj = objects[index]
+                self._presigned_url_cache.set(
+                    (obj.bucket, obj.path, obj.filename), url, ttl=ttl
+                )
+
+        return [url for url in urls if url is not None]
+
     def multipart_upload(
         self,
         filename: PurePath,
         file_path: PurePath,
+        max_concurrency: int = 1,
+        max_buffered_bytes: int | None = None,
     ) -> S3MultipartUpload:
         return S3MultipartUpload(
             client=self._s3_client,
             filename=filename,
             file_path=file_path,
             bucket=self.bucket,
+            max_concurrency=max_concurrency,
+            max_buffered_bytes=max_buffered_bytes,
         )
 
 
+async def _iter_body(body: StreamingBody, chunk_size: int) -> AsyncIterator[bytes]:
+    async with body:
+        async for chunk in body.iter_chunks(chunk_size):
+            yield chunk
+
+
 class S3MultipartUpload:
+    """Конвейерная загрузка файла в S3 по частям.
+
+    `upload_part` лишь ставит часть в очередь на отправку и возвращает управление,
+    как только позволяют ограничения на число одновременно загружаемых частей
+    и на объём удерживаемых в памяти данных. Тем временем вызывающая сторона
+    читает следующую часть, а ETag-и собираются по номерам частей.
+
+    Попутно вычисляется SHA-256 содержимого; если до выхода из контекста
+    вызван `discard`, загрузка прерывается вместо завершения.
+    """
+
     def __init__(
         self,
         client: S3Client,
         filename: PurePath,
         file_path: PurePath,
         bucket: str,
+        max_concurrency: int = 1,
+        max_buffered_bytes: int | None = None,
     ) -> None:
         self._s3_client = client
         self._bucket = bucket
@@ -68,13 +385,30 @@ class S3MultipartUpload:
         self.file_size = 0
         self._file_path = file_path
         self._upload_id = ""
-        self._e_tags: list[tuple[int, str]] = []
+        self._e_tags: dict[int, str] = {}
         self._part_number = 0
 
+        self._max_concurrency = max(max_concurrency, 1)
+        self._max_buffered_bytes = max_buffered_bytes
+        self._in_flight = 0
+        self._buffered_bytes = 0
+        self._capacity = asyncio.Condition()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._failure: BaseException | None = None
+        self._hasher = hashlib.sha256()
+        self._discarded = False
+
     @cached_property
     def full_path(self) -> str:
         return PurePath(self._file_path, self._filename).as_posix()
 
+    @property
+    def content_hash(self) -> str:
+        return self._hasher.hexdigest()
+
+    def discard(self) -> None:
+        self._discarded = True
+
     async def __aenter__(self) -> Self:
         self._upload_id = await self._create_multipart_upload()
         return self
@@ -86,11 +420,31 @@ class S3MultipartUpload:
         exc_tb: TracebackType | None,
     ) -> None:
         if exc_val is not None:
+            await self._cancel_parts()
+            await self._abort_multipart_upload()
+            return
+
+        if self._discarded:
+            # Части, отправка которых уже началась, могут быть приняты S3
+            # после прерывания загрузки, поэтому их нужно дождаться
+            with contextlib.suppress(Exception):
+                await self._wait_parts()
+            await self._abort_multipart_upload()
+            return
+
+        try:
+            await self._wait_parts()
+        except BaseException:
+            await self._cancel_parts()
             await self._abort_multipart_upload()
+            raise
 
         await self._complete_multipart_upload()
 
     async def upload_part(self, chunk: bytes) -> None:
+        await asyncio.to_thread(self._hasher.update, chunk)
+        await self._reserve(len(chunk))
+
         self._part_number += 1
         self.file_size += len(chunk)
         dto = FilePartDTO(
@@ -99,8 +453,53 @@ class S3MultipartUpload:
             chunk=chunk,
             part_number=self._part_number,
         )
-        e_tag = await self._upload_part(dto)
-        self._e_tags.append((self._part_number, e_tag))
+        task = asyncio.create_task(self._upload_reserved_part(dto))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reserve(self, size: int) -> None:
+        def has_capacity() -> bool:
+            if self._failure is not None or self._in_flight == 0:
+                return True
+            if self._in_flight >= self._max_concurrency:
+                return False
+            return (
+                self._max_buffered_bytes is None
+                or self._buffered_bytes + size <= self._max_buffered_bytes
+            )
+
+        async with self._capacity:
+            await self._capacity.wait_for(has_capacity)
+            if self._failure is not None:
+                raise self._failure
+            self._in_flight += 1
+            self._buffered_bytes += size
+
+    async def _release(self, size: int) -> None:
+        async with self._capacity:
+            self._in_flight -= 1
+            self._buffered_bytes -= size
+            self._capacity.notify_all()
+
+    async def _upload_reserved_part(self, dto: FilePartDTO) -> None:
+        try:
+            self._e_tags[dto.part_number] = await self._upload_part(dto)
+        except Exception as e:
+            if self._failure is None:
+                self._failure = e
+        finally:
+            await self._release(len(dto.chunk))
+
+    async def _wait_parts(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+        if self._failure is not None:
+            raise self._failure
+
+    async def _cancel_parts(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
 
     async def _upload_part(
         self,
@@ -129,8 +528,8 @@ class S3MultipartUpload:
             UploadId=self._upload_id,
             MultipartUpload={
                 "Parts": [
-                    {"PartNumber": part_number, "ETag": e_tag}
-                    for part_number, e_tag in self._e_tags
+                    {"PartNumber": part_number, "ETag": self._e_tags[part_number]}
+                    for part_number in sorted(self._e_tags)
                 ],
             },
         )
@@ -145,6 +544,31 @@ class S3MultipartUpload:
         return response["ResponseMetadata"]["HTTPStatusCode"]
 
 
+def calculate_part_size(file_size: int, min_part_size: int) -> int:
+    """Размер части, при котором файл укладывается в `MAX_PARTS_COUNT` частей."""
+    return max(min_part_size, math.ceil(file_size / MAX_PARTS_COUNT))
+
+
+def calculate_part_count(file_size: int, part_size: int) -> int:
+    """Количество частей; пустой файл загружается одной частью."""
+    return max(math.ceil(file_size / part_size), 1)
+
+
+def is_transient_error(error: BotoCoreError | ClientError) -> bool:
+    """Временная ли ошибка S3: сетевая, 5xx или ограничение частоты запросов.
+
+    Ошибки 4xx, например `NoSuchKey` или `AccessDenied`, повтором запроса
+    не исправляются.
+    """
+    if isinstance(error, ClientError):
+        status_code = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        code = error.response.get("Error", {}).get("Code")
+        return (
+            status_code is not None and (status_code >= 500 or status_code == 429)
+        ) or code in TRANSIENT_ERROR_CODES
+    return isinstance(error, S3ConnectionError | HTTPClientError | IncompleteReadError)
+
+
 def build_random_filename(filepath: PathLike[str] | str) -> PurePath:
     if not isinstance(filepath, PurePath):
         filepath = PurePath(filepath)
@@ -0,0 +1,48 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+from fastapi import UploadFile
+
+from .exceptions import InvalidFileSizeError
+
+
+async def limit_size(
+    chunks: AsyncIterable[bytes],
+    max_size: int,
+) -> AsyncIterator[bytes]:
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise InvalidFileSizeError(file_size=None, max_file_size=max_size)
+        yield chunk
+
+
+async def iter_file(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def prepend(
+    first: bytes,
+    second: bytes | None,
+    blocks: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    yield first
+    if second is not None:
+        yield second
+    async for block in blocks:
+        yield block
+
+
+async def iter_blocks(
+    chunks: AsyncIterable[bytes],
+    block_size: int,
+) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
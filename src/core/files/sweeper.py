@@ -0,0 +1,96 @@
+import asyncio
+import datetime
+import logging
+from collections.abc import Sequence
+from pathlib import PurePath
+
+from core.utils import utc_now
+from db.engine import async_session_factory
+from settings import ResumableUploadSettings, UploadSettings
+
+from .dto import MultipartUploadDTO
+from .repository import ResumableUploadRepository
+from .storage import S3Storage
+
+logger = logging.getLogger(__name__)
+
+
+class MultipartUploadSweeper:
+    """Фоновое прерывание брошенных multipart-загрузок в S3.
+
+    Части незавершённой multipart-загрузки хранятся в S3 (и оплачиваются),
+    пока загрузку не завершат или не прервут. Обработчик раз
+    в `sweep_interval` секунд удаляет истёкшие возобновляемые загрузки
+    и прерывает их в S3, а также прерывает все прочие загрузки под корневым
+    каталогом, начатые более `sweep_abandoned_after` секунд назад:
+    например, оставшиеся после падения процесса во время загрузки
+    или брошенные клиентом прямые загрузки.
+    """
+
+    def __init__(
+        self,
+        s3_storage: S3Storage,
+        settings: ResumableUploadSettings,
+        upload_settings: UploadSettings,
+    ) -> None:
+        self._s3_storage = s3_storage
+        self._settings = settings
+        self._prefix = f"{PurePath(upload_settings.root_path).as_posix()}/"
+        self._session_factory = async_session_factory
+
+    async def run(self) -> None:
+        while True:
+            try:
+                aborted = await self.sweep()
+            except Exception:
+                logger.exception("Failed to sweep incomplete multipart uploads")
+            else:
+                if aborted:
+                    logger.info("Aborted %d incomplete multipart uploads", aborted)
+            await asyncio.sleep(self._settings.sweep_interval)
+
+    async def sweep(self) -> int:
+        """Прерывание истёкших и брошенных multipart-загрузок.
+
+        Returns:
+            int: число прерванных загрузок.
+        """
+        async with self._session_factory.begin() as session:
+            expired = await ResumableUploadRepository(session).delete_expired()
+        aborted = await self._abort(expired)
+
+        abandoned_before = utc_now() - datetime.timedelta(
+            seconds=self._settings.sweep_abandoned_after
+        )
+        async for page in self._s3_storage.iter_multipart_uploads(self._prefix):
+            candidates = [
+                upload for upload in page if upload.initiated_at < abandoned_before
+            ]
+            if not candidates:
+                continue
+            async with self._session_factory() as session:
+                active = await ResumableUploadRepository(session).get_active_upload_ids(
+                    [upload.upload_id for upload in candidates]
+                )
+            aborted += await self._abort(
+                [upload for upload in candidates if upload.upload_id not in active]
+            )
+        return aborted
+
+    async def _abort(self, uploads: Sequence[MultipartUploadDTO]) -> int:
+        results = await asyncio.gather(
+            *(
+                self._s3_storage.abort_multipart_upload(upload.path, upload.upload_id)
+                for upload in uploads
+            ),
+            return_exceptions=True,
+        )
+        for upload, result in zip(uploads, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Failed to abort multipart upload %s of %s: %s",
+                    upload.upload_id,
+                    upload.path,
+                    result,
+                )
+        return sum(not isinstance(result, Exception) for result in results)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final
+
+from core.metrics import registry
+from core.tracing import Span
+
+if TYPE_CHECKING:
+    from types_aiobotocore_s3 import S3Client
+
+_SPAN_CONTEXT_KEY: Final = "tracing_span"
+
+request_duration = registry.histogram(
+    "s3_client_operation_duration_seconds",
+    "Duration of S3 API calls including retries",
+    label_names=("operation", "outcome"),
+)
+retries = registry.counter(
+    "s3_client_retries_total",
+    "Number of S3 API call attempts repeated by the retry handler",
+    label_names=("operation",),
+)
+
+
+def instrument_s3_client(client: S3Client) -> None:
+    """Замер длительности каждого вызова API S3 клиента.
+
+    Обработчики событий botocore охватывают все вызовы клиента, в том числе
+    загрузку частей `S3MultipartUpload` и постраничные запросы, и учитывают
+    время повторных попыток; число повторов каждого вызова добавляется
+    к счётчику `retries`. Подписание ссылок к S3 не обращается и не
+    замеряется.
+    """
+    events = client.meta.events
+    events.register("before-call.s3", _before_call)
+    events.register("after-call.s3", _after_call)
+    events.register("after-call-error.s3", _after_call_error)
+
+
+def _before_call(model: Any, context: dict[str, Any], **kwargs: Any) -> None:
+    context[_SPAN_CONTEXT_KEY] = (
+        model.name,
+        Span(
+            f"S3.{model.name}",
+            attributes={
+                "rpc.system": "aws-api",
+                "rpc.service": "S3",
+                "rpc.method": model.name,
+            },
+        ),
+    )
+
+
+def _after_call(http_response: Any, context: dict[str, Any], **kwargs: Any) -> None:
+    if (entry := context.pop(_SPAN_CONTEXT_KEY, None)) is None:
+        return
+    operation, span = entry
+    _observe_retries(operation, span, context)
+    span.set_attribute("http.response.status_code", http_response.status_code)
+    failed = http_response.status_code >= 300
+    if failed:
+        span.mark_failed(f"HTTP {http_response.status_code}")
+    request_duration.labels(operation, "error" if failed else "ok").observe(span.end())
+
+
+def _after_call_error(
+    exception: BaseException,
+    context: dict[str, Any],
+    **kwargs: Any,
+) -> None:
+    if (entry := context.pop(_SPAN_CONTEXT_KEY, None)) is None:
+        return
+    operation, span = entry
+    _observe_retries(operation, span, context)
+    request_duration.labels(operation, "error").observe(span.end(error=exception))
+
+
+def _observe_retries(operation: str, span: Span, context: dict[str, Any]) -> None:
+    # Номер попытки botocore хранит в контексте вызова
+    attempts = context.get("retries", {}).get("attempt", 1)
+    span.set_attribute("aws.retry_attempts", attempts - 1)
+    if attempts > 1:
+        retries.labels(operation).inc(attempts - 1)
@@ -0,0 +1,224 @@
+import bisect
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    buckets: tuple[tuple[float, int], ...]
+    count: int
+    sum: float
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин в духе Prometheus.
+
+    Значения корзин в снимке накопительные: каждая содержит число наблюдений,
+    не превышающих её верхнюю границу.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, buckets = 0, []
+        for bound, count in zip((*self._bounds, float("inf")), counts, strict=True):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return HistogramSnapshot(buckets=tuple(buckets), count=cumulative, sum=total)
+
+
+class LabeledHistogram:
+    """Семейство гистограмм с общими границами корзин, различающихся метками."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._buckets = buckets
+        self._children: dict[tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        if len(values) != len(self.label_names):
+            msg = f"Expected labels {self.label_names}, got {values}"
+            raise ValueError(msg)
+
+        histogram = self._children.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._children.setdefault(values, Histogram(self._buckets))
+        return histogram
+
+    def collect(self) -> list[tuple[tuple[str, ...], HistogramSnapshot]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(values, histogram.snapshot()) for values, histogram in children]
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class LabeledCounter:
+    """Семейство монотонно растущих счётчиков, различающихся метками."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._children: dict[tuple[str, ...], Counter] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Counter:
+        if len(values) != len(self.label_names):
+            msg = f"Expected labels {self.label_names}, got {values}"
+            raise ValueError(msg)
+
+        counter = self._children.get(values)
+        if counter is None:
+            with self._lock:
+                counter = self._children.setdefault(values, Counter())
+        return counter
+
+    def collect(self) -> list[tuple[tuple[str, ...], float]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(values, counter.value) for values, counter in children]
+
+
+class MetricsRegistry:
+    """Реестр метрик, отдаваемых в текстовом формате Prometheus."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, LabeledHistogram | LabeledCounter] = {}
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> LabeledHistogram:
+        histogram = LabeledHistogram(name, description, label_names, buckets)
+        self._register(histogram)
+        return histogram
+
+    def counter(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+    ) -> LabeledCounter:
+        counter = LabeledCounter(name, description, label_names)
+        self._register(counter)
+        return counter
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            if isinstance(metric, LabeledCounter):
+                lines.extend(_render_counter(metric))
+            else:
+                lines.extend(_render_histogram(metric))
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: LabeledHistogram | LabeledCounter) -> None:
+        if metric.name in self._metrics:
+            msg = f"Metric {metric.name!r} is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+
+
+def _render_counter(counter: LabeledCounter) -> list[str]:
+    lines = [
+        f"# HELP {counter.name} {counter.description}",
+        f"# TYPE {counter.name} counter",
+    ]
+    for values, value in counter.collect():
+        labels = list(zip(counter.label_names, values, strict=True))
+        lines.append(f"{counter.name}{_format_labels(labels)} {value!r}")
+    return lines
+
+
+def _render_histogram(histogram: LabeledHistogram) -> list[str]:
+    lines = [
+        f"# HELP {histogram.name} {histogram.description}",
+        f"# TYPE {histogram.name} histogram",
+    ]
+    for values, snapshot in histogram.collect():
+        labels = list(zip(histogram.label_names, values, strict=True))
+        for bound, count in snapshot.buckets:
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(
+                f"{histogram.name}_bucket"
+                f"{_format_labels([*labels, ('le', le)])} {count}"
+            )
+        lines.append(f"{histogram.name}_sum{_format_labels(labels)} {snapshot.sum!r}")
+        lines.append(f"{histogram.name}_count{_format_labels(labels)} {snapshot.count}")
+    return lines
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, literal, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    values: tuple[Any, ...]
+    backwards: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetPage(Generic[T]):
+    items: Sequence[T]
+    next_cursor: str | None
+    previous_cursor: str | None
+    total: int | None = None
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = json.dumps(
+        {"v": [_dump_value(value) for value in cursor.values], "b": cursor.backwards},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    token: str,
+    columns: Sequence[InstrumentedAttribute[Any]],
+) -> Cursor:
+    """Восстановление курсора из непрозрачного токена, выданного клиенту.
+
+    Args:
+        token (str): токен курсора из параметров запроса.
+        columns (Sequence[InstrumentedAttribute[Any]]): столбцы ключа пагинации,
+            по типам которых приводятся сохранённые в токене значения.
+
+    Raises:
+        InvalidCursorError: токен повреждён или не соответствует ключу пагинации.
+
+    Returns:
+        Cursor: значения ключа последней просмотренной записи и направление.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        raw_values, backwards = payload["v"], payload["b"]
+        if len(raw_values) != len(columns) or not isinstance(backwards, bool):
+            raise InvalidCursorError(token)
+        values = tuple(
+            _load_value(column.type.python_type, raw)
+            for column, raw in zip(columns, raw_values, strict=True)
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(token) from e
+    return Cursor(values=values, backwards=backwards)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, bool | int | float | str) or value is None:
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load_value(python_type: type[Any], raw: Any) -> Any:
+    if raw is None:
+        return None
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+async def paginate_keyset(
+    session: AsyncSession,
+    query: Select[tuple[T]],
+    *,
+    columns: Sequence[InstrumentedAttribute[Any]],
+    size: int,
+    cursor: str | None = None,
+    descending: bool = False,
+) -> KeysetPage[T]:
+    """Keyset-пагинация запроса по составному ключу на стороне БД.
+
+    Вместо OFFSET страница отбирается условием сравнения кортежа ключа с ключом
+    граничной записи, поэтому при наличии составного индекса по `columns`
+    стоимость любой страницы совпадает со стоимостью первой.
+
+    Args:
+        session (AsyncSession): сессия SQLAlchemy.
+        query (Select[tuple[T]]): запрос без сортировки и ограничений.
+        columns (Sequence[InstrumentedAttribute[Any]]): столбцы ключа в порядке сортировки,
+            последний из них должен быть уникальным.
+        size (int): размер страницы.
+        cursor (str | None, optional): токен курсора. Defaults to None.
+        descending (bool, optional): сортировка по убыванию. Defaults to False.
+
+    Raises:
+        InvalidCursorError: передан некорректный токен курсора.
+
+    Returns:
+        KeysetPage[T]: страница записей с курсорами на соседние страницы.
+    """
+    decoded = decode_cursor(cursor, columns) if cursor is not None else None
+    forward = decoded is None or not decoded.backwards
+    ascending = forward != descending
+
+    key = tuple_(*columns)
+    if decoded is not None:
+        bound = tuple_(
+            *(
+                literal(value, type_=column.type)
+                for column, value in zip(columns, decoded.values, strict=True)
+            )
+        )
+        query = query.where(key > bound if ascending else key < bound)
+
+    query = query.order_by(
+        *(column.asc() if ascending else column.desc() for column in columns)
+    ).limit(size + 1)
+    items = list((await session.scalars(query)).all())
+
+    has_more = len(items) > size
+    del items[size:]
+    if not forward:
+        items.reverse()
+
+    def _cursor_for(item: Any, *, backwards: bool) -> str:
+        values = tuple(getattr(item, column.key) for column in columns)
+        return encode_cursor(Cursor(values=values, backwards=backwards))
+
+    has_next = has_more if forward else True
+    has_previous = decoded is not None if forward else has_more
+
+    next_cursor = previous_cursor = None
+    if items and has_next:
+        next_cursor = _cursor_for(items[-1], backwards=False)
+    if items and has_previous:
+        previous_cursor = _cursor_for(items[0], backwards=True)
+
+    return KeysetPage(
+        items=items,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+    )
+
+
+async def estimate_count(session: AsyncSession, table_name: str) -> int:
+    """Приблизительное число строк таблицы по статистике планировщика PostgreSQL.
+
+    В отличие от `COUNT(*)` не требует полного прохода по таблице.
+
+    Args:
+        session (AsyncSession): сессия SQLAlchemy.
+        table_name (str): название таблицы.
+
+    Returns:
+        int: оценка числа строк, актуальная на момент последнего ANALYZE.
+    """
+    estimate = await session.scalar(
+        text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+        ),
+        {"table_name": table_name},
+    )
+    return max(estimate or 0, 0)
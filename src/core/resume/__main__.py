@@ -0,0 +1,58 @@
+"""Служебные команды резюме.
+
+Запуск из корня репозитория::
+
+    PYTHONPATH=src python -m core.resume recompute-rating-scores
+
+`recompute-rating-scores` пересчитывает `rating_score` всех резюме после
+изменения `RATING_PRIOR_MEAN` или `RATING_PRIOR_WEIGHT`: оценка хранится
+в таблице ради индекса `ix_resume_rating_score_id`, и до пересчёта резюме
+без новых оценок сохраняют значения, вычисленные по прежним настройкам.
+Каждая пачка обновляется в отдельной транзакции, поэтому команду можно
+запускать на работающем приложении и прерывать.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import sys
+from collections.abc import Sequence
+from uuid import UUID
+
+from core.di import create_container
+
+from .repositories import ResumeRepository
+
+
+async def recompute_rating_scores(batch_size: int) -> int:
+    updated = 0
+    after: UUID | None = None
+    async with contextlib.aclosing(create_container()) as container:
+        while True:
+            async with container.context() as context:
+                repository = await context.resolve(ResumeRepository)
+                after, count = await repository.recompute_rating_scores(
+                    after=after, limit=batch_size
+                )
+            updated += count
+            if after is None:
+                return updated
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.resume")
+    commands = parser.add_subparsers(dest="command", required=True)
+    recompute = commands.add_parser(
+        "recompute-rating-scores",
+        help="Пересчитать rating_score всех резюме по текущим настройкам",
+    )
+    recompute.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    updated = asyncio.run(recompute_rating_scores(args.batch_size))
+    print(f"Updated rating_score of {updated} resumes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
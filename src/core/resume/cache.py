@@ -0,0 +1,27 @@
+from typing import Final
+
+from core.cache import CacheBackend, VersionedCache
+from settings import CacheSettings, DatabaseSettings
+
+RESUME_CACHE_NAMESPACE: Final = "resume"
+
+
+class ResumeCache(VersionedCache):
+    """Кэш чтений резюме.
+
+    Версия пространства имён повышается после фиксации транзакции, в которой
+    резюме создавались, удалялись или меняли оценки.
+
+    При настроенной реплике чтения кэш отключён: отстающая реплика может
+    вернуть данные до записи, и они сохранились бы под уже новой версией
+    на всё время жизни записей.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        settings: CacheSettings,
+        database_settings: DatabaseSettings,
+    ) -> None:
+        ttl = 0 if database_settings.read_replica_url else settings.ttl
+        super().__init__(backend, namespace=RESUME_CACHE_NAMESPACE, ttl=ttl)
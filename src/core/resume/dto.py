@@ -1,9 +1,102 @@
+import dataclasses
+import datetime
+import enum
 from dataclasses import dataclass
+from typing import Self
 from uuid import UUID
 
+from core.files.dto import UploadedFileSummaryDTO
+from db.models import Resume
+from db.models.file import ExtractionStatus
+
 
 @dataclass
 class ResumeCreateDTO:
     pretender_name: str
     rating: float
     file_id: UUID | None = None
+    file_name: str | None = None
+    file_content_type: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeDTO:
+    id: UUID
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    pretender_name: str
+    rating: float
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
+    file_id: UUID
+    file: UploadedFileSummaryDTO
+
+    @classmethod
+    def from_model(cls, model: Resume) -> Self:
+        return cls(
+            id=model.id,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            pretender_name=model.pretender_name,
+            rating=model.rating,
+            rating_count=model.rating_count,
+            rating_mean=model.rating_mean,
+            rating_score=model.rating_score,
+            file_id=model.file_id,
+            # Название и content-type задаются загрузкой резюме, а не общей
+            # для дубликатов записью о файле
+            file=dataclasses.replace(
+                UploadedFileSummaryDTO.from_model(model.file),
+                name=model.file_name,
+                content_type=model.file_content_type,
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeExportRowDTO:
+    id: UUID
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    pretender_name: str
+    rating: float
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
+    file_id: UUID
+    file_name: str
+    file_content_type: str
+    file_size: int
+    file_extraction_status: ExtractionStatus
+
+
+class ResumeDeletionStatus(enum.StrEnum):
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeDeletionResultDTO:
+    resume_id: UUID
+    status: ResumeDeletionStatus
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeRatingSummaryDTO:
+    resume_id: UUID
+    rating_count: int
+    rating_mean: float | None
+    rating_score: float
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeSearchHitDTO:
+    resume: ResumeDTO
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeSearchPageDTO:
+    items: list[ResumeSearchHitDTO]
+    next_offset: int | None
@@ -0,0 +1,10 @@
+class InvalidRatingError(Exception):
+    def __init__(
+        self,
+        rating: float,
+        min_rating: float,
+        max_rating: float,
+    ) -> None:
+        self.rating = rating
+        self.min_rating = min_rating
+        self.max_rating = max_rating
@@ -1,35 +1,500 @@
-from typing import Sequence
+import dataclasses
+import uuid
+from collections.abc import AsyncIterator, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    SQLColumnExpression,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from db.models.resume import Resume
+from core.files.dto import UploadedFileSummaryDTO
+from core.pagination import KeysetPage, estimate_count, paginate_keyset
+from core.utils import utc_now
+from db.dependencies import on_commit
+from db.models import FileDeletionOutbox, Resume, ResumeRating, UploadedFile
+from db.models.file import TEXT_SEARCH_CONFIG
+from db.session import ReadOnlySession
+from settings import RatingSettings
 
-from .dto import ResumeCreateDTO
+from .cache import ResumeCache
+from .dto import (
+    ResumeCreateDTO,
+    ResumeDTO,
+    ResumeExportRowDTO,
+    ResumeRatingSummaryDTO,
+    ResumeSearchHitDTO,
+)
 
 
-class ResumeRepository:
-    def __init__(self, session: AsyncSession) -> None:
+def rating_score(
+    rating_sum: SQLColumnExpression[float],
+    rating_count: SQLColumnExpression[int],
+    settings: RatingSettings,
+) -> ColumnElement[float]:
+    """Байесовская средняя оценок резюме.
+
+    К оценкам резюме добавляется `prior_weight` априорных оценок `prior_mean`,
+    поэтому резюме с единственной высокой оценкой не опережает резюме
+    с большим числом чуть меньших оценок.
+    """
+    return (settings.prior_weight * settings.prior_mean + rating_sum) / (
+        settings.prior_weight + rating_count
+    )
+
+
+class ResumeReadRepository:
+    """Запросы на чтение резюме через `ReadOnlySession`.
+
+    При настроенной реплике данные могут отставать от основной БД на время
+    репликации.
+    """
+
+    def __init__(self, session: ReadOnlySession) -> None:
         self._session = session
 
-    async def get_resume_list(self) -> Sequence[Resume]:
-        query = select(Resume).order_by(Resume.created_at, Resume.rating)
-        return (await self._session.scalars(query)).all()
+    async def get_resume_page(
+        self,
+        *,
+        size: int,
+        cursor: str | None = None,
+    ) -> KeysetPage[Resume]:
+        return await paginate_keyset(
+            self._session,
+            select(Resume).options(joinedload(Resume.file, innerjoin=True)),
+            columns=(Resume.created_at, Resume.rating, Resume.id),
+            size=size,
+            cursor=cursor,
+        )
+
+    async def get_top_page(
+        self,
+        *,
+        size: int,
+        cursor: str | None = None,
+    ) -> KeysetPage[Resume]:
+        """Страница резюме в порядке убывания `rating_score`.
+
+        Обслуживается обратным проходом по индексу `ix_resume_rating_score_id`,
+        поэтому стоимость страницы пропорциональна её размеру.
+        """
+        return await paginate_keyset(
+            self._session,
+            select(Resume).options(joinedload(Resume.file, innerjoin=True)),
+            columns=(Resume.rating_score, Resume.id),
+            size=size,
+            cursor=cursor,
+            descending=True,
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        offset: int = 0,
+    ) -> list[ResumeSearchHitDTO]:
+        """Ранжированный поиск резюме по имени кандидата и тексту файла.
+
+        Имя сравнивается оператором `<%` модуля pg_trgm, текст файла —
+        полнотекстовым запросом по `uploaded_file.text_search`. Оба условия
+        отбираются отдельными подзапросами, объединёнными через UNION ALL,
+        чтобы каждый из них использовал свой GIN-индекс; релевантность
+        резюме равна сумме оценок по обоим подзапросам.
+
+        Args:
+            query (str): поисковая строка.
+            limit (int): максимальное число результатов.
+            offset (int, optional): смещение от начала выдачи. Defaults to 0.
+
+        Returns:
+            list[ResumeSearchHitDTO]: найденные резюме в порядке убывания релевантности.
+        """
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{TEXT_SEARCH_CONFIG}'"), query
+        )
+        by_name = select(
+            Resume.id.label("resume_id"),
+            func.word_similarity(query, Resume.pretender_name).label("score"),
+        ).where(literal(query).op("<%")(Resume.pretender_name))
+        by_text = (
+            select(
+                Resume.id.label("resume_id"),
+                func.ts_rank_cd(UploadedFile.text_search, ts_query).label("score"),
+            )
+            .join(UploadedFile, UploadedFile.id == Resume.file_id)
+            .where(UploadedFile.text_search.op("@@")(ts_query))
+        )
+        matches = union_all(by_name, by_text).subquery("matches")
+        ranked = (
+            select(
+                matches.c.resume_id,
+                func.sum(matches.c.score).label("score"),
+            )
+            .group_by(matches.c.resume_id)
+            .subquery("ranked")
+        )
+
+        stmt = (
+            select(Resume, ranked.c.score)
+            .join(ranked, ranked.c.resume_id == Resume.id)
+            .options(joinedload(Resume.file, innerjoin=True))
+            .order_by(ranked.c.score.desc(), Resume.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [
+            ResumeSearchHitDTO(resume=ResumeDTO.from_model(resume), score=score)
+            for resume, score in await self._session.execute(stmt)
+        ]
+
+    async def stream_export(
+        self,
+        batch_size: int,
+    ) -> AsyncIterator[list[ResumeExportRowDTO]]:
+        """Все резюме со сведениями о файлах пачками по `batch_size` строк.
+
+        Строки читаются серверным курсором, поэтому в памяти находится не
+        больше одной пачки. Порядок совпадает с индексом
+        `ix_resume_created_at_rating_id`, и план курсора отдаёт первые строки
+        без предварительной сортировки всей таблицы.
+        """
+        stmt = (
+            select(
+                Resume.id,
+                Resume.created_at,
+                Resume.updated_at,
+                Resume.pretender_name,
+                Resume.rating,
+                Resume.rating_count,
+                Resume.rating_mean,
+                Resume.rating_score,
+                Resume.file_id,
+                Resume.file_name,
+                Resume.file_content_type,
+                UploadedFile.file_size,
+                UploadedFile.extraction_status.label("file_extraction_status"),
+            )
+            .join(UploadedFile, UploadedFile.id == Resume.file_id)
+            .order_by(Resume.created_at, Resume.rating, Resume.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream(stmt)
+        try:
+            async for partition in result.partitions():
+                yield [ResumeExportRowDTO(**row._mapping) for row in partition]
+        finally:
+            await result.close()
+
+    async def get_files(
+        self,
+        *,
+        ids: Sequence[UUID] | None = None,
+        min_rating_score: float | None = None,
+        limit: int,
+    ) -> list[UploadedFileSummaryDTO]:
+        """Файлы резюме, выбранных по идентификаторам или по `rating_score`.
+
+        Резюме по идентификаторам возвращаются в порядке `ids`, по
+        `rating_score` — в порядке его убывания. Файлы получают названия,
+        под которыми их загрузили в резюме; файл, на который под одним
+        названием ссылается несколько резюме, возвращается один раз.
+        """
+        stmt = (
+            select(Resume.id, Resume.file_name, Resume.file_content_type, UploadedFile)
+            .join(UploadedFile, UploadedFile.id == Resume.file_id)
+            .limit(limit)
+        )
+        if ids is not None:
+            stmt = stmt.where(Resume.id.in_(ids))
+        if min_rating_score is not None:
+            stmt = stmt.where(Resume.rating_score >= min_rating_score).order_by(
+                Resume.rating_score.desc(), Resume.id
+            )
+        rows = (await self._session.execute(stmt)).all()
+        if ids is not None:
+            positions = {id_: position for position, id_ in enumerate(ids)}
+            rows.sort(key=lambda row: positions[row[0]])
+
+        files = {}
+        for _, name, content_type, file in rows:
+            if (file.id, name) not in files:
+                files[file.id, name] = dataclasses.replace(
+                    UploadedFileSummaryDTO.from_model(file),
+                    name=name,
+                    content_type=content_type,
+                )
+        return list(files.values())
+
+    async def estimate_count(self) -> int:
+        return await estimate_count(self._session, Resume.__tablename__)
 
     async def get(self, id_: UUID) -> Resume | None:
-        return await self._session.get(Resume, id_)
+        query = (
+            select(Resume)
+            .options(joinedload(Resume.file, innerjoin=True))
+            .where(Resume.id == id_)
+        )
+        return await self._session.scalar(query)
 
-    async def delete(self, model: Resume) -> None:
-        await self._session.delete(model)
-        await self._session.flush()
+
+class ResumeRepository:
+    def __init__(
+        self,
+        session: AsyncSession,
+        settings: RatingSettings,
+        cache: ResumeCache,
+    ) -> None:
+        self._session = session
+        self._settings = settings
+        self._cache = cache
+
+    async def lock(self, id_: UUID) -> bool:
+        """Блокировка строки резюме до конца транзакции.
+
+        Используется `FOR NO KEY UPDATE`, который не конфликтует со вставкой
+        строк, ссылающихся на резюме по внешнему ключу.
+
+        Returns:
+            bool: резюме существует и заблокировано.
+        """
+        query = (
+            select(Resume.id).where(Resume.id == id_).with_for_update(key_share=True)
+        )
+        return await self._session.scalar(query) is not None
+
+    async def apply_rating_change(
+        self,
+        id_: UUID,
+        count_delta: int,
+        sum_delta: float,
+    ) -> ResumeRatingSummaryDTO:
+        """Инкрементальное обновление агрегатов оценок резюме.
+
+        Args:
+            id_ (UUID): идентификатор резюме.
+            count_delta (int): изменение числа оценок.
+            sum_delta (float): изменение суммы оценок.
+
+        Вместе с агрегатами пересчитывается `rating_score`, см. `rating_score`.
+
+        Returns:
+            ResumeRatingSummaryDTO: агрегаты оценок после обновления.
+        """
+        rating_count = Resume.rating_count + count_delta
+        rating_sum = Resume.rating_sum + sum_delta
+        query = (
+            update(Resume)
+            .where(Resume.id == id_)
+            .values(
+                rating_count=rating_count,
+                rating_sum=rating_sum,
+                rating_mean=rating_sum / func.nullif(rating_count, 0, type_=Float),
+                rating_score=rating_score(rating_sum, rating_count, self._settings),
+            )
+            .returning(Resume.rating_count, Resume.rating_mean, Resume.rating_score)
+            .execution_options(synchronize_session=False)
+        )
+        count, mean, score = (await self._session.execute(query)).one()
+        self._invalidate_cache()
+        return ResumeRatingSummaryDTO(
+            resume_id=id_,
+            rating_count=count,
+            rating_mean=mean,
+            rating_score=score,
+        )
+
+    async def recompute_rating_scores(
+        self,
+        *,
+        after: UUID | None,
+        limit: int,
+    ) -> tuple[UUID | None, int]:
+        """Пересчёт `rating_score` пачки резюме по текущим `RatingSettings`.
+
+        Резюме обходятся в порядке идентификаторов, начиная после `after`;
+        обновляются только строки, оценка которых отличается от пересчитанной.
+
+        Returns:
+            tuple[UUID | None, int]: идентификатор последнего резюме пачки
+                (None, если резюме закончились) и число обновлённых строк.
+        """
+        batch = select(Resume.id).order_by(Resume.id).limit(limit)
+        if after is not None:
+            batch = batch.where(Resume.id > after)
+        ids = (await self._session.scalars(batch)).all()
+        if not ids:
+            return None, 0
+
+        score = rating_score(Resume.rating_sum, Resume.rating_count, self._settings)
+        result = await self._session.execute(
+            update(Resume)
+            .where(Resume.id.in_(ids), Resume.rating_score.is_distinct_from(score))
+            .values(rating_score=score)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            self._invalidate_cache()
+        return ids[-1], result.rowcount
+
+    async def delete_many(self, ids: Sequence[UUID]) -> list[UUID]:
+        """Удаление резюме вместе с записями о файлах, на которые больше нет ссылок.
+
+        Первый запрос удаляет резюме и уменьшает счётчики ссылок их файлов,
+        второй удаляет файлы с обнулившимся счётчиком и в том же запросе
+        ставит их пути в очередь `file_deletion_outbox`, из которой объекты
+        удаляет из S3 фоновый обработчик. Счётчики уменьшаются отдельным
+        запросом, так как изменения одной таблицы в разных CTE
+        не видны друг другу.
+
+        Returns:
+            list[UUID]: идентификаторы удалённых резюме.
+        """
+        if not ids:
+            return []
+
+        deleted_resume = (
+            delete(Resume)
+            .where(Resume.id.in_(ids))
+            .returning(Resume.id, Resume.file_id)
+            .cte("deleted_resume")
+        )
+        released = (
+            select(
+                deleted_resume.c.file_id,
+                func.count().label("references"),
+            )
+            .group_by(deleted_resume.c.file_id)
+            .cte("released")
+        )
+        decremented = (
+            update(UploadedFile)
+            .where(UploadedFile.id == released.c.file_id)
+            .values(
+                reference_count=UploadedFile.reference_count - released.c.references
+            )
+            .returning(UploadedFile.id)
+            .cte("decremented")
+        )
+        rows = (
+            await self._session.execute(
+                select(deleted_resume.c.id, deleted_resume.c.file_id).add_cte(
+                    decremented
+                )
+            )
+        ).all()
+        if not rows:
+            return []
+        self._invalidate_cache()
+
+        deleted_file = (
+            delete(UploadedFile)
+            .where(
+                UploadedFile.id.in_({file_id for _, file_id in rows}),
+                UploadedFile.reference_count <= 0,
+            )
+            .returning(UploadedFile.bucket, UploadedFile.path)
+            .cte("deleted_file")
+        )
+        await self._session.execute(
+            insert(FileDeletionOutbox).from_select(
+                ["bucket", "path"],
+                select(deleted_file.c.bucket, deleted_file.c.path),
+            )
+        )
+        return [resume_id for resume_id, _ in rows]
 
     async def create_resume(self, dto: ResumeCreateDTO):
         model = Resume(
             pretender_name=dto.pretender_name,
             rating=dto.rating,
+            rating_score=self._settings.prior_mean,
             file_id=dto.file_id,
+            file_name=dto.file_name,
+            file_content_type=dto.file_content_type,
         )
         self._session.add(model)
         await self._session.flush()
+        self._invalidate_cache()
         return model
+
+    async def create_many(self, dtos: Sequence[ResumeCreateDTO]) -> list[UUID]:
+        if not dtos:
+            return []
+
+        ids = [uuid.uuid4() for _ in dtos]
+        created_at = utc_now()
+        await self._session.execute(
+            insert(Resume),
+            [
+                {
+                    "id": id_,
+                    "pretender_name": dto.pretender_name,
+                    "rating": dto.rating,
+                    "rating_score": self._settings.prior_mean,
+                    "file_id": dto.file_id,
+                    "file_name": dto.file_name,
+                    "file_content_type": dto.file_content_type,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+                for id_, dto in zip(ids, dtos, strict=True)
+            ],
+        )
+        self._invalidate_cache()
+        return ids
+
+    def _invalidate_cache(self) -> None:
+        on_commit(self._session, self._cache.invalidate)
+
+
+class ResumeRatingRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_value(self, resume_id: UUID, user_id: UUID) -> float | None:
+        return await self._session.scalar(
+            select(ResumeRating.value).where(
+                ResumeRating.resume_id == resume_id,
+                ResumeRating.user_id == user_id,
+            )
+        )
+
+    async def upsert(self, resume_id: UUID, user_id: UUID, value: float) -> None:
+        query = pg_insert(ResumeRating).values(
+            resume_id=resume_id,
+            user_id=user_id,
+            value=value,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[ResumeRating.resume_id, ResumeRating.user_id],
+            set_={"value": query.excluded.value, "updated_at": utc_now()},
+        )
+        await self._session.execute(query)
+
+    async def delete(self, resume_id: UUID, user_id: UUID) -> float | None:
+        """Удаление оценки пользователя.
+
+        Returns:
+            float | None: удалённая оценка или None, если оценки не было.
+        """
+        return await self._session.scalar(
+            delete(ResumeRating)
+            .where(
+                ResumeRating.resume_id == resume_id,
+                ResumeRating.user_id == user_id,
+            )
+            .returning(ResumeRating.value)
+        )
@@ -1,78 +1,540 @@
+import dataclasses
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Sequence
 from pathlib import PurePath
+from typing import Final, TypeAlias
 
 from fastapi import UploadFile
 from result import Err, Ok, Result
 
-from core.exceptions import ObjectNotFoundError
+from core.exceptions import InvalidCursorError, ObjectNotFoundError
+from core.files.dto import (
+    CompletedPartDTO,
+    DirectUploadDTO,
+    FileReferenceDTO,
+    ResumableUploadDTO,
+    UploadedFileDTO,
+    UploadedFileSummaryDTO,
+)
 from core.files.exceptions import (
     ContentTypeIsNoneError,
+    ContentTypeNotAllowedError,
     FilenameIsNoneError,
+    FileStorageError,
     InvalidFileSizeError,
+    InvalidUploadKeyError,
+    UploadCompletionError,
+    UploadIncompleteError,
+    UploadLockedError,
 )
 from core.files.repository import UploadedFileRepository
+from core.files.resumable import ResumableUploadService
 from core.files.service import FileService
-from db.models.resume import Resume
+from core.pagination import KeysetPage
+from db.models.resume import MAX_RATING, MIN_RATING, Resume
 from settings import UploadSettings
 
-from .dto import ResumeCreateDTO
-from .repositories import ResumeRepository
+from .cache import ResumeCache
+from .dto import (
+    ResumeCreateDTO,
+    ResumeDeletionResultDTO,
+    ResumeDeletionStatus,
+    ResumeDTO,
+    ResumeExportRowDTO,
+    ResumeRatingSummaryDTO,
+    ResumeSearchPageDTO,
+)
+from .exceptions import InvalidRatingError
+from .repositories import ResumeRatingRepository, ResumeReadRepository, ResumeRepository
+
+EXPORT_BATCH_SIZE: Final = 1_000
+
+ResumeUploadError: TypeAlias = (
+    FilenameIsNoneError
+    | ContentTypeIsNoneError
+    | InvalidFileSizeError
+    | InvalidRatingError
+)
+ResumeBatchUploadError: TypeAlias = ResumeUploadError | FileStorageError
+ResumeDirectUploadError: TypeAlias = (
+    InvalidUploadKeyError
+    | UploadCompletionError
+    | InvalidFileSizeError
+    | ContentTypeNotAllowedError
+    | InvalidRatingError
+    | FileStorageError
+)
+ResumeResumableUploadError: TypeAlias = (
+    ObjectNotFoundError
+    | UploadLockedError
+    | UploadIncompleteError
+    | UploadCompletionError
+    | InvalidRatingError
+)
 
 
 class ResumeService:
     def __init__(
         self,
         file_service: FileService,
+        resumable_upload_service: ResumableUploadService,
         resume_repository: ResumeRepository,
+        resume_read_repository: ResumeReadRepository,
+        resume_cache: ResumeCache,
         file_repository: UploadedFileRepository,
+        rating_repository: ResumeRatingRepository,
         settings: UploadSettings,
     ) -> None:
         self._file_service = file_service
+        self._resumable_upload_service = resumable_upload_service
         self._resume_repository = resume_repository
+        self._resume_read_repository = resume_read_repository
+        self._resume_cache = resume_cache
         self._file_repository = file_repository
+        self._rating_repository = rating_repository
         self._settings = settings
 
-    async def read_resume_list(self) -> Sequence[Resume]:
-        resume_list = await self._resume_repository.get_resume_list()
-        return resume_list
+    async def read_resume_page(
+        self,
+        *,
+        size: int,
+        cursor: str | None = None,
+        include_total: bool = False,
+    ) -> Result[KeysetPage[ResumeDTO], InvalidCursorError]:
+        try:
+            page = await self._resume_cache.get_or_load(
+                f"page:{size}:{cursor}",
+                lambda: self._load_page(
+                    self._resume_read_repository.get_resume_page(
+                        size=size, cursor=cursor
+                    )
+                ),
+            )
+        except InvalidCursorError as e:
+            return Err(e)
+
+        if include_total:
+            total = await self._resume_cache.get_or_load(
+                "count", self._resume_read_repository.estimate_count
+            )
+            page = dataclasses.replace(page, total=total)
+        return Ok(page)
+
+    async def read_top_page(
+        self,
+        *,
+        size: int,
+        cursor: str | None = None,
+    ) -> Result[KeysetPage[ResumeDTO], InvalidCursorError]:
+        try:
+            page = await self._resume_cache.get_or_load(
+                f"top:{size}:{cursor}",
+                lambda: self._load_page(
+                    self._resume_read_repository.get_top_page(size=size, cursor=cursor)
+                ),
+            )
+        except InvalidCursorError as e:
+            return Err(e)
+        return Ok(page)
+
+    async def read_resume(
+        self, id_: uuid.UUID
+    ) -> Result[ResumeDTO, ObjectNotFoundError]:
+        resume = await self._resume_cache.get_or_load(
+            f"resume:{id_}",
+            lambda: self._load_resume(id_),
+        )
+        if resume is None:
+            return Err(ObjectNotFoundError(id_=str(id_), entity_name="Resume"))
+        return Ok(resume)
+
+    def export_resumes(
+        self,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[list[ResumeExportRowDTO]]:
+        return self._resume_read_repository.stream_export(batch_size=batch_size)
+
+    async def search_resumes(
+        self,
+        query: str,
+        *,
+        size: int,
+        offset: int = 0,
+    ) -> ResumeSearchPageDTO:
+        hits = await self._resume_read_repository.search(
+            query,
+            limit=size + 1,
+            offset=offset,
+        )
+        return ResumeSearchPageDTO(
+            items=hits[:size],
+            next_offset=offset + size if len(hits) > size else None,
+        )
+
+    async def open_resume_file(
+        self,
+        resume: Resume | ResumeDTO,
+        byte_range: tuple[int, int] | None = None,
+        chunk_size: int = 1024 * 64,
+    ) -> Result[AsyncIterator[bytes], FileStorageError]:
+        return await self._file_service.open_file(
+            resume.file,
+            byte_range=byte_range,
+            chunk_size=chunk_size,
+        )
+
+    async def read_archive_files(
+        self,
+        *,
+        ids: Sequence[uuid.UUID] | None = None,
+        min_rating_score: float | None = None,
+        limit: int,
+    ) -> Result[list[UploadedFileSummaryDTO], ObjectNotFoundError]:
+        files = await self._resume_read_repository.get_files(
+            ids=ids,
+            min_rating_score=min_rating_score,
+            limit=limit,
+        )
+        if not files:
+            selection = (
+                ", ".join(map(str, ids))
+                if ids is not None
+                else f"rating_score >= {min_rating_score}"
+            )
+            return Err(ObjectNotFoundError(id_=selection, entity_name="Resume"))
+        return Ok(files)
+
+    def stream_archive(
+        self,
+        files: Sequence[UploadedFileSummaryDTO],
+        *,
+        chunk_size: int,
+        prefetch_files: int,
+        prefetch_chunks: int,
+    ) -> AsyncIterator[bytes]:
+        return self._file_service.stream_archive(
+            files,
+            chunk_size=chunk_size,
+            prefetch_files=prefetch_files,
+            prefetch_chunks=prefetch_chunks,
+        )
+
+    async def read_download_urls(
+        self,
+        resumes: Sequence[Resume | ResumeDTO],
+    ) -> dict[uuid.UUID, str]:
+        """Ссылки на скачивание файлов резюме по идентификаторам резюме.
+
+        Ссылка задаёт название скачиваемого файла, которое у резюме с общим
+        файлом может различаться.
+        """
+        urls = await self._file_service.get_download_urls(
+            [resume.file for resume in resumes]
+        )
+        return {resume.id: url for resume, url in zip(resumes, urls, strict=True)}
 
     async def upload_pretender_resume(
         self,
         file: UploadFile,
         dto: ResumeCreateDTO,
-    ) -> Result[
-        Resume, FilenameIsNoneError | ContentTypeIsNoneError | InvalidFileSizeError
-    ]:
-        resume_file_id = uuid.uuid4()
+    ) -> Result[Resume, ResumeUploadError]:
+        rating_validation = self._validate_rating(dto.rating)
+        if isinstance(rating_validation, Err):
+            return rating_validation
+
         file_upload = await self._file_service.upload_and_save(
             file=file,
-            directory=PurePath(
-                self._settings.root_path,
-                self._settings.resume_attachments_folder,
-                str(resume_file_id),
-            ),
+            directory=self._build_resume_directory(),
         )
         if isinstance(file_upload, Err):
             return file_upload
 
-        dto.file_id = file_upload.ok_value.id
-        resume = await self._resume_repository.create_resume(dto=dto)
+        resume = await self._resume_repository.create_resume(
+            dto=self._attach_file(dto, file_upload.ok_value)
+        )
         return Ok(resume)
 
+    async def upload_pretender_resume_stream(
+        self,
+        filename: str | None,
+        content_type: str | None,
+        chunks: AsyncIterable[bytes],
+        dto: ResumeCreateDTO,
+    ) -> Result[Resume, ResumeUploadError]:
+        rating_validation = self._validate_rating(dto.rating)
+        if isinstance(rating_validation, Err):
+            return rating_validation
+
+        file_upload = await self._file_service.upload_stream_and_save(
+            filename=filename,
+            content_type=content_type,
+            chunks=chunks,
+            directory=self._build_resume_directory(),
+        )
+        if isinstance(file_upload, Err):
+            return file_upload
+
+        resume = await self._resume_repository.create_resume(
+            dto=self._attach_file(dto, file_upload.ok_value)
+        )
+        return Ok(resume)
+
+    async def initiate_direct_upload(
+        self,
+        filename: str,
+        content_type: str,
+        size: int,
+    ) -> Result[DirectUploadDTO, InvalidFileSizeError | ContentTypeNotAllowedError]:
+        return await self._file_service.initiate_direct_upload(
+            directory=self._build_resume_directory(),
+            filename=filename,
+            content_type=content_type,
+            size=size,
+        )
+
+    async def complete_direct_upload(
+        self,
+        path: str,
+        upload_id: str,
+        parts: Sequence[CompletedPartDTO],
+        dto: ResumeCreateDTO,
+    ) -> Result[Resume, ResumeDirectUploadError]:
+        """Сохранение резюме, файл которого клиент загрузил напрямую в S3.
+
+        Оценка проверяется до завершения загрузки, поэтому при ошибке в ней
+        клиент может повторить запрос, не загружая файл заново.
+        """
+        rating_validation = self._validate_rating(dto.rating)
+        if isinstance(rating_validation, Err):
+            return rating_validation
+
+        file_upload = await self._file_service.complete_direct_upload(
+            root_directory=self._resume_root_directory(),
+            path=path,
+            upload_id=upload_id,
+            parts=parts,
+        )
+        if isinstance(file_upload, Err):
+            return file_upload
+
+        resume = await self._resume_repository.create_resume(
+            dto=self._attach_file(dto, file_upload.ok_value)
+        )
+        return Ok(resume)
+
+    async def create_resumable_upload(
+        self,
+        filename: str,
+        content_type: str,
+        size: int,
+    ) -> Result[ResumableUploadDTO, InvalidFileSizeError | ContentTypeNotAllowedError]:
+        return await self._resumable_upload_service.create(
+            directory=self._build_resume_directory(),
+            filename=filename,
+            content_type=content_type,
+            size=size,
+        )
+
+    async def complete_resumable_upload(
+        self,
+        upload_id: uuid.UUID,
+        dto: ResumeCreateDTO,
+    ) -> Result[Resume, ResumeResumableUploadError]:
+        rating_validation = self._validate_rating(dto.rating)
+        if isinstance(rating_validation, Err):
+            return rating_validation
+
+        file_upload = await self._resumable_upload_service.complete(upload_id)
+        if isinstance(file_upload, Err):
+            return file_upload
+
+        resume = await self._resume_repository.create_resume(
+            dto=self._attach_file(dto, file_upload.ok_value)
+        )
+        return Ok(resume)
+
+    async def upload_pretender_resumes(
+        self,
+        items: Sequence[tuple[UploadFile, ResumeCreateDTO]],
+    ) -> list[Result[uuid.UUID, ResumeBatchUploadError]]:
+        """Пакетная загрузка резюме.
+
+        Файлы загружаются в S3 параллельно, после чего записи обо всех успешно
+        загруженных файлах и резюме вставляются двумя многострочными INSERT
+        в рамках одной транзакции. Ошибка отдельного элемента не влияет
+        на остальные и возвращается на его позиции. Если транзакция не будет
+        зафиксирована, загруженные объекты удалит обработчик очереди удаления.
+        """
+        results: list[Result[uuid.UUID, ResumeBatchUploadError] | None]
+        results = [None] * len(items)
+
+        accepted: list[int] = []
+        for index, (_, dto) in enumerate(items):
+            rating_validation = self._validate_rating(dto.rating)
+            if isinstance(rating_validation, Err):
+                results[index] = rating_validation
+            else:
+                accepted.append(index)
+
+        uploads = await self._file_service.upload_files(
+            directories=[self._build_resume_directory() for _ in accepted],
+            files=[items[index][0] for index in accepted],
+        )
+
+        existing: list[tuple[int, FileReferenceDTO]] = []
+        uploaded: list[tuple[int, UploadedFileDTO]] = []
+        for index, upload in zip(accepted, uploads, strict=True):
+            if isinstance(upload, Err):
+                results[index] = upload
+            elif isinstance(upload.ok_value, FileReferenceDTO):
+                existing.append((index, upload.ok_value))
+            else:
+                uploaded.append((index, upload.ok_value))
+
+        file_ids = await self._file_repository.create_many(
+            [file_dto for _, file_dto in uploaded]
+        )
+        stored = existing + [
+            (
+                index,
+                FileReferenceDTO(
+                    id=file_id,
+                    name=file_dto.filename,
+                    content_type=file_dto.content_type,
+                ),
+            )
+            for (index, file_dto), file_id in zip(uploaded, file_ids, strict=True)
+        ]
+        resume_ids = await self._resume_repository.create_many(
+            [self._attach_file(items[index][1], file) for index, file in stored]
+        )
+        for (index, _), resume_id in zip(stored, resume_ids, strict=True):
+            results[index] = Ok(resume_id)
+
+        return [result for result in results if result is not None]
+
     async def delete_resume(self, id_: uuid.UUID) -> Result[None, ObjectNotFoundError]:
-        resume = await self._resume_repository.get(id_=id_)
-        if resume is None:
+        deleted = await self._resume_repository.delete_many([id_])
+        if not deleted:
             return Err(ObjectNotFoundError(id_=id_, entity_name="Resume"))
+        return Ok(None)
+
+    async def delete_resumes(
+        self,
+        ids: Sequence[uuid.UUID],
+    ) -> list[ResumeDeletionResultDTO]:
+        """Пакетное удаление резюме и их файлов.
+
+        Записи удаляются одним запросом, который также ставит файлы в очередь
+        на удаление из S3; сами объекты удаляет фоновый обработчик очереди.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        deleted = set(await self._resume_repository.delete_many(unique_ids))
+        return [
+            ResumeDeletionResultDTO(
+                resume_id=id_,
+                status=(
+                    ResumeDeletionStatus.DELETED
+                    if id_ in deleted
+                    else ResumeDeletionStatus.NOT_FOUND
+                ),
+            )
+            for id_ in unique_ids
+        ]
+
+    async def rate_resume(
+        self,
+        resume_id: uuid.UUID,
+        user_id: uuid.UUID,
+        value: float,
+    ) -> Result[ResumeRatingSummaryDTO, ObjectNotFoundError | InvalidRatingError]:
+        """Выставление или изменение оценки резюме пользователем.
+
+        Строка резюме блокируется до конца транзакции, поэтому конкурентные
+        изменения оценок одного резюме применяются к агрегатам последовательно.
+        """
+        rating_validation = self._validate_rating(value)
+        if isinstance(rating_validation, Err):
+            return rating_validation
+
+        if not await self._resume_repository.lock(resume_id):
+            return Err(ObjectNotFoundError(id_=str(resume_id), entity_name="Resume"))
+
+        previous = await self._rating_repository.get_value(resume_id, user_id)
+        await self._rating_repository.upsert(resume_id, user_id, value)
+        summary = await self._resume_repository.apply_rating_change(
+            resume_id,
+            count_delta=0 if previous is not None else 1,
+            sum_delta=value - (previous or 0.0),
+        )
+        return Ok(summary)
 
-        uploaded_file = await self._file_repository.get(id_=resume.file_id)
-        if uploaded_file is None:
+    async def unrate_resume(
+        self,
+        resume_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> Result[ResumeRatingSummaryDTO, ObjectNotFoundError]:
+        if not await self._resume_repository.lock(resume_id):
+            return Err(ObjectNotFoundError(id_=str(resume_id), entity_name="Resume"))
+
+        previous = await self._rating_repository.delete(resume_id, user_id)
+        if previous is None:
             return Err(
-                ObjectNotFoundError(id_=str(resume.file_id), entity_name="UploadedFile")
+                ObjectNotFoundError(
+                    id_=f"{resume_id}:{user_id}", entity_name="ResumeRating"
+                )
             )
 
-        await self._resume_repository.delete(model=resume)
-        await self._file_service.delete_file(path=uploaded_file.path)
-        await self._file_repository.delete(model=uploaded_file)
+        summary = await self._resume_repository.apply_rating_change(
+            resume_id,
+            count_delta=-1,
+            sum_delta=-previous,
+        )
+        return Ok(summary)
+
+    @staticmethod
+    async def _load_page(
+        query: Awaitable[KeysetPage[Resume]],
+    ) -> KeysetPage[ResumeDTO]:
+        page = await query
+        return KeysetPage(
+            items=tuple(ResumeDTO.from_model(resume) for resume in page.items),
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+            total=page.total,
+        )
+
+    async def _load_resume(self, id_: uuid.UUID) -> ResumeDTO | None:
+        resume = await self._resume_read_repository.get(id_)
+        return ResumeDTO.from_model(resume) if resume is not None else None
+
+    @staticmethod
+    def _attach_file(dto: ResumeCreateDTO, file: FileReferenceDTO) -> ResumeCreateDTO:
+        return dataclasses.replace(
+            dto,
+            file_id=file.id,
+            file_name=file.name,
+            file_content_type=file.content_type,
+        )
 
+    @staticmethod
+    def _validate_rating(rating: float) -> Result[None, InvalidRatingError]:
+        if not MIN_RATING <= rating <= MAX_RATING:
+            return Err(
+                InvalidRatingError(
+                    rating=rating,
+                    min_rating=MIN_RATING,
+                    max_rating=MAX_RATING,
+                )
+            )
         return Ok(None)
+
+    def _resume_root_directory(self) -> PurePath:
+        return PurePath(
+            self._settings.root_path,
+            self._settings.resume_attachments_folder,
+        )
+
+    def _build_resume_directory(self) -> PurePath:
+        resume_file_id = uuid.uuid4()
+        return PurePath(self._resume_root_directory(), str(resume_file_id))
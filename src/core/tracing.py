@@ -0,0 +1,61 @@
+import time
+from types import TracebackType
+from typing import Self
+
+from opentelemetry import trace
+from opentelemetry.util.types import AttributeValue
+
+_tracer = trace.get_tracer("filebase")
+
+
+class Span:
+    """Замер длительности операции, оформленный спаном OpenTelemetry.
+
+    Без настроенного SDK OpenTelemetry спаны ничего не экспортируют, и
+    остаётся только замер `duration`, который вызывающая сторона записывает
+    в гистограмму. Внутри `with` спан становится текущим, и спаны вложенных
+    операций, в том числе запущенных в дочерних задачах, становятся его
+    потомками.
+    """
+
+    __slots__ = ("_span", "_scope", "_started_at", "duration")
+
+    def __init__(
+        self,
+        name: str,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> None:
+        self._span = _tracer.start_span(name, attributes=attributes)
+        self._scope = trace.use_span(self._span, end_on_exit=False)
+        self._started_at = time.perf_counter()
+        self.duration = 0.0
+
+    def __enter__(self) -> Self:
+        self._scope.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self._scope.__exit__(None, None, None)
+        self.end(error=exc_val)
+
+    def update_name(self, name: str) -> None:
+        self._span.update_name(name)
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self._span.set_attribute(key, value)
+
+    def end(self, error: BaseException | None = None) -> float:
+        self.duration = time.perf_counter() - self._started_at
+        if error is not None:
+            self._span.record_exception(error)
+            self.mark_failed(type(error).__name__)
+        self._span.end()
+        return self.duration
+
+    def mark_failed(self, description: str) -> None:
+        self._span.set_status(trace.StatusCode.ERROR, description)
@@ -1,9 +1,26 @@
 import contextlib
-from typing import AsyncIterator
+import logging
+from collections.abc import Awaitable, Callable
+from typing import AsyncIterator, Final
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .engine import async_session_factory
+from .engine import async_session_factory, read_session_factory
+from .session import ReadOnlySession
+from .tracing import observe_query
+
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT_CALLBACKS: Final = "after_commit_callbacks"
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Регистрация обработчика, вызываемого после фиксации транзакции сессии.
+
+    Обработчики вызываются только для сессий, открытых через `create_session`;
+    повторно зарегистрированный обработчик вызывается один раз.
+    """
+    session.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append(callback)
 
 
 @contextlib.asynccontextmanager
@@ -13,5 +30,20 @@ async def create_session() -> AsyncIterator[AsyncSession]:
     Yields:
         Iterator[AsyncIterator[AsyncSession]]: открытая через контекстный менеджер сессия.
     """
-    async with async_session_factory.begin() as session:
+    async with async_session_factory() as session:
+        yield session
+        with observe_query("COMMIT"):
+            await session.commit()
+
+    for callback in dict.fromkeys(session.info.pop(_AFTER_COMMIT_CALLBACKS, [])):
+        try:
+            await callback()
+        except Exception:
+            logger.exception("After-commit callback %r failed", callback)
+
+
+@contextlib.asynccontextmanager
+async def create_read_session() -> AsyncIterator[ReadOnlySession]:
+    """Dependency с сессией только для чтения, см. `ReadOnlySession`."""
+    async with read_session_factory() as session:
         yield session
@@ -1,7 +1,46 @@
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from settings import DatabaseSettings, get_settings
 
+from .pool import InstrumentedAsyncAdaptedQueuePool
+from .session import ReadOnlySession
+from .tracing import instrument_engine
+
+
+def _create_engine(url: str, settings: DatabaseSettings) -> AsyncEngine:
+    engine = create_async_engine(
+        url=make_url(url).update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.prepared_statement_cache_size
+                )
+            },
+        ),
+        echo=settings.echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+    )
+    instrument_engine(engine)
+    return engine
+
+
 settings: DatabaseSettings = get_settings(DatabaseSettings)
-engine: AsyncEngine = create_async_engine(url=settings.url)
+engine: AsyncEngine = _create_engine(settings.url, settings)
 async_session_factory = async_sessionmaker(bind=engine)
+
+# Без реплики чтения используют пул основной БД
+read_engine: AsyncEngine = (
+    _create_engine(settings.read_replica_url, settings)
+    if settings.read_replica_url
+    else engine
+).execution_options(isolation_level="AUTOCOMMIT")
+read_session_factory = async_sessionmaker(
+    bind=read_engine,
+    class_=ReadOnlySession,
+    expire_on_commit=False,
+)
@@ -1,7 +1,13 @@
 from .file import UploadedFile
-from .resume import Resume
+from .outbox import FileDeletionOutbox
+from .resume import Resume, ResumeRating
+from .upload import ResumableUpload, ResumableUploadPart
 
 __all__ = (
+    "FileDeletionOutbox",
+    "ResumableUpload",
+    "ResumableUploadPart",
     "Resume",
+    "ResumeRating",
     "UploadedFile",
 )
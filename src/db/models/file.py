@@ -1,13 +1,37 @@
 import datetime
+import enum
+from typing import Final
 
+from sqlalchemy import Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.utils import utc_now
 from db.base import Base, str_64, str_128, uuid_pk
 
+TEXT_SEARCH_CONFIG: Final = "russian"
+EXTRACTION_CHANNEL: Final = "uploaded_file_extraction"
+
+
+class ExtractionStatus(enum.StrEnum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+    UNSUPPORTED = "unsupported"
+
 
 class UploadedFile(Base):
     __tablename__ = "uploaded_file"
+    __table_args__ = (
+        Index("ix_uploaded_file_bucket_path", "bucket", "path", unique=True),
+        Index("ix_uploaded_file_text_search", "text_search", postgresql_using="gin"),
+        Index(
+            "ix_uploaded_file_extraction_queue",
+            "created_at",
+            postgresql_where=text("extraction_status IN ('PENDING', 'PROCESSING')"),
+        ),
+    )
 
     id: Mapped[uuid_pk]
     name: Mapped[str] = mapped_column(
@@ -20,3 +44,42 @@ class UploadedFile(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         default=utc_now, comment="Дата создания записи информации о файле"
     )
+    content_hash: Mapped[str_64 | None] = mapped_column(
+        unique=True, comment="SHA-256 содержимого файла в шестнадцатеричном виде"
+    )
+    reference_count: Mapped[int] = mapped_column(
+        server_default=text("1"), comment="Число резюме, ссылающихся на файл"
+    )
+
+    text_content: Mapped[str | None] = mapped_column(
+        deferred=True,
+        deferred_raiseload=True,
+        comment="Текст, извлечённый из файла",
+    )
+    text_search: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(text_content, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+        deferred_raiseload=True,
+        comment="Поисковый вектор по тексту файла",
+    )
+    extraction_status: Mapped[ExtractionStatus] = mapped_column(
+        default=ExtractionStatus.PENDING,
+        server_default=ExtractionStatus.PENDING.name,
+        comment="Статус извлечения текста из файла",
+    )
+    extraction_attempts: Mapped[int] = mapped_column(
+        server_default=text("0"), comment="Число попыток извлечения текста"
+    )
+    extraction_started_at: Mapped[datetime.datetime | None] = mapped_column(
+        comment="Время начала текущей попытки извлечения текста"
+    )
+    extraction_next_attempt_at: Mapped[datetime.datetime | None] = mapped_column(
+        comment="Время, раньше которого файл не захватывается для извлечения"
+    )
+    extraction_error: Mapped[str | None] = mapped_column(
+        comment="Текст последней ошибки извлечения"
+    )
@@ -0,0 +1,37 @@
+import datetime
+
+from sqlalchemy import Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base, int64_pk, str_128
+
+
+class FileDeletionOutbox(Base):
+    __tablename__ = "file_deletion_outbox"
+    __table_args__ = (
+        Index(
+            "ix_file_deletion_outbox_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+        Index("ix_file_deletion_outbox_path", "path"),
+    )
+
+    id: Mapped[int64_pk]
+    bucket: Mapped[str_128] = mapped_column(comment="Название бакета в S3")
+    path: Mapped[str] = mapped_column(comment="Полный путь до удаляемого файла в S3")
+    attempts: Mapped[int] = mapped_column(
+        server_default=text("0"), comment="Число неудачных попыток удаления"
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        comment="Текст последней ошибки удаления"
+    )
+    next_attempt_at: Mapped[datetime.datetime] = mapped_column(
+        server_default=func.now(), comment="Время следующей попытки удаления"
+    )
+    failed_at: Mapped[datetime.datetime | None] = mapped_column(
+        comment="Время отказа от удаления после исчерпания попыток"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        server_default=func.now(), comment="Дата постановки файла в очередь на удаление"
+    )
@@ -1,18 +1,31 @@
 import datetime
 import uuid
 
-from sqlalchemy import CheckConstraint, ForeignKey
+from sqlalchemy import CheckConstraint, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.utils import utc_now
-from db.base import Base, uuid_pk
+from db.base import Base, str_64, uuid_pk
 from db.models import UploadedFile
 
+MIN_RATING = 0.0
+MAX_RATING = 5.0
+
 
 class Resume(Base):
     __tablename__ = "resume"
     __table_args__ = (
-        CheckConstraint("rating BETWEEN 0.0 AND 5.0", "rating_between_0_5_range"),
+        CheckConstraint(
+            f"rating BETWEEN {MIN_RATING} AND {MAX_RATING}", "rating_between_0_5_range"
+        ),
+        Index("ix_resume_created_at_rating_id", "created_at", "rating", "id"),
+        Index("ix_resume_rating_score_id", "rating_score", "id"),
+        Index(
+            "ix_resume_pretender_name_trgm",
+            "pretender_name",
+            postgresql_using="gin",
+            postgresql_ops={"pretender_name": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[uuid_pk]
@@ -22,7 +35,26 @@ class Resume(Base):
     file_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("uploaded_file.id"), comment="Загруженный файл резюме"
     )
-    file: Mapped[UploadedFile] = relationship()
+    file: Mapped[UploadedFile] = relationship(lazy="raise")
+    file_name: Mapped[str] = mapped_column(
+        comment="Название файла резюме, под которым его загрузил пользователь"
+    )
+    file_content_type: Mapped[str_64] = mapped_column(
+        comment="Content-type файла резюме, указанный при загрузке"
+    )
+
+    rating_count: Mapped[int] = mapped_column(
+        server_default=text("0"), comment="Число пользовательских оценок резюме"
+    )
+    rating_sum: Mapped[float] = mapped_column(
+        server_default=text("0"), comment="Сумма пользовательских оценок резюме"
+    )
+    rating_mean: Mapped[float | None] = mapped_column(
+        comment="Средняя пользовательская оценка резюме"
+    )
+    rating_score: Mapped[float] = mapped_column(
+        comment="Байесовская средняя оценка резюме для ранжирования"
+    )
 
     created_at: Mapped[datetime.datetime] = mapped_column(
         default=utc_now, comment="Дата создания записи резюме"
@@ -30,3 +62,27 @@ class Resume(Base):
     updated_at: Mapped[datetime.datetime] = mapped_column(
         default=utc_now, onupdate=utc_now, comment="Дата редактирования записи резюме"
     )
+
+
+class ResumeRating(Base):
+    __tablename__ = "resume_rating"
+    __table_args__ = (
+        CheckConstraint(
+            f"value BETWEEN {MIN_RATING} AND {MAX_RATING}", "value_between_0_5_range"
+        ),
+    )
+
+    resume_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resume.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True, comment="Пользователь, поставивший оценку"
+    )
+    value: Mapped[float] = mapped_column(comment="Оценка резюме пользователем")
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        default=utc_now, comment="Дата выставления оценки"
+    )
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        default=utc_now, onupdate=utc_now, comment="Дата изменения оценки"
+    )
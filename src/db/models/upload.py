@@ -0,0 +1,48 @@
+import datetime
+import uuid
+
+from sqlalchemy import ForeignKey, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.utils import utc_now
+from db.base import Base, str_64, str_128, uuid_pk
+
+
+class ResumableUpload(Base):
+    __tablename__ = "resumable_upload"
+
+    id: Mapped[uuid_pk]
+    bucket: Mapped[str_128] = mapped_column(comment="Название бакета в S3")
+    path: Mapped[str] = mapped_column(comment="Полный путь до файла в S3")
+    s3_upload_id: Mapped[str] = mapped_column(
+        index=True, comment="Идентификатор multipart-загрузки в S3"
+    )
+    name: Mapped[str] = mapped_column(
+        comment="Название загружаемого файла с расширением"
+    )
+    content_type: Mapped[str_64]
+    file_size: Mapped[int] = mapped_column(comment="Заявленный размер файла")
+    part_size: Mapped[int] = mapped_column(comment="Размер части загрузки")
+    offset: Mapped[int] = mapped_column(
+        server_default=text("0"), comment="Число байт, сохранённых в S3"
+    )
+    locked_until: Mapped[datetime.datetime | None] = mapped_column(
+        comment="Время окончания аренды загрузки запросом на дозагрузку"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        default=utc_now, comment="Дата начала загрузки"
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        index=True, comment="Время, после которого незавершённая загрузка удаляется"
+    )
+
+
+class ResumableUploadPart(Base):
+    __tablename__ = "resumable_upload_part"
+
+    upload_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resumable_upload.id", ondelete="CASCADE"), primary_key=True
+    )
+    part_number: Mapped[int] = mapped_column(primary_key=True)
+    e_tag: Mapped[str_128] = mapped_column(comment="ETag части в S3")
+    size: Mapped[int] = mapped_column(comment="Размер части")
@@ -0,0 +1,48 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from core.metrics import Histogram, HistogramSnapshot
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, замеряющий время ожидания свободного соединения."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+
+    def _do_get(self) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - started_at)
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStatsDTO:
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    wait_time: HistogramSnapshot | None
+
+
+def get_pool_stats(pool: Pool) -> PoolStatsDTO:
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return PoolStatsDTO(size=0, checked_out=0, idle=0, overflow=0, wait_time=None)
+
+    return PoolStatsDTO(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        idle=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        wait_time=(
+            pool.wait_time.snapshot()
+            if isinstance(pool, InstrumentedAsyncAdaptedQueuePool)
+            else None
+        ),
+    )
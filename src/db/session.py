@@ -0,0 +1,48 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ReadOnlySession(AsyncSession):
+    """Сессия для запросов только на чтение.
+
+    Работает поверх соединений в режиме AUTOCOMMIT, поэтому не отправляет
+    BEGIN и COMMIT, и возвращает соединение в пул сразу после каждого
+    запроса, а не в конце обработки HTTP-запроса. Сессия создаётся с
+    `expire_on_commit=False`, и загруженные объекты остаются доступными
+    после возврата соединения.
+
+    Результат `stream` читается курсором на стороне сервера, который
+    существует только внутри транзакции, поэтому потоковое чтение выполняется
+    в транзакции только для чтения, и соединение удерживается до закрытия
+    сессии.
+    """
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release_after(super().execute(*args, **kwargs))
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release_after(super().scalar(*args, **kwargs))
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release_after(super().get(*args, **kwargs))
+
+    async def stream(self, *args: Any, **kwargs: Any) -> Any:
+        await self.connection(
+            execution_options={
+                "isolation_level": "REPEATABLE READ",
+                "postgresql_readonly": True,
+            }
+        )
+        return await super().stream(*args, **kwargs)
+
+    async def _release_after(self, query: Any) -> Any:
+        try:
+            result = await query
+        except Exception:
+            await self.rollback()
+            raise
+        # В режиме AUTOCOMMIT фиксация не обращается к БД и только
+        # возвращает соединение в пул
+        await self.commit()
+        return result
@@ -0,0 +1,85 @@
+import contextlib
+from collections.abc import Iterator
+from typing import Any, Final
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.metrics import registry
+from core.tracing import Span
+
+DB_SYSTEM: Final = "postgresql"
+
+_OPERATIONS: Final = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+_QUERY_SPANS: Final = "query_spans"
+
+query_duration = registry.histogram(
+    "db_client_operation_duration_seconds",
+    "Duration of database queries and commits",
+    label_names=("operation",),
+)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Замер длительности каждого запроса к БД.
+
+    Запросы группируются по первому ключевому слову, чтобы число
+    гистограмм не зависело от текста запросов.
+    """
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+@contextlib.contextmanager
+def observe_query(operation: str) -> Iterator[None]:
+    """Замер операции с БД, не проходящей через курсор, например фиксации."""
+    span = query_span(operation)
+    try:
+        with span:
+            yield
+    finally:
+        query_duration.labels(operation).observe(span.duration)
+
+
+def query_span(operation: str, statement: str | None = None) -> Span:
+    attributes: dict[str, Any] = {"db.system": DB_SYSTEM, "db.operation": operation}
+    if statement is not None:
+        attributes["db.statement"] = statement
+    return Span(f"db {operation}", attributes=attributes)
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(maxsplit=1)[0].upper() if statement else ""
+    return keyword if keyword in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,  # noqa: ARG001
+    statement: str,
+    *args: Any,  # noqa: ARG001
+) -> None:
+    operation = _operation(statement)
+    conn.info.setdefault(_QUERY_SPANS, []).append(
+        (operation, query_span(operation, statement))
+    )
+
+
+def _after_cursor_execute(conn: Connection, *args: Any) -> None:  # noqa: ARG001
+    _end_query_span(conn)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    if context.connection is not None:
+        _end_query_span(context.connection, error=context.original_exception)
+
+
+def _end_query_span(conn: Connection, error: BaseException | None = None) -> None:
+    spans = conn.info.get(_QUERY_SPANS)
+    if not spans:
+        return
+    operation, span = spans.pop()
+    query_duration.labels(operation).observe(span.end(error=error))
@@ -0,0 +1,107 @@
+import datetime
+
+import pytest
+
+from api.downloads import (
+    ByteRange,
+    RangeNotSatisfiableError,
+    create_validators,
+    parse_range,
+)
+
+CREATED_AT = datetime.datetime(2026, 10, 1, 12, 30, 15, 123456, tzinfo=datetime.UTC)
+LAST_MODIFIED = "Thu, 01 Oct 2026 12:30:15 GMT"
+VALIDATORS = create_validators("7d0f6a52", CREATED_AT)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        pytest.param("bytes=0-99", ByteRange(0, 99), id="closed"),
+        pytest.param(" bytes=10-19 ", ByteRange(10, 19), id="whitespace"),
+        pytest.param("bytes=900-", ByteRange(900, 999), id="open-ended"),
+        pytest.param("bytes=900-5000", ByteRange(900, 999), id="end-clamped"),
+        pytest.param("bytes=-100", ByteRange(900, 999), id="suffix"),
+        pytest.param("bytes=-5000", ByteRange(0, 999), id="suffix-longer-than-file"),
+        pytest.param(None, None, id="no-header"),
+        pytest.param("bytes=-", None, id="empty"),
+        pytest.param("bytes=20-10", None, id="reversed"),
+        pytest.param("bytes=0-1,5-9", None, id="multiple-ranges"),
+        pytest.param("items=0-9", None, id="unknown-unit"),
+    ],
+)
+def test_parse_range(header: str | None, expected: ByteRange | None) -> None:
+    assert parse_range(header, size=1000) == expected
+
+
+@pytest.mark.parametrize(
+    ("header", "size"),
+    [
+        pytest.param("bytes=1000-", 1000, id="start-past-end"),
+        pytest.param("bytes=-0", 1000, id="empty-suffix"),
+        pytest.param("bytes=-10", 0, id="suffix-of-empty-file"),
+    ],
+)
+def test_parse_range_not_satisfiable(header: str, size: int) -> None:
+    with pytest.raises(RangeNotSatisfiableError) as exc_info:
+        parse_range(header, size)
+
+    assert exc_info.value.size == size
+
+
+def test_validators_headers() -> None:
+    assert VALIDATORS.headers() == {
+        "ETag": '"7d0f6a52"',
+        "Last-Modified": LAST_MODIFIED,
+        "Cache-Control": "no-cache",
+    }
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        pytest.param({}, False, id="no-conditions"),
+        pytest.param({"if-none-match": '"7d0f6a52"'}, True, id="etag"),
+        pytest.param({"if-none-match": 'W/"7d0f6a52"'}, True, id="weak-etag"),
+        pytest.param({"if-none-match": '"a", "7d0f6a52"'}, True, id="etag-list"),
+        pytest.param({"if-none-match": "*"}, True, id="any"),
+        pytest.param({"if-none-match": '"other"'}, False, id="other-etag"),
+        pytest.param(
+            {"if-none-match": '"other"', "if-modified-since": LAST_MODIFIED},
+            False,
+            id="etag-takes-precedence",
+        ),
+        pytest.param({"if-modified-since": LAST_MODIFIED}, True, id="same-date"),
+        pytest.param(
+            {"if-modified-since": "Fri, 02 Oct 2026 00:00:00 GMT"},
+            True,
+            id="later-date",
+        ),
+        pytest.param(
+            {"if-modified-since": "Wed, 30 Sep 2026 00:00:00 GMT"},
+            False,
+            id="earlier-date",
+        ),
+        pytest.param({"if-modified-since": "yesterday"}, False, id="invalid-date"),
+    ],
+)
+def test_is_not_modified(headers: dict[str, str], expected: bool) -> None:
+    assert VALIDATORS.is_not_modified(headers) is expected
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        pytest.param({}, True, id="no-condition"),
+        pytest.param({"if-range": '"7d0f6a52"'}, True, id="etag"),
+        pytest.param({"if-range": '"other"'}, False, id="other-etag"),
+        pytest.param({"if-range": 'W/"7d0f6a52"'}, False, id="weak-etag"),
+        pytest.param({"if-range": LAST_MODIFIED}, True, id="same-date"),
+        pytest.param(
+            {"if-range": "Fri, 02 Oct 2026 00:00:00 GMT"}, False, id="other-date"
+        ),
+        pytest.param({"if-range": "yesterday"}, False, id="invalid-date"),
+    ],
+)
+def test_is_range_applicable(headers: dict[str, str], expected: bool) -> None:
+    assert VALIDATORS.is_range_applicable(headers) is expected
@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from api.multipart import MultipartStreamError, StreamingForm, StreamingMultipartReader
+
+BOUNDARY = b"a7Bc9XyZ"
+# Содержимое файла с похожей на разделитель последовательностью внутри
+CONTENT = b"%PDF-1.7\r\n" + b"\x00\xff" * 300 + b"\r\n--a7Bc9X" + b"tail" * 50
+BODY = (
+    b"--a7Bc9XyZ\r\n"
+    b'Content-Disposition: form-data; name="pretender_name"\r\n'
+    b"\r\n"
+    b"John Doe\r\n"
+    b"--a7Bc9XyZ\r\n"
+    b'Content-Disposition: form-data; name="rating"\r\n'
+    b"\r\n"
+    b"4.5\r\n"
+    b"--a7Bc9XyZ\r\n"
+    b'Content-Disposition: form-data; name="upload_file"; filename="cv.pdf"\r\n'
+    b"Content-Type: application/pdf\r\n"
+    b"\r\n" + CONTENT + b"\r\n--a7Bc9XyZ--\r\n"
+)
+
+
+async def _chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _read(
+    body: bytes,
+    chunk_size: int,
+    max_field_size: int = 1024,
+) -> tuple[StreamingForm, bytes]:
+    reader = StreamingMultipartReader(
+        _chunked(body, chunk_size),
+        boundary=BOUNDARY,
+        max_field_size=max_field_size,
+    )
+    form = await reader.read_until_file()
+    assert form.file is not None
+    content = b"".join([chunk async for chunk in form.file.chunks])
+    return form, content
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 11, 64, len(BODY)])
+def test_boundary_split_across_chunks(chunk_size: int) -> None:
+    form, content = asyncio.run(_read(BODY, chunk_size))
+
+    assert form.fields == {"pretender_name": "John Doe", "rating": "4.5"}
+    assert form.file is not None
+    assert form.file.filename == "cv.pdf"
+    assert form.file.content_type == "application/pdf"
+    assert content == CONTENT
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        pytest.param(BODY.removesuffix(b"\r\n--a7Bc9XyZ--\r\n"), id="no-boundary"),
+        pytest.param(BODY.removesuffix(b"Z--\r\n"), id="partial-boundary"),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [5, len(BODY)])
+def test_missing_final_boundary(body: bytes, chunk_size: int) -> None:
+    with pytest.raises(MultipartStreamError):
+        asyncio.run(_read(body, chunk_size))
+
+
+def test_field_too_large() -> None:
+    with pytest.raises(MultipartStreamError, match="pretender_name"):
+        asyncio.run(_read(BODY, 16, max_field_size=4))
+
+
+def test_part_without_name() -> None:
+    body = BODY.replace(b'form-data; name="rating"', b"form-data")
+
+    with pytest.raises(MultipartStreamError):
+        asyncio.run(_read(body, 16))
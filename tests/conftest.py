@@ -0,0 +1,11 @@
+import os
+
+# Модули `db` создают движок при импорте; к самой БД тесты не подключаются
+for name, value in {
+    "DATABASE_USERNAME": "test",
+    "DATABASE_PASSWORD": "test",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "DATABASE_NAME": "test",
+}.items():
+    os.environ.setdefault(name, value)
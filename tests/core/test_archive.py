@@ -0,0 +1,129 @@
+import asyncio
+import datetime
+import io
+import uuid
+import zipfile
+from collections.abc import AsyncIterator
+
+import pytest
+
+from core.files.archive import MISSING_FILES_ENTRY_NAME, stream_zip, unique_entry_names
+from core.files.dto import UploadedFileSummaryDTO
+from db.models.file import ExtractionStatus
+
+CREATED_AT = datetime.datetime(2026, 10, 1, 12, 30, 16, tzinfo=datetime.UTC)
+
+
+def _file(name: str, content: bytes) -> UploadedFileSummaryDTO:
+    return UploadedFileSummaryDTO(
+        id=uuid.uuid4(),
+        name=name,
+        bucket="resume",
+        path=f"resume/{uuid.uuid4()}",
+        content_type="application/pdf",
+        file_size=len(content),
+        created_at=CREATED_AT,
+        extraction_status=ExtractionStatus.DONE,
+    )
+
+
+def _build(
+    files: list[tuple[UploadedFileSummaryDTO, bytes | Exception]],
+    prefetch_files: int = 2,
+) -> zipfile.ZipFile:
+    contents = {file.id: content for file, content in files}
+
+    async def open_file(file: UploadedFileSummaryDTO) -> AsyncIterator[bytes]:
+        content = contents[file.id]
+        if isinstance(content, Exception):
+            raise content
+        return _chunked(content)
+
+    async def collect() -> bytes:
+        chunks = stream_zip(
+            [file for file, _ in files],
+            open_file,
+            prefetch_files=prefetch_files,
+            prefetch_chunks=2,
+        )
+        return b"".join([chunk async for chunk in chunks])
+
+    return zipfile.ZipFile(io.BytesIO(asyncio.run(collect())))
+
+
+async def _chunked(data: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), 7):
+        yield data[start : start + 7]
+
+
+@pytest.mark.parametrize(
+    ("names", "expected"),
+    [
+        pytest.param(
+            ["cv.pdf", "cv.pdf", "CV.pdf"],
+            ["cv.pdf", "cv (2).pdf", "CV (3).pdf"],
+            id="duplicates",
+        ),
+        pytest.param(
+            ["../../etc/passwd", "C:\\Users\\cv.pdf", "a/b/cv.pdf"],
+            ["passwd", "cv.pdf", "cv (2).pdf"],
+            id="directories",
+        ),
+        pytest.param(["", ".."], ["file", "file (2)"], id="empty"),
+        pytest.param(["cv", "cv"], ["cv", "cv (2)"], id="no-suffix"),
+    ],
+)
+def test_unique_entry_names(names: list[str], expected: list[str]) -> None:
+    assert unique_entry_names(names) == expected
+
+
+@pytest.mark.parametrize("prefetch_files", [0, 1, 5])
+def test_stream_zip(prefetch_files: int) -> None:
+    contents = [b"%PDF-1.7" + bytes(range(256)) * 3, b"second", b""]
+    names = ["cv.pdf", "cv.pdf", "empty.docx"]
+
+    archive = _build(
+        [
+            (_file(name, content), content)
+            for name, content in zip(names, contents, strict=True)
+        ],
+        prefetch_files,
+    )
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ["cv.pdf", "cv (2).pdf", "empty.docx"]
+    for info, content in zip(archive.infolist(), contents, strict=True):
+        assert info.compress_type == zipfile.ZIP_STORED
+        assert info.date_time == (2026, 10, 1, 12, 30, 16)
+        assert archive.read(info) == content
+
+
+def test_stream_zip_lists_missing_files() -> None:
+    archive = _build(
+        [
+            (_file("cv.pdf", b"content"), b"content"),
+            (_file("lost.pdf", b"content"), FileNotFoundError("lost.pdf")),
+        ]
+    )
+
+    assert archive.namelist() == ["cv.pdf", MISSING_FILES_ENTRY_NAME]
+    assert archive.read("cv.pdf") == b"content"
+    assert archive.read(MISSING_FILES_ENTRY_NAME) == b"lost.pdf\n"
+
+
+def test_stream_zip_fails_on_read_error() -> None:
+    async def broken() -> AsyncIterator[bytes]:
+        yield b"start"
+        raise ConnectionError
+
+    async def open_file(file: UploadedFileSummaryDTO) -> AsyncIterator[bytes]:
+        return broken()
+
+    async def collect() -> None:
+        files = [_file("cv.pdf", b"start of content")]
+        chunks = stream_zip(files, open_file, prefetch_files=1, prefetch_chunks=1)
+        async for _ in chunks:
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(collect())
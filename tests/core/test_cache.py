@@ -0,0 +1,153 @@
+import asyncio
+import contextlib
+from typing import Any, Self
+
+import pytest
+
+import db.dependencies
+from core.cache import InMemoryCacheBackend, TTLCache, VersionedCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_ttl() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_size=10, clock=clock)
+    cache.set("a", 1, ttl=10)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_non_positive_ttl_removes_entry() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, clock=FakeClock())
+    cache.set("a", 1, ttl=10)
+
+    cache.set("a", 2, ttl=0)
+
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=2, clock=FakeClock())
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_overwrite_refreshes_position_and_ttl() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_size=2, clock=clock)
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+
+    clock.now = 5
+    cache.set("a", 10, ttl=10)
+    cache.set("c", 3, ttl=10)
+
+    assert cache.get("b") is None
+    clock.now = 14
+    assert cache.get("a") == 10
+
+
+class CountingLoader:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        return self.calls
+
+
+def test_versioned_cache_reloads_after_invalidate() -> None:
+    cache = VersionedCache(InMemoryCacheBackend(max_size=10), namespace="ns", ttl=60)
+    loader = CountingLoader()
+
+    async def scenario() -> list[int]:
+        values = [
+            await cache.get_or_load("key", loader),
+            await cache.get_or_load("key", loader),
+        ]
+        await cache.invalidate()
+        values.append(await cache.get_or_load("key", loader))
+        return values
+
+    assert asyncio.run(scenario()) == [1, 1, 2]
+    assert loader.calls == 2
+
+
+def test_versioned_cache_with_zero_ttl_does_not_store() -> None:
+    cache = VersionedCache(InMemoryCacheBackend(max_size=10), namespace="ns", ttl=0)
+    loader = CountingLoader()
+
+    async def scenario() -> list[int]:
+        return [await cache.get_or_load("key", loader) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
+
+
+class FakeSession:
+    def __init__(self, events: list[str]) -> None:
+        self.info: dict[str, Any] = {}
+        self._events = events
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._events.append("close")
+
+    async def commit(self) -> None:
+        self._events.append("commit")
+
+
+def _run_session(
+    monkeypatch: pytest.MonkeyPatch,
+    fail: bool,
+) -> list[str]:
+    events: list[str] = []
+    monkeypatch.setattr(
+        db.dependencies, "async_session_factory", lambda: FakeSession(events)
+    )
+
+    async def invalidate() -> None:
+        events.append("invalidate")
+
+    async def scenario() -> None:
+        async with db.dependencies.create_session() as session:
+            db.dependencies.on_commit(session, invalidate)
+            db.dependencies.on_commit(session, invalidate)
+            if fail:
+                raise RuntimeError("rollback")
+
+    with contextlib.suppress(RuntimeError):
+        asyncio.run(scenario())
+    return events
+
+
+def test_on_commit_callbacks_run_once_after_commit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert _run_session(monkeypatch, fail=False) == ["commit", "close", "invalidate"]
+
+
+def test_on_commit_callbacks_are_skipped_on_rollback(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert _run_session(monkeypatch, fail=True) == ["close"]
@@ -0,0 +1,77 @@
+import pytest
+
+from core.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram(buckets=(1.0, 0.1))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.buckets == ((0.1, 2), (1.0, 3), (float("inf"), 4))
+    assert snapshot.count == 4
+    assert snapshot.sum == pytest.approx(3.65)
+
+
+def test_render_histogram() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "http_request_duration_seconds",
+        "Длительность обработки HTTP-запросов",
+        label_names=("method", "route"),
+        buckets=(0.1, 1.0),
+    )
+    histogram.labels("GET", "/resume").observe(0.25)
+    histogram.labels("GET", "/resume").observe(2.0)
+
+    assert registry.render() == (
+        "# HELP http_request_duration_seconds Длительность обработки HTTP-запросов\n"
+        "# TYPE http_request_duration_seconds histogram\n"
+        'http_request_duration_seconds_bucket{method="GET",route="/resume",le="0.1"} 0\n'
+        'http_request_duration_seconds_bucket{method="GET",route="/resume",le="1"} 1\n'
+        'http_request_duration_seconds_bucket{method="GET",route="/resume",le="+Inf"} 2\n'
+        'http_request_duration_seconds_sum{method="GET",route="/resume"} 2.25\n'
+        'http_request_duration_seconds_count{method="GET",route="/resume"} 2\n'
+    )
+
+
+def test_render_counter() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter(
+        "s3_retries_total", "Повторные запросы к S3", label_names=("operation",)
+    )
+    counter.labels("GetObject").inc()
+    counter.labels("GetObject").inc(2)
+    counter.labels("PutObject").inc()
+
+    assert registry.render() == (
+        "# HELP s3_retries_total Повторные запросы к S3\n"
+        "# TYPE s3_retries_total counter\n"
+        's3_retries_total{operation="GetObject"} 3.0\n'
+        's3_retries_total{operation="PutObject"} 1.0\n'
+    )
+
+
+def test_render_escapes_label_values() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("duration", "Длительность", ("path",), (1.0,))
+    histogram.labels('a\\b"c\nd').observe(0.5)
+
+    assert 'duration_count{path="a\\\\b\\"c\\nd"} 1' in registry.render()
+
+
+def test_labels_require_all_names() -> None:
+    histogram = MetricsRegistry().histogram("duration", "Длительность", ("a", "b"))
+
+    with pytest.raises(ValueError, match="Expected labels"):
+        histogram.labels("x")
+
+
+def test_metric_name_must_be_unique() -> None:
+    registry = MetricsRegistry()
+    registry.histogram("duration", "Длительность")
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.histogram("duration", "Длительность")
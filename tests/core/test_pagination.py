@@ -0,0 +1,69 @@
+import base64
+import datetime
+import json
+import uuid
+
+import pytest
+
+from core.exceptions import InvalidCursorError
+from core.pagination import Cursor, decode_cursor, encode_cursor
+from db.models import Resume
+
+COLUMNS = (Resume.created_at, Resume.rating, Resume.id)
+
+
+def _token(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("backwards", [False, True])
+def test_cursor_round_trip(backwards: bool) -> None:
+    cursor = Cursor(
+        values=(
+            datetime.datetime(2026, 10, 1, 12, 30, 15, 123456, tzinfo=datetime.UTC),
+            4.5,
+            uuid.uuid4(),
+        ),
+        backwards=backwards,
+    )
+
+    assert decode_cursor(encode_cursor(cursor), COLUMNS) == cursor
+
+
+def test_encoded_cursor_is_url_safe() -> None:
+    token = encode_cursor(Cursor(values=("?" * 10, None)))
+
+    assert "=" not in token
+    assert set(token) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        pytest.param("not a cursor!", id="not-base64"),
+        pytest.param(_token([1, 2, 3]), id="not-an-object"),
+        pytest.param(_token({"v": []}), id="missing-direction"),
+        pytest.param(
+            _token({"v": ["2026-10-01T12:00:00"], "b": False}), id="too-short"
+        ),
+        pytest.param(
+            _token({"v": ["2026-10-01T12:00:00", 4.5, str(uuid.uuid4())], "b": "no"}),
+            id="direction-not-bool",
+        ),
+        pytest.param(
+            _token({"v": ["yesterday", 4.5, str(uuid.uuid4())], "b": False}),
+            id="invalid-datetime",
+        ),
+        pytest.param(
+            _token({"v": ["2026-10-01T12:00:00", 4.5, "not-a-uuid"], "b": False}),
+            id="invalid-uuid",
+        ),
+    ],
+)
+def test_decode_invalid_cursor(token: str) -> None:
+    with pytest.raises(InvalidCursorError) as exc_info:
+        decode_cursor(token, COLUMNS)
+
+    assert exc_info.value.cursor == token
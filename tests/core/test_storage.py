@@ -0,0 +1,51 @@
+import pytest
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    EndpointConnectionError,
+    NoCredentialsError,
+    ReadTimeoutError,
+)
+
+from core.files.storage import is_transient_error
+
+
+def _client_error(code: str, status_code: int) -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        "GetObject",
+    )
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (EndpointConnectionError(endpoint_url="http://s3"), True),
+        (ReadTimeoutError(endpoint_url="http://s3"), True),
+        (_client_error("InternalError", 500), True),
+        (_client_error("ServiceUnavailable", 503), True),
+        (_client_error("SlowDown", 503), True),
+        (_client_error("RequestTimeout", 400), True),
+        (_client_error("TooManyRequests", 429), True),
+        (_client_error("NoSuchKey", 404), False),
+        (_client_error("AccessDenied", 403), False),
+        (NoCredentialsError(), False),
+    ],
+    ids=[
+        "connection",
+        "read-timeout",
+        "internal-error",
+        "unavailable",
+        "slow-down",
+        "request-timeout",
+        "too-many-requests",
+        "no-such-key",
+        "access-denied",
+        "no-credentials",
+    ],
+)
+def test_is_transient_error(error: BotoCoreError | ClientError, expected: bool) -> None:
+    assert is_transient_error(error) is expected